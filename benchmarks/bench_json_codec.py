@@ -0,0 +1,142 @@
+"""Compare JSON backends on a season-sized raw tree.
+
+Usage::
+
+    python benchmarks/bench_json_codec.py            # synthetic 38-round season
+    python benchmarks/bench_json_codec.py --raw-dir data/raw
+
+Every ``*.json`` file under the tree is decoded from bytes and re-encoded with
+each available backend of :mod:`cartola_analytics.codec`; the best of
+``--repeat`` runs is reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from cartola_analytics import codec
+
+
+def _athlete(atleta_id: int, rodada: int, rng: random.Random) -> dict[str, object]:
+    return {
+        "atleta_id": atleta_id,
+        "rodada_id": rodada,
+        "clube_id": rng.randint(262, 2305),
+        "posicao_id": rng.randint(1, 6),
+        "status_id": rng.choice([2, 3, 5, 6, 7]),
+        "apelido": f"Jogador {atleta_id}",
+        "apelido_abreviado": f"J. {atleta_id}",
+        "nome": f"Nome Completo do Atleta {atleta_id}",
+        "slug": f"jogador-{atleta_id}",
+        "foto": f"https://s.sde.globo.com/media/person_role/{atleta_id}.png",
+        "pontos_num": round(rng.uniform(-5, 25), 2),
+        "media_num": round(rng.uniform(0, 12), 2),
+        "preco_num": round(rng.uniform(1, 30), 2),
+        "variacao_num": round(rng.uniform(-3, 3), 2),
+        "jogos_num": rng.randint(0, 38),
+        "entrou_em_campo": rng.random() > 0.3,
+        "minimo_para_valorizar": round(rng.uniform(0, 8), 2),
+        "scout": {
+            key: rng.randint(0, 5)
+            for key in ("DS", "FC", "FS", "CA", "G", "A", "SG", "DE", "FF", "FD")
+        },
+    }
+
+
+def build_season(base_dir: Path, *, rounds: int, athletes: int, seed: int) -> None:
+    """Write a synthetic ``atletas_mercado``/``partidas`` season under base_dir."""
+    rng = random.Random(seed)
+    for rodada in range(1, rounds + 1):
+        mercado = base_dir / "atletas_mercado" / f"rodada={rodada:03d}"
+        mercado.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "atletas": [_athlete(i, rodada, rng) for i in range(athletes)],
+            "clubes": {str(i): {"id": i, "nome": f"Clube {i}"} for i in range(20)},
+            "posicoes": {str(i): {"id": i, "nome": f"Pos {i}"} for i in range(1, 7)},
+        }
+        mercado.joinpath("20250101T000000Z.json").write_bytes(codec.dumps(payload))
+
+        partidas = base_dir / "partidas" / f"rodada={rodada:03d}"
+        partidas.mkdir(parents=True, exist_ok=True)
+        matches = {
+            "rodada": rodada,
+            "partidas": [
+                {
+                    "partida_id": rodada * 100 + i,
+                    "clube_casa_id": rng.randint(262, 2305),
+                    "clube_visitante_id": rng.randint(262, 2305),
+                    "partida_data": "2025-05-10 16:00:00",
+                    "local": "Estadio",
+                    "valida": True,
+                }
+                for i in range(10)
+            ],
+        }
+        partidas.joinpath("20250101T000000Z.json").write_bytes(codec.dumps(matches))
+
+
+def _best_of(repeat: int, fn: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(raw_dir: Path, repeat: int) -> None:
+    files = sorted(raw_dir.rglob("*.json"))
+    blobs = [path.read_bytes() for path in files]
+    total_mb = sum(len(blob) for blob in blobs) / 1_000_000
+    print(f"{len(files)} arquivos, {total_mb:.1f} MB em {raw_dir}")
+
+    previous = codec.backend_name()
+    results: dict[str, tuple[float, float]] = {}
+    try:
+        for backend in codec.available_backends():
+            codec.use_backend(backend)
+            decoded = [codec.loads(blob) for blob in blobs]
+            read_time = _best_of(
+                repeat, lambda: [codec.read_json(path) for path in files]
+            )
+            encode_time = _best_of(
+                repeat, lambda: [codec.dumps(obj) for obj in decoded]
+            )
+            results[backend] = (read_time, encode_time)
+    finally:
+        codec.use_backend(previous)
+
+    baseline_read, baseline_encode = results["json"]
+    print(f"{'backend':<8} {'read+decode (s)':>16} {'encode (s)':>11} {'speedup':>8}")
+    for backend, (read_time, encode_time) in results.items():
+        speedup = (baseline_read + baseline_encode) / (read_time + encode_time)
+        print(f"{backend:<8} {read_time:>16.3f} {encode_time:>11.3f} {speedup:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--raw-dir", type=Path, help="Arvore raw existente")
+    parser.add_argument("--rounds", type=int, default=38)
+    parser.add_argument("--athletes", type=int, default=800)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args()
+
+    if args.raw_dir is not None:
+        run(args.raw_dir, args.repeat)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = Path(tmp)
+        build_season(
+            base_dir, rounds=args.rounds, athletes=args.athletes, seed=args.seed
+        )
+        run(base_dir, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Time a full ``partidas`` rebuild with different transform worker counts.
+
+Usage::
+
+    python benchmarks/bench_transform_workers.py                # synthetic season
+    python benchmarks/bench_transform_workers.py --workers 1 2 4 8
+
+A season of ``--polls`` snapshots per round is written to a temporary project
+and ``transform_partidas`` is run from scratch for each worker count; the best
+of ``--repeat`` runs is reported next to the speedup over one worker.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from cartola_analytics import codec
+from cartola_analytics.pipelines import transform_partidas
+from cartola_analytics.schema import schema_dir
+
+
+def build_project(base_dir: Path, *, rounds: int, polls: int, seed: int) -> int:
+    """Write the partidas schema and raw history; return the snapshot count."""
+    rng = random.Random(seed)
+    schemas = base_dir / "docs" / "schemas"
+    schemas.mkdir(parents=True)
+    shutil.copy(schema_dir() / "partidas.yaml", schemas / "partidas.yaml")
+    for rodada in range(1, rounds + 1):
+        round_dir = base_dir / "data" / "raw" / "partidas" / f"rodada={rodada:03d}"
+        round_dir.mkdir(parents=True)
+        for poll in range(polls):
+            payload = {
+                "rodada": rodada,
+                "partidas": [
+                    {
+                        "partida_id": rodada * 100 + match,
+                        "clube_casa_id": rng.randint(262, 2305),
+                        "clube_visitante_id": rng.randint(262, 2305),
+                        "partida_data": "2025-05-10 16:00:00",
+                        "placar_oficial_mandante": rng.randint(0, 4),
+                        "placar_oficial_visitante": rng.randint(0, 4),
+                        "aproveitamento_mandante": ["v", "e", "d", "v", "v"],
+                        "aproveitamento_visitante": ["d", "d", "e", "v", "e"],
+                        "transmissao": {"label": "Premiere", "url": "https://x"},
+                        "local": "Estadio",
+                        "valida": True,
+                    }
+                    for match in range(10)
+                ],
+            }
+            name = f"20250101T{poll // 60:02d}{poll % 60:02d}00Z.json"
+            round_dir.joinpath(name).write_bytes(codec.dumps(payload))
+    return rounds * polls
+
+
+def _best_of(repeat: int, base_dir: Path, workers: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        transform_partidas(base_dir=base_dir, workers=workers)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=38)
+    parser.add_argument("--polls", type=int, default=96, help="Coletas por rodada")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1})
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = Path(tmp)
+        snapshots = build_project(
+            base_dir, rounds=args.rounds, polls=args.polls, seed=args.seed
+        )
+        print(f"{snapshots} snapshots de partidas, {os.cpu_count()} CPUs")
+        baseline = None
+        print(f"{'workers':>7} {'tempo (s)':>10} {'speedup':>8}")
+        for workers in args.workers:
+            elapsed = _best_of(args.repeat, base_dir, workers)
+            baseline = baseline or elapsed
+            print(f"{workers:>7} {elapsed:>10.3f} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,49 @@
 """Cartola Analytics package entry point."""
 
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 from .config import CartolaSettings, load_settings
 from .endpoints import Endpoint, iter_endpoints, list_endpoints
-from .http_client import CartolaClient, default_headers
+from .http_client import (
+    AsyncCartolaClient,
+    CartolaClient,
+    FetchResult,
+    default_headers,
+)
 from .logging_utils import configure_logging, configure_logging_from_settings
 from .pipelines import (
+    CollectResult,
     build_output_path,
     collect_endpoint_payload,
+    collect_endpoint_payload_async,
+    collect_endpoint_payloads,
     transform_clubes,
     transform_mercado_status,
     transform_partidas,
     transform_rodadas,
 )
+from .rate_limit import RateLimiter, TokenBucket
 from .schema import FieldSpec, SchemaSpec, load_schema, schema_dir
 
 __all__ = [
     "Endpoint",
     "iter_endpoints",
     "list_endpoints",
+    "AsyncCartolaClient",
     "CartolaClient",
+    "FetchResult",
     "default_headers",
+    "RateLimiter",
+    "TokenBucket",
+    "CircuitBreaker",
+    "CircuitOpenError",
     "CartolaSettings",
     "load_settings",
     "configure_logging",
     "configure_logging_from_settings",
+    "CollectResult",
     "collect_endpoint_payload",
+    "collect_endpoint_payload_async",
+    "collect_endpoint_payloads",
     "build_output_path",
     "transform_clubes",
     "transform_mercado_status",
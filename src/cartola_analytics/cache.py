@@ -0,0 +1,800 @@
+"""On-disk storage for cached Cartola API responses."""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Protocol
+
+from . import codec
+from .compression import (
+    ALGORITHMS,
+    compress,
+    decompress,
+    payload_files,
+    payload_stem,
+    resolve,
+    suffix_for,
+)
+
+logger = logging.getLogger(__name__)
+
+COUNTER_NAMES = ("hits", "stale", "revalidations", "misses")
+NOT_DECODED: Any = object()
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """Raw response body plus the metadata needed to reuse or revalidate it."""
+
+    url: str
+    endpoint: str
+    body: bytes
+    stored_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+    ttl: float | None = None
+
+    def age(self, now: float | None = None) -> float:
+        return (now if now is not None else time.time()) - self.stored_at
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers derived from the stored validators."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def expires_at(self) -> float | None:
+        """When the entry stops being useful; ``None`` means never."""
+        return None if self.ttl is None else self.stored_at + self.ttl
+
+    def metadata(self) -> dict[str, Any]:
+        return {
+            "url": self.url,
+            "endpoint": self.endpoint,
+            "timestamp": self.stored_at,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "ttl": self.ttl,
+        }
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of a cache store used by ``cartola-fetch cache stats``."""
+
+    entries: int
+    bytes: int
+    oldest: float | None = None
+    oldest_endpoint: str | None = None
+    counters: dict[str, int] = field(default_factory=dict)
+    by_endpoint: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+    @property
+    def hit_ratio(self) -> float | None:
+        """Share of lookups answered from the cache (fresh, stale or 304)."""
+        served = sum(self.counters.get(name, 0) for name in COUNTER_NAMES[:3])
+        total = served + self.counters.get("misses", 0)
+        return served / total if total else None
+
+
+class CacheStore(Protocol):
+    """Storage backend used by the Cartola clients."""
+
+    def get(self, key: str) -> CacheEntry | None: ...
+
+    def put(self, key: str, entry: CacheEntry) -> None: ...
+
+    def touch(self, key: str, entry: CacheEntry, stored_at: float) -> CacheEntry: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def location(self, key: str) -> str: ...
+
+    def stats(self) -> CacheStats: ...
+
+    def prune(self, now: float | None = None) -> int: ...
+
+    def clear(self, endpoint: str | None = None) -> int: ...
+
+    def record_counters(self, counters: Mapping[str, int]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+@dataclass
+class _Usage:
+    endpoint: str
+    size: int
+    stored_at: float
+    expires_at: float | None
+    last_access: float
+
+
+def _eviction_order(
+    usage: Mapping[str, _Usage], now: float
+) -> list[tuple[str, _Usage]]:
+    """Expired entries first (oldest expiry), then least recently used."""
+
+    def _rank(item: tuple[str, _Usage]) -> tuple[int, float]:
+        info = item[1]
+        if info.expires_at is not None and info.expires_at < now:
+            return (0, info.expires_at)
+        return (1, info.last_access)
+
+    return sorted(usage.items(), key=_rank)
+
+
+class FileCacheStore:
+    """Stores each entry as ``<key>.json`` (body) plus ``<key>.meta.json``.
+
+    Keeping metadata in a sidecar lets a revalidated entry refresh its
+    timestamp without rewriting the body. Files are replaced atomically and the
+    metadata is written last, so a missing sidecar means "no entry". The
+    sidecar's mtime records the last access and drives LRU eviction. Bodies
+    without a sidecar (the old single-file format, interrupted writes) can
+    never be read, so scans count them as already expired: stats show them
+    and ``prune``/the size limits reclaim their space.
+
+    With ``compression`` set, bodies are written as ``<key>.json.gz`` or
+    ``<key>.json.zst``; the sidecar records the algorithm, so entries written
+    under an earlier setting stay readable.
+    """
+
+    stats_filename = "cache_stats.json"
+    orphan_endpoint = "(sem metadados)"
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_bytes: int = 0,
+        max_entries: int = 0,
+        compression: str = "none",
+        compression_level: int = 0,
+    ) -> None:
+        suffix_for(compression)
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.compression = compression
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self._usage: dict[str, _Usage] | None = None
+
+    def body_path(self, key: str, compression: str | None = None) -> Path:
+        algorithm = self.compression if compression is None else compression
+        return self.directory / f"{key}.json{suffix_for(algorithm)}"
+
+    def meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}.meta.json"
+
+    def get(self, key: str) -> CacheEntry | None:
+        meta_path = self.meta_path(key)
+        if not meta_path.exists():
+            return None
+        try:
+            meta = codec.read_json(meta_path)
+            algorithm = meta.get("compression", "none")
+            body = decompress(self.body_path(key, algorithm).read_bytes(), algorithm)
+            entry = CacheEntry(
+                url=str(meta.get("url", "")),
+                endpoint=str(meta.get("endpoint", "")),
+                body=body,
+                stored_at=float(meta["timestamp"]),
+                etag=meta.get("etag"),
+                last_modified=meta.get("last_modified"),
+                ttl=meta.get("ttl"),
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            self.delete(key)
+            logger.warning(
+                "cache_corrupted",
+                extra={"event": "cache_corrupted", "path": str(meta_path)},
+            )
+            return None
+        self._mark_access(key)
+        return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        body = compress(entry.body, self.compression, self.compression_level)
+        _atomic_write(self.body_path(key), body)
+        meta = self._write_meta(key, entry, self.compression)
+        for algorithm in ALGORITHMS:
+            if algorithm != self.compression:
+                self.body_path(key, algorithm).unlink(missing_ok=True)
+        with self._lock:
+            if self._usage is not None:
+                self._usage[key] = _Usage(
+                    endpoint=entry.endpoint,
+                    size=len(body) + len(meta),
+                    stored_at=entry.stored_at,
+                    expires_at=entry.expires_at(),
+                    last_access=time.time(),
+                )
+        self._enforce_limits(time.time())
+
+    def touch(self, key: str, entry: CacheEntry, stored_at: float) -> CacheEntry:
+        """Refresh the timestamp of ``entry`` without touching its body."""
+        refreshed = replace(entry, stored_at=stored_at)
+        self._write_meta(key, refreshed, self._stored_compression(key))
+        with self._lock:
+            if self._usage is not None and key in self._usage:
+                self._usage[key].stored_at = stored_at
+                self._usage[key].expires_at = refreshed.expires_at()
+        return refreshed
+
+    def delete(self, key: str) -> None:
+        self.meta_path(key).unlink(missing_ok=True)
+        for algorithm in ALGORITHMS:
+            self.body_path(key, algorithm).unlink(missing_ok=True)
+        with self._lock:
+            if self._usage is not None:
+                self._usage.pop(key, None)
+
+    def location(self, key: str) -> str:
+        return str(self.body_path(key))
+
+    def stats(self) -> CacheStats:
+        usage = self._scan()
+        by_endpoint: dict[str, tuple[int, int]] = {}
+        for info in usage.values():
+            count, size = by_endpoint.get(info.endpoint, (0, 0))
+            by_endpoint[info.endpoint] = (count + 1, size + info.size)
+        oldest = min(usage.values(), key=lambda info: info.stored_at, default=None)
+        return CacheStats(
+            entries=len(usage),
+            bytes=sum(info.size for info in usage.values()),
+            oldest=oldest.stored_at if oldest else None,
+            oldest_endpoint=oldest.endpoint if oldest else None,
+            counters=self._read_counters(),
+            by_endpoint=by_endpoint,
+        )
+
+    def prune(self, now: float | None = None) -> int:
+        """Drop expired entries, then enforce the size limits (fresh scan)."""
+        moment = now if now is not None else time.time()
+        usage = self._scan()
+        expired = [
+            key
+            for key, info in usage.items()
+            if info.expires_at is not None and info.expires_at < moment
+        ]
+        for key in expired:
+            self.delete(key)
+        return len(expired) + self._enforce_limits(moment)
+
+    def clear(self, endpoint: str | None = None) -> int:
+        usage = self._scan()
+        keys = [
+            key
+            for key, info in usage.items()
+            if endpoint is None or info.endpoint == endpoint
+        ]
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+    def record_counters(self, counters: Mapping[str, int]) -> None:
+        """Add this run's hit/miss counts to the persistent totals."""
+        with self._lock:
+            totals = self._read_counters()
+            for name in COUNTER_NAMES:
+                totals[name] = totals.get(name, 0) + int(counters.get(name, 0))
+            _atomic_write(self.directory / self.stats_filename, codec.dumps(totals))
+
+    def close(self) -> None:
+        """Nothing to release; present for :class:`CacheStore` parity."""
+
+    def _write_meta(self, key: str, entry: CacheEntry, compression: str) -> bytes:
+        data = codec.dumps({**entry.metadata(), "compression": compression})
+        _atomic_write(self.meta_path(key), data)
+        return data
+
+    def _stored_compression(self, key: str) -> str:
+        """Algorithm of the body already on disk for ``key``."""
+        try:
+            return str(codec.read_json(self.meta_path(key)).get("compression", "none"))
+        except (OSError, ValueError, AttributeError):
+            return self.compression
+
+    def _mark_access(self, key: str) -> None:
+        now = time.time()
+        try:
+            os.utime(self.meta_path(key), (now, now))
+        except OSError:  # pragma: no cover - removed concurrently
+            return
+        with self._lock:
+            if self._usage is not None and key in self._usage:
+                self._usage[key].last_access = now
+
+    def _read_counters(self) -> dict[str, int]:
+        path = self.directory / self.stats_filename
+        try:
+            data = codec.read_json(path)
+        except (OSError, ValueError):
+            return {}
+        return {name: int(data.get(name, 0)) for name in COUNTER_NAMES}
+
+    def _scan(self) -> dict[str, _Usage]:
+        """Rebuild the usage index from the sidecar files on disk."""
+        usage: dict[str, _Usage] = {}
+        for meta_path in self.directory.glob("*.meta.json"):
+            key = meta_path.name[: -len(".meta.json")]
+            try:
+                meta = codec.read_json(meta_path)
+                meta_stat = meta_path.stat()
+                algorithm = meta.get("compression", "none")
+                body_size = self.body_path(key, algorithm).stat().st_size
+                stored_at = float(meta["timestamp"])
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            ttl = meta.get("ttl")
+            usage[key] = _Usage(
+                endpoint=str(meta.get("endpoint", "")),
+                size=body_size + meta_stat.st_size,
+                stored_at=stored_at,
+                expires_at=None if ttl is None else stored_at + float(ttl),
+                last_access=meta_stat.st_mtime,
+            )
+        for key, body_stat in self._orphan_bodies(usage):
+            usage[key] = _Usage(
+                endpoint=self.orphan_endpoint,
+                size=body_stat.st_size,
+                stored_at=body_stat.st_mtime,
+                expires_at=body_stat.st_mtime,
+                last_access=body_stat.st_mtime,
+            )
+        with self._lock:
+            self._usage = usage
+        return dict(usage)
+
+    def _orphan_bodies(
+        self, known: Mapping[str, _Usage]
+    ) -> list[tuple[str, os.stat_result]]:
+        """Body files whose key has no readable sidecar."""
+        orphans: list[tuple[str, os.stat_result]] = []
+        for path in payload_files(self.directory):
+            key = payload_stem(path)
+            if (
+                path.name.startswith(".")
+                or path.name.endswith(".meta.json")
+                or path.name == self.stats_filename
+                or key in known
+                or self.meta_path(key).exists()
+            ):
+                continue
+            try:
+                orphans.append((key, path.stat()))
+            except OSError:  # pragma: no cover - removed concurrently
+                continue
+        return orphans
+
+    def _enforce_limits(self, now: float) -> int:
+        if self.max_bytes <= 0 and self.max_entries <= 0:
+            return 0
+        with self._lock:
+            usage = dict(self._usage) if self._usage is not None else None
+        if usage is None:
+            usage = self._scan()
+        entries = len(usage)
+        total = sum(info.size for info in usage.values())
+        evicted = 0
+        for key, info in _eviction_order(usage, now):
+            if not _over_limits(entries, total, self.max_entries, self.max_bytes):
+                break
+            self.delete(key)
+            entries -= 1
+            total -= info.size
+            evicted += 1
+        if evicted:
+            _log_evicted(str(self.directory), evicted, entries, total)
+        return evicted
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    ttl REAL,
+    expires_at REAL,
+    etag TEXT,
+    last_modified TEXT,
+    encoding TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cache_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cache_totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    entries INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO cache_totals (id, entries, bytes)
+    SELECT 1, count(*), coalesce(sum(size), 0) FROM http_cache;
+CREATE TRIGGER IF NOT EXISTS http_cache_added AFTER INSERT ON http_cache BEGIN
+    UPDATE cache_totals SET entries = entries + 1, bytes = bytes + new.size;
+END;
+CREATE TRIGGER IF NOT EXISTS http_cache_removed AFTER DELETE ON http_cache BEGIN
+    UPDATE cache_totals SET entries = entries - 1, bytes = bytes - old.size;
+END;
+CREATE TRIGGER IF NOT EXISTS http_cache_resized AFTER UPDATE OF size ON http_cache
+BEGIN
+    UPDATE cache_totals SET bytes = bytes - old.size + new.size;
+END;
+CREATE INDEX IF NOT EXISTS http_cache_endpoint ON http_cache (endpoint);
+CREATE INDEX IF NOT EXISTS http_cache_expires_at ON http_cache (expires_at);
+CREATE INDEX IF NOT EXISTS http_cache_last_access ON http_cache (last_access);
+"""
+
+# Hits whose last_access is written in one batch instead of one UPDATE each.
+_TOUCH_BATCH = 64
+
+
+class SQLiteCacheStore:
+    """Stores entries in one SQLite database in WAL mode.
+
+    WAL lets several ``cartola-fetch`` processes and notebook kernels read
+    while one writes; each ``put`` is a single-row upsert, so readers never see
+    a half-written entry. Bodies are compressed (zlib, or zstd when requested)
+    and the ``encoding`` column says how each row was written. ``expires_at`` is
+    indexed so expiry sweeps are range queries, and ``last_access`` drives LRU
+    eviction once ``max_bytes``/``max_entries`` are exceeded.
+
+    Triggers keep the entry count and byte total in ``cache_totals``, so the
+    limit check on each ``put`` reads one row. Hits only queue their
+    ``last_access``; the queue is written every ``_TOUCH_BATCH`` hits, before
+    an eviction and on ``close``.
+    """
+
+    filename = "http_cache.sqlite3"
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_bytes: int = 0,
+        max_entries: int = 0,
+        compression: str = "zlib",
+        compression_level: int = 0,
+        busy_timeout: float = 30.0,
+    ) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / self.filename
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.compression = compression
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self._touches: dict[str, float] = {}
+        self._conn = sqlite3.connect(
+            self.path,
+            timeout=busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SQLITE_SCHEMA)
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, endpoint, fetched_at, ttl, etag, last_modified,"
+                " encoding, body FROM http_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is not None:
+                self._touches[key] = time.time()
+                if len(self._touches) >= _TOUCH_BATCH:
+                    self._flush_touches()
+        if row is None:
+            return None
+        url, endpoint, fetched_at, ttl, etag, last_modified, encoding, body = row
+        try:
+            data = decompress(bytes(body), encoding)
+        except ValueError:
+            self.delete(key)
+            logger.warning(
+                "cache_corrupted",
+                extra={"event": "cache_corrupted", "path": self.location(key)},
+            )
+            return None
+        return CacheEntry(
+            url=url,
+            endpoint=endpoint,
+            body=data,
+            stored_at=fetched_at,
+            etag=etag,
+            last_modified=last_modified,
+            ttl=ttl,
+        )
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        body = compress(entry.body, self.compression, self.compression_level)
+        with self._lock:
+            self._touches.pop(key, None)
+            self._conn.execute(
+                "INSERT INTO http_cache (key, url, endpoint, fetched_at, ttl,"
+                " expires_at, etag, last_modified, encoding, body, size,"
+                " last_access) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET url = excluded.url,"
+                " endpoint = excluded.endpoint, fetched_at = excluded.fetched_at,"
+                " ttl = excluded.ttl, expires_at = excluded.expires_at,"
+                " etag = excluded.etag, last_modified = excluded.last_modified,"
+                " encoding = excluded.encoding, body = excluded.body,"
+                " size = excluded.size, last_access = excluded.last_access",
+                (
+                    key,
+                    entry.url,
+                    entry.endpoint,
+                    entry.stored_at,
+                    entry.ttl,
+                    entry.expires_at(),
+                    entry.etag,
+                    entry.last_modified,
+                    self.compression,
+                    body,
+                    len(body),
+                    time.time(),
+                ),
+            )
+        self._enforce_limits(time.time())
+
+    def touch(self, key: str, entry: CacheEntry, stored_at: float) -> CacheEntry:
+        """Refresh the timestamp of ``entry`` without rewriting its body."""
+        refreshed = replace(entry, stored_at=stored_at)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE http_cache SET fetched_at = ?, expires_at = ? WHERE key = ?",
+                (stored_at, refreshed.expires_at(), key),
+            )
+        return refreshed
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM http_cache WHERE key = ?", (key,))
+
+    def purge_expired(self, now: float | None = None) -> int:
+        """Delete entries past ``expires_at``; returns how many were removed."""
+        moment = now if now is not None else time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM http_cache WHERE expires_at < ?", (moment,)
+            )
+        return cursor.rowcount
+
+    def location(self, key: str) -> str:
+        return f"{self.path}#{key}"
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT endpoint, count(*), coalesce(sum(size), 0)"
+                " FROM http_cache GROUP BY endpoint"
+            ).fetchall()
+            oldest = self._conn.execute(
+                "SELECT fetched_at, endpoint FROM http_cache"
+                " ORDER BY fetched_at LIMIT 1"
+            ).fetchone()
+            counters = dict(
+                self._conn.execute("SELECT name, value FROM cache_counters")
+            )
+        by_endpoint = {endpoint: (count, size) for endpoint, count, size in rows}
+        return CacheStats(
+            entries=sum(count for count, _ in by_endpoint.values()),
+            bytes=sum(size for _, size in by_endpoint.values()),
+            oldest=oldest[0] if oldest else None,
+            oldest_endpoint=oldest[1] if oldest else None,
+            counters={name: int(counters.get(name, 0)) for name in COUNTER_NAMES},
+            by_endpoint=by_endpoint,
+        )
+
+    def prune(self, now: float | None = None) -> int:
+        """Drop expired entries, then enforce the size limits."""
+        moment = now if now is not None else time.time()
+        return self.purge_expired(moment) + self._enforce_limits(moment)
+
+    def clear(self, endpoint: str | None = None) -> int:
+        with self._lock:
+            if endpoint is None:
+                cursor = self._conn.execute("DELETE FROM http_cache")
+            else:
+                cursor = self._conn.execute(
+                    "DELETE FROM http_cache WHERE endpoint = ?", (endpoint,)
+                )
+        return cursor.rowcount
+
+    def record_counters(self, counters: Mapping[str, int]) -> None:
+        """Add this run's hit/miss counts to the persistent totals."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO cache_counters (name, value) VALUES (?, ?)"
+                " ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                [(name, int(counters.get(name, 0))) for name in COUNTER_NAMES],
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touches()
+            self._conn.close()
+
+    def _flush_touches(self) -> None:
+        """Write the queued ``last_access`` values; the caller holds the lock."""
+        if not self._touches:
+            return
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(
+                "UPDATE http_cache SET last_access = ? WHERE key = ?",
+                [(moment, key) for key, moment in self._touches.items()],
+            )
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        self._touches.clear()
+
+    def _enforce_limits(self, now: float) -> int:
+        if self.max_bytes <= 0 and self.max_entries <= 0:
+            return 0
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT entries, bytes FROM cache_totals"
+            ).fetchone()
+            if not _over_limits(entries, total, self.max_entries, self.max_bytes):
+                return 0
+            self._flush_touches()
+            candidates = self._conn.execute(
+                "SELECT key, size FROM http_cache ORDER BY"
+                " (expires_at IS NOT NULL AND expires_at < ?) DESC,"
+                " CASE WHEN expires_at < ? THEN expires_at"
+                " ELSE last_access END",
+                (now, now),
+            )
+            victims: list[str] = []
+            for key, size in candidates:
+                if not _over_limits(entries, total, self.max_entries, self.max_bytes):
+                    break
+                victims.append(key)
+                entries -= 1
+                total -= size
+            self._conn.executemany(
+                "DELETE FROM http_cache WHERE key = ?", [(key,) for key in victims]
+            )
+        _log_evicted(str(self.path), len(victims), entries, total)
+        return len(victims)
+
+
+def _over_limits(entries: int, total: int, max_entries: int, max_bytes: int) -> bool:
+    return (max_entries > 0 and entries > max_entries) or (
+        max_bytes > 0 and total > max_bytes
+    )
+
+
+def _log_evicted(location: str, evicted: int, entries: int, total: int) -> None:
+    logger.info(
+        "cache_evicted",
+        extra={
+            "event": "cache_evicted",
+            "path": location,
+            "evicted": evicted,
+            "entries": entries,
+            "bytes": total,
+        },
+    )
+
+
+class MemoryCache:
+    """Process-local LRU tier kept in front of a :class:`CacheStore`.
+
+    Holds the :class:`CacheEntry` (so freshness follows the disk entry's
+    ``stored_at``/TTL) and, optionally, the payload decoded from it. The byte
+    budget counts response bodies; decoded payloads are not measured.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._items: OrderedDict[str, tuple[CacheEntry, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> tuple[CacheEntry, Any] | None:
+        """Return ``(entry, payload)``; payload is ``NOT_DECODED`` if absent."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def put(self, key: str, entry: CacheEntry, payload: Any = NOT_DECODED) -> None:
+        size = len(entry.body)
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._items[key] = (entry, payload)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                oldest = next(iter(self._items))
+                self._remove(oldest)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
+
+    def _remove(self, key: str) -> None:
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.bytes -= len(item[0].body)
+
+
+def open_cache_store(
+    backend: str,
+    directory: Path,
+    *,
+    max_bytes: int = 0,
+    max_entries: int = 0,
+    compression: str = "none",
+    compression_level: int = 0,
+) -> CacheStore:
+    """Build the cache store named by ``CartolaSettings.cache_backend``.
+
+    The SQLite store always compresses: zstd when asked for, zlib otherwise
+    (``gzip`` would only add a header around the same deflate stream).
+    """
+    algorithm = resolve(compression)
+    if backend == "sqlite":
+        return SQLiteCacheStore(
+            directory,
+            max_bytes=max_bytes,
+            max_entries=max_entries,
+            compression="zstd" if algorithm == "zstd" else "zlib",
+            compression_level=compression_level,
+        )
+    if backend == "files":
+        return FileCacheStore(
+            directory,
+            max_bytes=max_bytes,
+            max_entries=max_entries,
+            compression=algorithm,
+            compression_level=compression_level,
+        )
+    raise ValueError(f"Backend de cache desconhecido: {backend}")
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,105 @@
+"""Per-endpoint cache policies derived from the endpoint catalog."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from .endpoints import Endpoint
+
+_ROUND_LIST_KEYS = ("rodadas", "lista", "items", "data")
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How long a cached response may be served for one resolved URL."""
+
+    ttl: int
+    stale_while_revalidate: int = 0
+    immutable: bool = False
+
+    def is_fresh(self, age: float) -> bool:
+        return self.immutable or age <= self.ttl
+
+    def retention(self) -> float | None:
+        """Seconds an entry stays usable (TTL plus stale window); ``None`` = forever."""
+        if self.immutable:
+            return None
+        return float(self.ttl + self.stale_while_revalidate)
+
+    def serves_stale(self, age: float) -> bool:
+        """Whether an expired entry may still be returned while refreshing."""
+        return self.stale_while_revalidate > 0 and (
+            age <= self.ttl + self.stale_while_revalidate
+        )
+
+
+def resolve_cache_policy(
+    endpoint: Endpoint,
+    rodada: int | None,
+    *,
+    default_ttl: int,
+    finished_rounds: Iterable[int] = (),
+) -> CachePolicy:
+    """Build the policy for ``endpoint`` (and ``rodada``) from catalog metadata."""
+    ttl = endpoint.cache_ttl if endpoint.cache_ttl is not None else default_ttl
+    immutable = (
+        endpoint.immutable_when_finished
+        and rodada is not None
+        and rodada in set(finished_rounds)
+    )
+    return CachePolicy(
+        ttl=max(ttl, 0),
+        stale_while_revalidate=max(endpoint.stale_while_revalidate, 0),
+        immutable=immutable,
+    )
+
+
+def finished_rounds_from_payload(
+    payload: Any, *, now: datetime | None = None
+) -> set[int]:
+    """Return the ids of rounds whose ``fim`` is in the past.
+
+    Accepts the ``rodadas`` payload either as a bare list or wrapped in one of
+    the usual list keys. Naive timestamps are treated as UTC, matching
+    ``transform_rodadas``.
+    """
+    reference = now or datetime.now(tz=UTC)
+    items: list[Any] = []
+    if isinstance(payload, list):
+        items = payload
+    elif isinstance(payload, dict):
+        for key in _ROUND_LIST_KEYS:
+            value = payload.get(key)
+            if isinstance(value, list):
+                items = value
+                break
+
+    finished: set[int] = set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        rodada_id = item.get("rodada_id")
+        fim = _parse_moment(item.get("fim") or item.get("fechamento"))
+        if rodada_id is None or fim is None:
+            continue
+        try:
+            if fim < reference:
+                finished.add(int(rodada_id))
+        except (TypeError, ValueError):  # pragma: no cover - defensive
+            continue
+    return finished
+
+
+def _parse_moment(value: Any) -> datetime | None:
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(float(value), tz=UTC)
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=UTC)
@@ -0,0 +1,195 @@
+"""Per-host circuit breaker so runs fail fast while the Cartola API is down."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from urllib.parse import urlsplit
+
+import httpx
+
+from .config import CartolaSettings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        super().__init__(
+            f"Circuito aberto para {host}; nova tentativa em {retry_in:.1f}s"
+        )
+        self.host = host
+        self.retry_in = retry_in
+
+
+class Circuit:
+    """Closed/open/half-open state machine for a single host.
+
+    ``threshold`` consecutive failures open the circuit; after ``cooldown``
+    seconds a single probe request is let through (half-open). A successful
+    probe closes the circuit, a failed one re-opens it for another cooldown; a
+    probe that ends without a verdict (cancelled, unexpected error) is handed
+    back with :meth:`release` so the next request can probe instead.
+    Methods return the new state when a transition happens, ``None`` otherwise.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        cooldown: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.threshold = max(threshold, 1)
+        self.cooldown = max(cooldown, 0.0)
+        self.state = CLOSED
+        self.failures = 0
+        self._clock = clock
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> tuple[bool, str | None]:
+        """Return ``(allowed, transition)`` for a request about to be sent."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True, None
+            if self.state == OPEN:
+                if self._clock() - self._opened_at < self.cooldown:
+                    return False, None
+                self.state = HALF_OPEN
+                self._probing = True
+                return True, HALF_OPEN
+            if self._probing:
+                return False, None
+            self._probing = True
+            return True, None
+
+    def record_success(self) -> str | None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            if self.state == CLOSED:
+                return None
+            self.state = CLOSED
+            return CLOSED
+
+    def record_failure(self) -> str | None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.failures >= self.threshold
+            ):
+                self.state = OPEN
+                self._opened_at = self._clock()
+                return OPEN
+            return None
+
+    def release(self) -> None:
+        """Free the half-open probe slot without counting a success or failure."""
+        with self._lock:
+            self._probing = False
+
+    def retry_in(self) -> float:
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(self.cooldown - (self._clock() - self._opened_at), 0.0)
+
+
+class CircuitBreaker:
+    """Keeps one :class:`Circuit` per host and logs its state transitions.
+
+    A ``threshold`` of zero (or less) disables the breaker.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        cooldown: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._circuits: dict[str, Circuit] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: CartolaSettings) -> CircuitBreaker:
+        return cls(settings.circuit_threshold, settings.circuit_cooldown)
+
+    def circuit_for(self, url: str) -> Circuit | None:
+        if self.threshold <= 0:
+            return None
+        host = urlsplit(url).netloc
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None:
+                circuit = Circuit(self.threshold, self.cooldown, clock=self._clock)
+                self._circuits[host] = circuit
+            return circuit
+
+    def state(self, url: str) -> str:
+        circuit = self.circuit_for(url)
+        return circuit.state if circuit is not None else CLOSED
+
+    def before_request(self, url: str) -> None:
+        """Raise :class:`CircuitOpenError` if ``url``'s host must not be hit."""
+        circuit = self.circuit_for(url)
+        if circuit is None:
+            return
+        allowed, transition = circuit.allow()
+        self._log_transition(url, circuit, transition)
+        if not allowed:
+            raise CircuitOpenError(urlsplit(url).netloc, circuit.retry_in())
+
+    def record_success(self, url: str) -> None:
+        circuit = self.circuit_for(url)
+        if circuit is not None:
+            self._log_transition(url, circuit, circuit.record_success())
+
+    def record_failure(self, url: str) -> None:
+        """Count a failure and raise :class:`CircuitOpenError` if it tripped."""
+        circuit = self.circuit_for(url)
+        if circuit is None:
+            return
+        transition = circuit.record_failure()
+        self._log_transition(url, circuit, transition)
+        if transition == OPEN:
+            raise CircuitOpenError(urlsplit(url).netloc, circuit.retry_in())
+
+    def release(self, url: str) -> None:
+        """Hand back a probe that ended without a response (e.g. cancelled)."""
+        circuit = self.circuit_for(url)
+        if circuit is not None:
+            circuit.release()
+
+    def _log_transition(
+        self, url: str, circuit: Circuit, transition: str | None
+    ) -> None:
+        if transition is None:
+            return
+        event = f"circuit_{transition}"
+        level = logging.WARNING if transition == OPEN else logging.INFO
+        logger.log(
+            level,
+            event,
+            extra={
+                "event": event,
+                "host": urlsplit(url).netloc,
+                "state": transition,
+                "consecutive_failures": circuit.failures,
+                "cooldown": circuit.cooldown,
+            },
+        )
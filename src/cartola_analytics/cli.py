@@ -3,36 +3,51 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
 import sys
 from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, Callable
 
 import httpx
 
 from . import (
+    AsyncCartolaClient,
     CartolaClient,
+    CartolaSettings,
     Endpoint,
+    RateLimiter,
+    codec,
     collect_endpoint_payload,
+    collect_endpoint_payload_async,
+    collect_endpoint_payloads,
     configure_logging_from_settings,
     list_endpoints,
     load_settings,
-    transform_clubes,
-    transform_mercado_status,
-    transform_partidas,
-    transform_rodadas,
 )
+from .cache import COUNTER_NAMES, CacheStats, open_cache_store
+from .pipelines.bronze import bronze_is_stale, build_bronze
+from .pipelines.engine import schema_transformers
+from .pipelines.raw import RawWriter
+from .pipelines.raw_retention import RetentionPolicy, archive_raw, retention_policies
+from .pipelines.raw_store import rebuild_index
 
 _logger = logging.getLogger(__name__)
 
+_Job = tuple[Endpoint, int | None]
+_Failure = tuple[str, int | None, str]
 
-_AUTO_TRANSFORMERS: dict[str, Callable[..., dict[str, Any]]] = {
-    "rodadas": transform_rodadas,
-    "mercado_status": transform_mercado_status,
-    "partidas": transform_partidas,
-    "clubes": transform_clubes,
-}
+
+def _auto_transformers() -> dict[str, Callable[..., dict[str, Any]]]:
+    """Transform of every schema YAML, keyed by endpoint.
+
+    Read when a collection finishes (nothing is compiled at import), so a new
+    ``docs/schemas/<nome>.yaml`` runs after its endpoint is collected without
+    touching the CLI.
+    """
+    return schema_transformers()
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -70,9 +85,62 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Permite usar cache local do cliente HTTP.",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=1,
+        help=(
+            "Numero maximo de requisicoes simultaneas (padrao: 1, coleta "
+            "sequencial)."
+        ),
+    )
+    parser.add_argument(
+        "--executor",
+        choices=("async", "threads"),
+        default="async",
+        help=(
+            "Estrategia usada quando --concurrency > 1: 'async' (AsyncCartolaClient)"
+            " ou 'threads' (CartolaClient.fetch_many)."
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Transformacoes processam apenas os snapshots ainda nao consolidados"
+            " e mesclam o resultado no dataset processado."
+        ),
+    )
+    parser.add_argument(
+        "--include-archived",
+        action="store_true",
+        help=(
+            "Transformacoes incrementais tambem leem os snapshots arquivados"
+            " (cartola-fetch raw archive); execucoes completas sempre os leem."
+        ),
+    )
+    parser.add_argument(
+        "--transform-workers",
+        type=_positive_int,
+        default=1,
+        help=(
+            "Numero de processos usados pelas transformacoes para ler os payloads"
+            " brutos (padrao: 1)."
+        ),
+    )
     return parser
 
 
+def _positive_int(value: str) -> int:
+    try:
+        parsed = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Valor inteiro invalido: {value}") from exc
+    if parsed < 1:
+        raise argparse.ArgumentTypeError("O valor deve ser maior ou igual a 1.")
+    return parsed
+
+
 def _select_endpoints(
     catalog: Sequence[Endpoint],
     all_flag: bool,
@@ -114,16 +182,16 @@ def _validate_round(
         )
 
 
-def _discover_all_rounds(
-    client: CartolaClient, catalog: Sequence[Endpoint]
-) -> list[int]:
+def _rounds_endpoint(catalog: Sequence[Endpoint]) -> Endpoint:
     rodada_endpoint = next((ep for ep in catalog if ep.name == "rodadas"), None)
     if rodada_endpoint is None:
         raise SystemExit(
             "Endpoint 'rodadas' nao encontrado para descobrir rodadas disponiveis."
         )
+    return rodada_endpoint
 
-    payload = client.fetch(rodada_endpoint, use_cache=True)
+
+def _extract_rounds(payload: Any) -> list[int]:
     rounds: list[int] = []
 
     def _extract(value: Any) -> None:
@@ -157,10 +225,438 @@ def _discover_all_rounds(
     return unique
 
 
+def _discover_all_rounds(
+    client: CartolaClient, catalog: Sequence[Endpoint]
+) -> list[int]:
+    payload = client.fetch(_rounds_endpoint(catalog), use_cache=True)
+    return _extract_rounds(payload)
+
+
+async def _discover_all_rounds_async(
+    client: AsyncCartolaClient, catalog: Sequence[Endpoint]
+) -> list[int]:
+    payload = await client.fetch(_rounds_endpoint(catalog), use_cache=True)
+    return _extract_rounds(payload)
+
+
+def _build_jobs(
+    endpoints: Sequence[Endpoint],
+    rounds_to_use: Sequence[int],
+    rodada: int | None,
+) -> list[_Job]:
+    jobs: list[_Job] = []
+    for endpoint in endpoints:
+        if endpoint.requires_round:
+            if not rounds_to_use:
+                raise SystemExit(
+                    "Nenhuma rodada identificada."
+                    " Use --rodada ou verifique o endpoint de rodadas."
+                )
+            jobs.extend((endpoint, value) for value in rounds_to_use)
+        else:
+            jobs.append((endpoint, rodada))
+    return jobs
+
+
+def _log_collect(endpoint: Endpoint, rodada: int | None, base_dir: Path) -> None:
+    _logger.info(
+        "cli_collect",
+        extra={
+            "event": "cli_collect",
+            "endpoint": endpoint.name,
+            "rodada": rodada,
+            "output_dir": str(base_dir),
+        },
+    )
+
+
+def _log_collect_failed(endpoint: Endpoint, rodada: int | None, err: Exception) -> None:
+    _logger.error(
+        "cli_collect_failed",
+        extra={
+            "event": "cli_collect_failed",
+            "endpoint": endpoint.name,
+            "rodada": rodada,
+            "error": str(err),
+        },
+    )
+
+
+def _collect_serially(
+    jobs: Sequence[_Job],
+    *,
+    client: CartolaClient,
+    settings: CartolaSettings,
+    base_dir: Path,
+    use_cache: bool,
+    writer: RawWriter,
+) -> tuple[set[str], list[_Failure]]:
+    successful_endpoints: set[str] = set()
+    failures: list[_Failure] = []
+    for endpoint, rodada in jobs:
+        try:
+            _log_collect(endpoint, rodada, base_dir)
+            collect_endpoint_payload(
+                endpoint,
+                rodada=rodada,
+                client=client,
+                settings=settings,
+                base_dir=base_dir,
+                use_cache=use_cache,
+                writer=writer,
+            )
+            successful_endpoints.add(endpoint.name)
+        except (httpx.HTTPError, ValueError) as err:
+            _log_collect_failed(endpoint, rodada, err)
+            failures.append((endpoint.name, rodada, str(err)))
+    return successful_endpoints, failures
+
+
+def _collect_threaded(
+    jobs: Sequence[_Job],
+    *,
+    client: CartolaClient,
+    settings: CartolaSettings,
+    base_dir: Path,
+    use_cache: bool,
+    max_workers: int,
+    writer: RawWriter,
+) -> tuple[set[str], list[_Failure]]:
+    """Collect jobs on the sync client's thread pool via ``fetch_many``."""
+    for endpoint, rodada in jobs:
+        _log_collect(endpoint, rodada, base_dir)
+    results = collect_endpoint_payloads(
+        jobs,
+        client=client,
+        settings=settings,
+        base_dir=base_dir,
+        use_cache=use_cache,
+        max_workers=max_workers,
+        writer=writer,
+    )
+    successful_endpoints: set[str] = set()
+    failures: list[_Failure] = []
+    for result in results:
+        if result.error is None:
+            successful_endpoints.add(result.endpoint.name)
+        elif isinstance(result.error, (httpx.HTTPError, ValueError)):
+            _log_collect_failed(result.endpoint, result.rodada, result.error)
+            failures.append((result.endpoint.name, result.rodada, str(result.error)))
+        else:
+            raise result.error
+    return successful_endpoints, failures
+
+
+async def _collect_concurrently(
+    jobs: Sequence[_Job],
+    *,
+    client: AsyncCartolaClient,
+    settings: CartolaSettings,
+    base_dir: Path,
+    use_cache: bool,
+    concurrency: int,
+    writer: RawWriter,
+) -> tuple[set[str], list[_Failure]]:
+    """Fan out endpoint/round pairs over a semaphore-bounded task group."""
+    semaphore = asyncio.Semaphore(concurrency)
+    outcomes: list[str | None] = [None] * len(jobs)
+
+    async def _run(index: int, endpoint: Endpoint, rodada: int | None) -> None:
+        async with semaphore:
+            try:
+                _log_collect(endpoint, rodada, base_dir)
+                await collect_endpoint_payload_async(
+                    endpoint,
+                    rodada=rodada,
+                    client=client,
+                    settings=settings,
+                    base_dir=base_dir,
+                    use_cache=use_cache,
+                    writer=writer,
+                )
+            except (httpx.HTTPError, ValueError) as err:
+                _log_collect_failed(endpoint, rodada, err)
+                outcomes[index] = str(err)
+            else:
+                outcomes[index] = None
+
+    async with asyncio.TaskGroup() as group:
+        for index, (endpoint, rodada) in enumerate(jobs):
+            group.create_task(_run(index, endpoint, rodada))
+
+    successful_endpoints: set[str] = set()
+    failures: list[_Failure] = []
+    for (endpoint, rodada), error in zip(jobs, outcomes, strict=True):
+        if error is None:
+            successful_endpoints.add(endpoint.name)
+        else:
+            failures.append((endpoint.name, rodada, error))
+    return successful_endpoints, failures
+
+
+async def _collect_async(
+    endpoints: Sequence[Endpoint],
+    catalog: Sequence[Endpoint],
+    *,
+    rodada: int | None,
+    all_flag: bool,
+    settings: CartolaSettings,
+    base_dir: Path,
+    use_cache: bool,
+    concurrency: int,
+    rate_limiter: RateLimiter,
+    writer: RawWriter,
+) -> tuple[set[str], list[_Failure]]:
+    async with AsyncCartolaClient(
+        settings=settings,
+        rate_limiter=rate_limiter,
+        share_responses=True,
+        serve_stale=False,
+    ) as client:
+        rounds_to_use: list[int] = []
+        if rodada is not None:
+            rounds_to_use = [rodada]
+        elif all_flag:
+            rounds_to_use = await _discover_all_rounds_async(client, catalog)
+
+        jobs = _build_jobs(endpoints, rounds_to_use, rodada)
+        return await _collect_concurrently(
+            jobs,
+            client=client,
+            settings=settings,
+            base_dir=base_dir,
+            use_cache=use_cache,
+            concurrency=concurrency,
+            writer=writer,
+        )
+
+
+def _build_cache_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cartola-fetch cache",
+        description="Inspeciona e limpa o cache HTTP local.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "stats", help="Mostra entradas, bytes, hit ratio e a entrada mais antiga."
+    )
+    commands.add_parser(
+        "prune",
+        help="Remove entradas expiradas e aplica os limites de tamanho.",
+    )
+    clear = commands.add_parser("clear", help="Remove entradas do cache.")
+    clear.add_argument(
+        "--endpoint",
+        help="Remove apenas as entradas deste endpoint.",
+    )
+    return parser
+
+
+def _format_bytes(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    value = size / 1024
+    for unit in ("KB", "MB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def _format_moment(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _print_cache_stats(stats: CacheStats, settings: CartolaSettings) -> None:
+    limit = (
+        _format_bytes(settings.cache_max_bytes)
+        if settings.cache_max_bytes > 0
+        else "sem limite"
+    )
+    print(f"backend: {settings.cache_backend} ({settings.cache_dir})")
+    print(f"entradas: {stats.entries}")
+    print(f"bytes: {_format_bytes(stats.bytes)} (limite: {limit})")
+    ratio = stats.hit_ratio
+    counters = " ".join(
+        f"{name}={stats.counters.get(name, 0)}" for name in COUNTER_NAMES
+    )
+    ratio_label = f"{ratio:.1%}" if ratio is not None else "-"
+    print(f"hit ratio: {ratio_label} ({counters})")
+    if stats.oldest is not None:
+        print(
+            f"entrada mais antiga: {_format_moment(stats.oldest)}"
+            f" ({stats.oldest_endpoint})"
+        )
+    for endpoint_name in sorted(stats.by_endpoint):
+        count, size = stats.by_endpoint[endpoint_name]
+        print(f"  {endpoint_name}: {count} entradas, {_format_bytes(size)}")
+
+
+def _cache_main(argv: list[str]) -> int:
+    parser = _build_cache_parser()
+    args = parser.parse_args(argv)
+    settings = load_settings()
+    configure_logging_from_settings(settings)
+
+    if args.command == "clear" and args.endpoint is not None:
+        known = {endpoint.name for endpoint in list_endpoints()}
+        if args.endpoint not in known:
+            parser.error(f"Endpoint desconhecido: {args.endpoint}")
+    if settings.cache_dir is None:
+        print("[erro] cache desativado (CARTOLA_CACHE_DIR=none)", file=sys.stderr)
+        return 1
+
+    store = open_cache_store(
+        settings.cache_backend,
+        settings.cache_dir,
+        max_bytes=settings.cache_max_bytes,
+        max_entries=settings.cache_max_entries,
+        compression=settings.cache_compression,
+        compression_level=settings.compression_level,
+    )
+    try:
+        if args.command == "stats":
+            _print_cache_stats(store.stats(), settings)
+        elif args.command == "prune":
+            print(f"{store.prune()} entradas removidas")
+        else:
+            print(f"{store.clear(args.endpoint)} entradas removidas")
+    finally:
+        store.close()
+    _logger.debug(
+        "cli_cache",
+        extra={"event": "cli_cache", "command": args.command},
+    )
+    return 0
+
+
+def _build_raw_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cartola-fetch raw",
+        description="Mantem o indice, o arquivo e a camada bronze dos payloads brutos.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    reindex = commands.add_parser(
+        "reindex",
+        help="Reconstroi o indice varrendo o diretorio raw.",
+    )
+    reindex.add_argument(
+        "--endpoint",
+        action="append",
+        dest="endpoints",
+        help="Reindexa apenas este endpoint (pode repetir).",
+    )
+    reindex.add_argument(
+        "--output",
+        type=Path,
+        help="Diretorio raw (padrao: CARTOLA_RAW_DIR).",
+    )
+    bronze = commands.add_parser(
+        "bronze",
+        help="Reconstroi a camada bronze (Parquet) a partir dos payloads brutos.",
+    )
+    bronze.add_argument(
+        "--endpoint",
+        action="append",
+        dest="endpoints",
+        help="Converte apenas este endpoint (pode repetir).",
+    )
+    bronze.add_argument(
+        "--output",
+        type=Path,
+        help="Diretorio raw (padrao: CARTOLA_RAW_DIR).",
+    )
+    bronze.add_argument(
+        "--bronze-dir",
+        type=Path,
+        help="Diretorio da camada bronze (padrao: CARTOLA_BRONZE_DIR).",
+    )
+    archive = commands.add_parser(
+        "archive",
+        help="Move snapshots antigos para arquivos zip por rodada.",
+    )
+    archive.add_argument(
+        "--endpoint",
+        action="append",
+        dest="endpoints",
+        help="Arquiva apenas este endpoint (pode repetir).",
+    )
+    archive.add_argument(
+        "--output",
+        type=Path,
+        help="Diretorio raw (padrao: CARTOLA_RAW_DIR).",
+    )
+    archive.add_argument(
+        "--older-than",
+        type=float,
+        metavar="DIAS",
+        help="Ignora as regras do schema e arquiva snapshots com mais de DIAS dias.",
+    )
+    archive.add_argument(
+        "--finished-rounds",
+        action="store_true",
+        help="Ignora as regras do schema e arquiva rodadas ja encerradas.",
+    )
+    return parser
+
+
+def _archive_raw(args: argparse.Namespace, raw_dir: Path) -> int:
+    policies = retention_policies()
+    if args.older_than is not None or args.finished_rounds:
+        override = RetentionPolicy(
+            hot_days=args.older_than, finished_rounds=args.finished_rounds
+        )
+        names = args.endpoints or sorted(policies)
+        policies = {**policies, **{name: override for name in names}}
+    counts = archive_raw(raw_dir, policies, endpoints=args.endpoints)
+    for name, count in counts.items():
+        print(f"{name}: {count} snapshots arquivados")
+    return sum(counts.values())
+
+
+def _raw_main(argv: list[str]) -> int:
+    parser = _build_raw_parser()
+    args = parser.parse_args(argv)
+    settings = load_settings()
+    configure_logging_from_settings(settings)
+
+    raw_dir = args.output or settings.raw_dir
+    if not raw_dir.is_dir():
+        print(f"[erro] diretorio raw inexistente: {raw_dir}", file=sys.stderr)
+        return 1
+    if args.command == "archive":
+        try:
+            total = _archive_raw(args, raw_dir)
+        except ValueError as err:
+            print(f"[erro] {err}", file=sys.stderr)
+            return 1
+    elif args.command == "bronze":
+        bronze_dir = args.bronze_dir or settings.bronze_dir
+        try:
+            total = build_bronze(raw_dir, bronze_dir, args.endpoints)
+        except ValueError as err:
+            print(f"[erro] {err}", file=sys.stderr)
+            return 1
+        print(f"{total} snapshots convertidos em {bronze_dir}")
+    else:
+        total = rebuild_index(raw_dir, args.endpoints)
+        print(f"{total} arquivos indexados em {raw_dir}")
+    _logger.debug(
+        "cli_raw",
+        extra={"event": "cli_raw", "command": args.command, "processed": total},
+    )
+    return 0
+
 
 def main(argv: list[str] | None = None) -> int:
+    cli_args = list(sys.argv[1:] if argv is None else argv)
+    if cli_args[:1] == ["cache"]:
+        return _cache_main(cli_args[1:])
+    if cli_args[:1] == ["raw"]:
+        return _raw_main(cli_args[1:])
+
     parser = _build_parser()
-    args = parser.parse_args(argv)
+    args = parser.parse_args(cli_args)
 
     if args.list:
         for endpoint in list_endpoints():
@@ -170,6 +666,17 @@ def main(argv: list[str] | None = None) -> int:
 
     settings = load_settings()
     configure_logging_from_settings(settings)
+    try:
+        codec.use_backend(settings.json_backend)
+    except ValueError as err:
+        _logger.warning(
+            "json_backend_unavailable",
+            extra={
+                "event": "json_backend_unavailable",
+                "backend": settings.json_backend,
+                "error": str(err),
+            },
+        )
     catalog = list_endpoints()
     base_dir = args.output or settings.raw_dir
     base_dir.mkdir(parents=True, exist_ok=True)
@@ -187,86 +694,57 @@ def main(argv: list[str] | None = None) -> int:
     if not args.all:
         _validate_round(endpoints, args.rodada)
 
-    rounds_to_use: list[int] = []
-    failures: list[tuple[str, int | None, str]] = []
-    successful_endpoints: set[str] = set()
-
-    with CartolaClient(settings=settings) as client:
-        if args.rodada is not None:
-            rounds_to_use = [args.rodada]
-        elif args.all:
-            rounds_to_use = _discover_all_rounds(client, catalog)
-
-        for endpoint in endpoints:
-            if endpoint.requires_round:
-                active_rounds = rounds_to_use or []
-                if not active_rounds:
-                    raise SystemExit(
-                        "Nenhuma rodada identificada."
-                        " Use --rodada ou verifique o endpoint de rodadas."
-                    )
-                for rodada in active_rounds:
-                    try:
-                        _logger.info(
-                            "cli_collect",
-                            extra={
-                                "event": "cli_collect",
-                                "endpoint": endpoint.name,
-                                "rodada": rodada,
-                                "output_dir": str(base_dir),
-                            },
-                        )
-                        collect_endpoint_payload(
-                            endpoint,
-                            rodada=rodada,
-                            client=client,
-                            settings=settings,
-                            base_dir=base_dir,
-                            use_cache=args.use_cache,
-                        )
-                        successful_endpoints.add(endpoint.name)
-                    except (httpx.HTTPError, ValueError) as err:
-                        _logger.error(
-                            "cli_collect_failed",
-                            extra={
-                                "event": "cli_collect_failed",
-                                "endpoint": endpoint.name,
-                                "rodada": rodada,
-                                "error": str(err),
-                            },
-                        )
-                        failures.append((endpoint.name, rodada, str(err)))
-            else:
-                try:
-                    _logger.info(
-                        "cli_collect",
-                        extra={
-                            "event": "cli_collect",
-                            "endpoint": endpoint.name,
-                            "rodada": args.rodada,
-                            "output_dir": str(base_dir),
-                        },
-                    )
-                    collect_endpoint_payload(
-                        endpoint,
-                        rodada=args.rodada,
+    rate_limiter = RateLimiter.from_settings(settings)
+    # One writer (and raw index connection) for every job of the run.
+    with RawWriter(base_dir, settings) as writer:
+        if args.concurrency > 1 and args.executor == "async":
+            successful_endpoints, failures = asyncio.run(
+                _collect_async(
+                    endpoints,
+                    catalog,
+                    rodada=args.rodada,
+                    all_flag=args.all,
+                    settings=settings,
+                    base_dir=base_dir,
+                    use_cache=args.use_cache,
+                    concurrency=args.concurrency,
+                    rate_limiter=rate_limiter,
+                    writer=writer,
+                )
+            )
+        else:
+            with CartolaClient(
+                settings=settings,
+                rate_limiter=rate_limiter,
+                share_responses=True,
+                serve_stale=False,
+            ) as client:
+                rounds_to_use: list[int] = []
+                if args.rodada is not None:
+                    rounds_to_use = [args.rodada]
+                elif args.all:
+                    rounds_to_use = _discover_all_rounds(client, catalog)
+
+                jobs = _build_jobs(endpoints, rounds_to_use, args.rodada)
+                if args.concurrency > 1:
+                    successful_endpoints, failures = _collect_threaded(
+                        jobs,
                         client=client,
                         settings=settings,
                         base_dir=base_dir,
                         use_cache=args.use_cache,
+                        max_workers=args.concurrency,
+                        writer=writer,
                     )
-                    successful_endpoints.add(endpoint.name)
-                except (httpx.HTTPError, ValueError) as err:
-                    _logger.error(
-                        "cli_collect_failed",
-                        extra={
-                            "event": "cli_collect_failed",
-                            "endpoint": endpoint.name,
-                            "rodada": args.rodada,
-                            "error": str(err),
-                        },
+                else:
+                    successful_endpoints, failures = _collect_serially(
+                        jobs,
+                        client=client,
+                        settings=settings,
+                        base_dir=base_dir,
+                        use_cache=args.use_cache,
+                        writer=writer,
                     )
-                    failures.append((endpoint.name, args.rodada, str(err)))
 
     if successful_endpoints:
         try:
@@ -274,12 +752,36 @@ def main(argv: list[str] | None = None) -> int:
         except OSError:
             raw_root = base_dir
 
-        for endpoint_name, transformer in _AUTO_TRANSFORMERS.items():
+        transform_kwargs: dict[str, Any] = {
+            'incremental': args.incremental,
+            'include_archived': args.include_archived,
+            'workers': args.transform_workers,
+        }
+        for endpoint_name, transformer in _auto_transformers().items():
             if endpoint_name not in successful_endpoints:
                 continue
             event_base = f'cli_transform_{endpoint_name}'
+            source_kwargs: dict[str, Any] = {}
+            if settings.bronze:
+                if bronze_is_stale(settings.bronze_dir, endpoint_name):
+                    # A bronze write failed: read the complete raw history.
+                    _logger.warning(
+                        'cli_bronze_behind',
+                        extra={
+                            'event': 'cli_bronze_behind',
+                            'endpoint': endpoint_name,
+                            'bronze_dir': str(settings.bronze_dir),
+                        },
+                    )
+                else:
+                    source_kwargs = {
+                        'source': 'bronze',
+                        'bronze_root': settings.bronze_dir,
+                    }
             try:
-                result = transformer(raw_root=raw_root)
+                result = transformer(
+                    raw_root=raw_root, **transform_kwargs, **source_kwargs
+                )
                 _logger.info(
                     event_base,
                     extra={
@@ -289,6 +791,8 @@ def main(argv: list[str] | None = None) -> int:
                         'processed_path': str(result.get('processed_path', '')),
                         'rows_stage': result.get('rows_stage'),
                         'rows_processed': result.get('rows_processed'),
+                        'rows_added': result.get('rows_added'),
+                        'rows_replaced': result.get('rows_replaced'),
                     },
                 )
             except Exception as err:  # pragma: no cover - defensive
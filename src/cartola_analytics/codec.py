@@ -0,0 +1,119 @@
+"""JSON encoding/decoding with an optional fast native backend.
+
+``orjson`` is used when it is importable; otherwise the stdlib ``json`` module
+is the fallback. Decoding works straight from ``bytes`` so callers never need
+to build an intermediate ``str``, and encoding always returns UTF-8 ``bytes``.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from . import compression
+
+JsonInput = bytes | bytearray | memoryview | str
+
+
+@dataclass(frozen=True)
+class JsonBackend:
+    """A named pair of ``loads``/``dumps`` implementations."""
+
+    name: str
+    loads: Callable[[JsonInput], Any]
+    dumps: Callable[[Any, bool], bytes]
+
+
+def _stdlib_loads(data: JsonInput) -> Any:
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any, indent: bool) -> bytes:
+    if indent:
+        text = json.dumps(obj, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+def _orjson_backend() -> JsonBackend | None:
+    try:
+        orjson = importlib.import_module("orjson")
+    except ImportError:
+        return None
+
+    base_option = orjson.OPT_NON_STR_KEYS
+
+    def _dumps(obj: Any, indent: bool) -> bytes:
+        option = base_option | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            data: bytes = orjson.dumps(obj, option=option)
+        except TypeError:
+            # Values orjson rejects (e.g. integers wider than 64 bits).
+            return _stdlib_dumps(obj, indent)
+        return data
+
+    return JsonBackend(name="orjson", loads=orjson.loads, dumps=_dumps)
+
+
+_STDLIB = JsonBackend(name="json", loads=_stdlib_loads, dumps=_stdlib_dumps)
+_BACKENDS: dict[str, JsonBackend] = {"json": _STDLIB}
+_fast = _orjson_backend()
+if _fast is not None:
+    _BACKENDS[_fast.name] = _fast
+
+_lock = threading.Lock()
+_active: JsonBackend = _fast or _STDLIB
+
+
+def available_backends() -> list[str]:
+    """Names of the backends importable in this environment."""
+    return sorted(_BACKENDS)
+
+
+def backend_name() -> str:
+    return _active.name
+
+
+def use_backend(name: str) -> str:
+    """Select the backend by name (``auto`` picks the fastest available)."""
+    global _active
+    lowered = name.strip().lower()
+    if lowered == "auto":
+        backend = _fast or _STDLIB
+    elif lowered in _BACKENDS:
+        backend = _BACKENDS[lowered]
+    else:
+        raise ValueError(f"Backend JSON indisponivel: {name}")
+    with _lock:
+        _active = backend
+    return backend.name
+
+
+def loads(data: JsonInput) -> Any:
+    """Decode JSON from bytes (preferred) or str.
+
+    Invalid documents raise ``json.JSONDecodeError`` (orjson's error subclasses
+    it) or ``UnicodeDecodeError``; both are ``ValueError``.
+    """
+    return _active.loads(data)
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """Encode ``obj`` as UTF-8 JSON; ``indent`` uses two spaces."""
+    return _active.dumps(obj, indent)
+
+
+def read_json(path: Path) -> Any:
+    """Load a JSON file without decoding it to ``str`` first.
+
+    ``.json.gz``/``.json.zst`` files are decompressed transparently.
+    """
+    return loads(compression.read_bytes(path))
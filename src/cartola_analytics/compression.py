@@ -0,0 +1,145 @@
+"""Optional gzip/zstd compression for cached and raw JSON payloads.
+
+Compressed files keep their JSON name plus the algorithm suffix
+(``.json.gz``/``.json.zst``) so readers can pick the decoder from the path
+alone. ``zstandard`` is optional: it is only imported when zstd is requested
+or a ``.zst`` file has to be read.
+"""
+
+from __future__ import annotations
+
+import gzip
+import importlib
+import logging
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from types import ModuleType
+
+logger = logging.getLogger(__name__)
+
+ALGORITHMS = ("none", "gzip", "zstd")
+SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+PAYLOAD_SUFFIXES = (".json", ".json.gz", ".json.zst")
+
+# ``level=0`` selects these; gzip level 0 (stored) is never useful here.
+DEFAULT_LEVELS = {"gzip": 6, "zlib": 6, "zstd": 3}
+
+
+@lru_cache(maxsize=1)
+def _zstandard() -> ModuleType | None:
+    try:
+        return importlib.import_module("zstandard")
+    except ImportError:
+        return None
+
+
+def zstd_available() -> bool:
+    return _zstandard() is not None
+
+
+def _require_zstandard() -> ModuleType:
+    module = _zstandard()
+    if module is None:
+        raise ValueError("Compressao zstd requer o pacote zstandard")
+    return module
+
+
+def resolve(algorithm: str) -> str:
+    """Return ``algorithm``, or ``gzip`` if zstd was asked for but is missing."""
+    if algorithm == "zstd" and not zstd_available():
+        logger.warning(
+            "compression_unavailable",
+            extra={
+                "event": "compression_unavailable",
+                "error": "pacote 'zstandard' nao instalado; usando gzip",
+            },
+        )
+        return "gzip"
+    return algorithm
+
+
+def _level(algorithm: str, level: int) -> int:
+    return level if level > 0 else DEFAULT_LEVELS[algorithm]
+
+
+def compress(data: bytes, algorithm: str, level: int = 0) -> bytes:
+    """Compress ``data``; ``none`` returns it untouched.
+
+    ``zlib`` is accepted as well for the SQLite cache, which has always stored
+    zlib streams.
+    """
+    if algorithm == "none":
+        return data
+    if algorithm == "gzip":
+        # mtime=0 keeps the output deterministic for identical payloads.
+        return gzip.compress(data, compresslevel=_level(algorithm, level), mtime=0)
+    if algorithm == "zlib":
+        return zlib.compress(data, _level(algorithm, level))
+    if algorithm == "zstd":
+        zstandard = _require_zstandard()
+        compressor = zstandard.ZstdCompressor(level=_level(algorithm, level))
+        result: bytes = compressor.compress(data)
+        return result
+    raise ValueError(f"Algoritmo de compressao desconhecido: {algorithm}")
+
+
+def decompress(data: bytes, algorithm: str) -> bytes:
+    """Inverse of :func:`compress`; damaged input raises ``ValueError``."""
+    if algorithm in {"none", "identity"}:
+        return data
+    if algorithm == "zstd":
+        zstandard = _require_zstandard()
+        try:
+            result: bytes = zstandard.ZstdDecompressor().decompressobj().decompress(
+                data
+            )
+        except zstandard.ZstdError as exc:
+            raise ValueError(f"Payload zstd invalido: {exc}") from exc
+        return result
+    try:
+        if algorithm == "gzip":
+            return gzip.decompress(data)
+        if algorithm == "zlib":
+            return zlib.decompress(data)
+    except (OSError, EOFError, zlib.error) as exc:
+        raise ValueError(f"Payload {algorithm} invalido: {exc}") from exc
+    raise ValueError(f"Algoritmo de compressao desconhecido: {algorithm}")
+
+
+def suffix_for(algorithm: str) -> str:
+    """Extra file suffix for ``algorithm`` (empty for ``none``)."""
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algoritmo de compressao desconhecido: {algorithm}")
+    return SUFFIXES.get(algorithm, "")
+
+
+def algorithm_for(path: Path) -> str:
+    """Guess the algorithm from the file suffix."""
+    for algorithm, suffix in SUFFIXES.items():
+        if path.name.endswith(suffix):
+            return algorithm
+    return "none"
+
+
+def read_bytes(path: Path) -> bytes:
+    """Read ``path`` and decompress it according to its suffix."""
+    return decompress(path.read_bytes(), algorithm_for(path))
+
+
+def payload_stem(path: Path) -> str:
+    """File name without ``.json`` and any compression suffix."""
+    name = path.name
+    for suffix in sorted(PAYLOAD_SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return path.stem
+
+
+def payload_files(directory: Path) -> list[Path]:
+    """Plain and compressed JSON payloads directly under ``directory``, sorted."""
+    return sorted(
+        path
+        for path in directory.iterdir()
+        if path.is_file() and path.name.endswith(PAYLOAD_SUFFIXES)
+    )
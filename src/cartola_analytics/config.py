@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -13,9 +13,45 @@ load_dotenv()
 DEFAULT_TIMEOUT = 10.0
 DEFAULT_MAX_RETRIES = 3
 DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_BACKOFF_MAX = 30.0
+DEFAULT_RATE_LIMIT = 0.0
+DEFAULT_RATE_LIMIT_BURST = 10
+DEFAULT_HTTP2 = False
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_CIRCUIT_THRESHOLD = 5
+DEFAULT_CIRCUIT_COOLDOWN = 30.0
+DEFAULT_CIRCUIT_SERVE_STALE = True
 DEFAULT_CACHE_TTL = 600
 DEFAULT_CACHE_DIR = Path("data/cache")
+DEFAULT_CACHE_BACKEND = "files"
+CACHE_BACKENDS = ("files", "sqlite")
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_CACHE_MAX_ENTRIES = 0
+DEFAULT_MEMORY_CACHE_BYTES = 0
+DEFAULT_MEMORY_CACHE_POLICY = "copy"
+MEMORY_CACHE_POLICIES = ("copy", "shared")
+DEFAULT_CACHE_COMPRESSION = "none"
+COMPRESSIONS = ("none", "gzip", "zstd")
+DEFAULT_COMPRESSION_LEVEL = 0
 DEFAULT_RAW_DIR = Path("data/raw")
+DEFAULT_RAW_FORMAT = "pretty"
+RAW_FORMATS = ("bytes", "pretty")
+DEFAULT_RAW_VALIDATE = True
+DEFAULT_RAW_COMPRESSION = "none"
+DEFAULT_RAW_DEDUP = False
+DEFAULT_RAW_INDEX = False
+DEFAULT_RAW_LAYOUT = "files"
+RAW_LAYOUTS = ("files", "segments")
+DEFAULT_RAW_SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_RAW_SEGMENT_MAX_AGE = 86400.0
+DEFAULT_RAW_DELTA = False
+DEFAULT_RAW_DELTA_KEYFRAME_INTERVAL = 96
+DEFAULT_BRONZE = False
+DEFAULT_BRONZE_DIR = Path("data/bronze")
+DEFAULT_JSON_BACKEND = "auto"
+JSON_BACKENDS = ("auto", "json", "orjson")
 DEFAULT_USER_AGENT = (
     "cartola-analytics/0.1 (+https://github.com/cadu-santos/cartola-analytics)"
 )
@@ -44,6 +80,18 @@ def _get_env_int(name: str, default: int) -> int:
         raise ValueError(f"Invalid int for {name}: {value}") from exc
 
 
+def _get_env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    lowered = value.strip().lower()
+    if lowered in {"1", "true", "yes", "on"}:
+        return True
+    if lowered in {"0", "false", "no", "off"}:
+        return False
+    raise ValueError(f"Invalid bool for {name}: {value}")
+
+
 def _get_env_path(name: str, default: Path | None) -> Path | None:
     value = os.getenv(name)
     if value is None or value.strip() == "":
@@ -61,14 +109,72 @@ def _get_env_str(name: str, default: str) -> str:
     return value
 
 
+def _get_env_choice(name: str, default: str, choices: tuple[str, ...]) -> str:
+    value = _get_env_str(name, default).strip().lower()
+    if value not in choices:
+        raise ValueError(f"Invalid value for {name}: {value}")
+    return value
+
+
+def _get_env_host_limits(name: str) -> dict[str, tuple[float, int]]:
+    """Parse ``host=rate[:burst]`` pairs separated by commas."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return {}
+    limits: dict[str, tuple[float, int]] = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        try:
+            host, spec = item.split("=", 1)
+            rate_text, _, burst_text = spec.partition(":")
+            rate = float(rate_text)
+            burst = int(burst_text) if burst_text.strip() else DEFAULT_RATE_LIMIT_BURST
+        except ValueError as exc:
+            raise ValueError(f"Invalid host limit for {name}: {item}") from exc
+        limits[host.strip()] = (rate, burst)
+    return limits
+
+
 @dataclass(frozen=True)
 class CartolaSettings:
     timeout: float = DEFAULT_TIMEOUT
     max_retries: int = DEFAULT_MAX_RETRIES
     backoff_factor: float = DEFAULT_BACKOFF_FACTOR
+    backoff_max: float = DEFAULT_BACKOFF_MAX
+    rate_limit: float = DEFAULT_RATE_LIMIT
+    rate_limit_burst: int = DEFAULT_RATE_LIMIT_BURST
+    rate_limit_hosts: dict[str, tuple[float, int]] = field(default_factory=dict)
+    http2: bool = DEFAULT_HTTP2
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY
+    circuit_threshold: int = DEFAULT_CIRCUIT_THRESHOLD
+    circuit_cooldown: float = DEFAULT_CIRCUIT_COOLDOWN
+    circuit_serve_stale: bool = DEFAULT_CIRCUIT_SERVE_STALE
     cache_ttl: int = DEFAULT_CACHE_TTL
     cache_dir: Path | None = DEFAULT_CACHE_DIR
+    cache_backend: str = DEFAULT_CACHE_BACKEND
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+    cache_max_entries: int = DEFAULT_CACHE_MAX_ENTRIES
+    memory_cache_bytes: int = DEFAULT_MEMORY_CACHE_BYTES
+    memory_cache_policy: str = DEFAULT_MEMORY_CACHE_POLICY
+    cache_compression: str = DEFAULT_CACHE_COMPRESSION
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL
     raw_dir: Path = DEFAULT_RAW_DIR
+    raw_format: str = DEFAULT_RAW_FORMAT
+    raw_validate: bool = DEFAULT_RAW_VALIDATE
+    raw_compression: str = DEFAULT_RAW_COMPRESSION
+    raw_dedup: bool = DEFAULT_RAW_DEDUP
+    raw_index: bool = DEFAULT_RAW_INDEX
+    raw_layout: str = DEFAULT_RAW_LAYOUT
+    raw_segment_max_bytes: int = DEFAULT_RAW_SEGMENT_MAX_BYTES
+    raw_segment_max_age: float = DEFAULT_RAW_SEGMENT_MAX_AGE
+    raw_delta: bool = DEFAULT_RAW_DELTA
+    raw_delta_keyframe_interval: int = DEFAULT_RAW_DELTA_KEYFRAME_INTERVAL
+    bronze: bool = DEFAULT_BRONZE
+    bronze_dir: Path = DEFAULT_BRONZE_DIR
+    json_backend: str = DEFAULT_JSON_BACKEND
     user_agent: str = DEFAULT_USER_AGENT
     accept: str = DEFAULT_ACCEPT
     log_level: str = DEFAULT_LOG_LEVEL
@@ -82,11 +188,90 @@ class CartolaSettings:
             backoff_factor=_get_env_float(
                 "CARTOLA_BACKOFF_FACTOR", DEFAULT_BACKOFF_FACTOR
             ),
+            backoff_max=_get_env_float("CARTOLA_BACKOFF_MAX", DEFAULT_BACKOFF_MAX),
+            rate_limit=_get_env_float("CARTOLA_RATE_LIMIT", DEFAULT_RATE_LIMIT),
+            rate_limit_burst=_get_env_int(
+                "CARTOLA_RATE_LIMIT_BURST", DEFAULT_RATE_LIMIT_BURST
+            ),
+            rate_limit_hosts=_get_env_host_limits("CARTOLA_RATE_LIMIT_HOSTS"),
+            http2=_get_env_bool("CARTOLA_HTTP2", DEFAULT_HTTP2),
+            max_connections=_get_env_int(
+                "CARTOLA_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS
+            ),
+            max_keepalive_connections=_get_env_int(
+                "CARTOLA_MAX_KEEPALIVE_CONNECTIONS", DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=_get_env_float(
+                "CARTOLA_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY
+            ),
+            circuit_threshold=_get_env_int(
+                "CARTOLA_CIRCUIT_THRESHOLD", DEFAULT_CIRCUIT_THRESHOLD
+            ),
+            circuit_cooldown=_get_env_float(
+                "CARTOLA_CIRCUIT_COOLDOWN", DEFAULT_CIRCUIT_COOLDOWN
+            ),
+            circuit_serve_stale=_get_env_bool(
+                "CARTOLA_CIRCUIT_SERVE_STALE", DEFAULT_CIRCUIT_SERVE_STALE
+            ),
             cache_ttl=_get_env_int("CARTOLA_CACHE_TTL", DEFAULT_CACHE_TTL),
             cache_dir=_get_env_path("CARTOLA_CACHE_DIR", DEFAULT_CACHE_DIR),
+            cache_backend=_get_env_choice(
+                "CARTOLA_CACHE_BACKEND", DEFAULT_CACHE_BACKEND, CACHE_BACKENDS
+            ),
+            cache_max_bytes=_get_env_int(
+                "CARTOLA_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES
+            ),
+            cache_max_entries=_get_env_int(
+                "CARTOLA_CACHE_MAX_ENTRIES", DEFAULT_CACHE_MAX_ENTRIES
+            ),
+            memory_cache_bytes=_get_env_int(
+                "CARTOLA_MEMORY_CACHE_BYTES", DEFAULT_MEMORY_CACHE_BYTES
+            ),
+            memory_cache_policy=_get_env_choice(
+                "CARTOLA_MEMORY_CACHE_POLICY",
+                DEFAULT_MEMORY_CACHE_POLICY,
+                MEMORY_CACHE_POLICIES,
+            ),
+            cache_compression=_get_env_choice(
+                "CARTOLA_CACHE_COMPRESSION", DEFAULT_CACHE_COMPRESSION, COMPRESSIONS
+            ),
+            compression_level=_get_env_int(
+                "CARTOLA_COMPRESSION_LEVEL", DEFAULT_COMPRESSION_LEVEL
+            ),
             raw_dir=(
                 _get_env_path("CARTOLA_RAW_DIR", DEFAULT_RAW_DIR) or DEFAULT_RAW_DIR
             ),
+            raw_format=_get_env_choice(
+                "CARTOLA_RAW_FORMAT", DEFAULT_RAW_FORMAT, RAW_FORMATS
+            ),
+            raw_validate=_get_env_bool("CARTOLA_RAW_VALIDATE", DEFAULT_RAW_VALIDATE),
+            raw_compression=_get_env_choice(
+                "CARTOLA_RAW_COMPRESSION", DEFAULT_RAW_COMPRESSION, COMPRESSIONS
+            ),
+            raw_dedup=_get_env_bool("CARTOLA_RAW_DEDUP", DEFAULT_RAW_DEDUP),
+            raw_index=_get_env_bool("CARTOLA_RAW_INDEX", DEFAULT_RAW_INDEX),
+            raw_layout=_get_env_choice(
+                "CARTOLA_RAW_LAYOUT", DEFAULT_RAW_LAYOUT, RAW_LAYOUTS
+            ),
+            raw_segment_max_bytes=_get_env_int(
+                "CARTOLA_RAW_SEGMENT_MAX_BYTES", DEFAULT_RAW_SEGMENT_MAX_BYTES
+            ),
+            raw_segment_max_age=_get_env_float(
+                "CARTOLA_RAW_SEGMENT_MAX_AGE", DEFAULT_RAW_SEGMENT_MAX_AGE
+            ),
+            raw_delta=_get_env_bool("CARTOLA_RAW_DELTA", DEFAULT_RAW_DELTA),
+            raw_delta_keyframe_interval=_get_env_int(
+                "CARTOLA_RAW_DELTA_KEYFRAME_INTERVAL",
+                DEFAULT_RAW_DELTA_KEYFRAME_INTERVAL,
+            ),
+            bronze=_get_env_bool("CARTOLA_BRONZE", DEFAULT_BRONZE),
+            bronze_dir=(
+                _get_env_path("CARTOLA_BRONZE_DIR", DEFAULT_BRONZE_DIR)
+                or DEFAULT_BRONZE_DIR
+            ),
+            json_backend=_get_env_choice(
+                "CARTOLA_JSON_BACKEND", DEFAULT_JSON_BACKEND, JSON_BACKENDS
+            ),
             user_agent=_get_env_str("CARTOLA_USER_AGENT", DEFAULT_USER_AGENT),
             accept=_get_env_str("CARTOLA_ACCEPT", DEFAULT_ACCEPT),
             log_level=_get_env_str("CARTOLA_LOG_LEVEL", DEFAULT_LOG_LEVEL).upper(),
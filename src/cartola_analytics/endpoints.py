@@ -8,11 +8,20 @@ from dataclasses import dataclass
 
 @dataclass(frozen=True)
 class Endpoint:
-    """Represents a Cartola FC endpoint."""
+    """Represents a Cartola FC endpoint.
+
+    ``cache_ttl`` overrides the client-wide TTL, ``stale_while_revalidate``
+    lets an expired entry be served while it is refreshed in the background,
+    and ``immutable_when_finished`` marks round-aware payloads that never change
+    once their round is over.
+    """
 
     name: str
     url: str
     requires_round: bool = False
+    cache_ttl: int | None = None
+    stale_while_revalidate: int = 0
+    immutable_when_finished: bool = False
 
     def resolve(self, rodada: int | None = None) -> str:
         """Return a usable URL, formatting round-aware endpoints."""
@@ -24,27 +33,78 @@ class Endpoint:
         return self.url
 
 
+_MINUTE = 60
+_HOUR = 60 * _MINUTE
+_DAY = 24 * _HOUR
+
 _ENDPOINTS: Sequence[Endpoint] = (
-    Endpoint(name="mercado_status", url="https://api.cartola.globo.com/mercado/status"),
-    Endpoint(name="atletas_mercado", url="https://api.cartola.globo.com/atletas/mercado"),
-    Endpoint(name="atletas_pontuados", url="https://api.cartola.globo.com/atletas/pontuados"),
-    Endpoint(name="pos_rodada_destaques", url="https://api.cartola.globo.com/pos-rodada/destaques"),
-    Endpoint(name="clubes", url="https://api.cartola.globo.com/clubes"),
-    Endpoint(name="posicoes", url="https://api.cartola.globo.com/posicoes"),
-    Endpoint(name="patrocinadores", url="https://api.cartola.globo.com/patrocinadores"),
-    Endpoint(name="partidas", url="https://api.cartola.globo.com/partidas"),
+    Endpoint(
+        name="mercado_status",
+        url="https://api.cartola.globo.com/mercado/status",
+        cache_ttl=15,
+    ),
+    Endpoint(
+        name="atletas_mercado",
+        url="https://api.cartola.globo.com/atletas/mercado",
+        cache_ttl=5 * _MINUTE,
+    ),
+    Endpoint(
+        name="atletas_pontuados",
+        url="https://api.cartola.globo.com/atletas/pontuados",
+        cache_ttl=_MINUTE,
+    ),
+    Endpoint(
+        name="pos_rodada_destaques",
+        url="https://api.cartola.globo.com/pos-rodada/destaques",
+        cache_ttl=_HOUR,
+    ),
+    Endpoint(
+        name="clubes",
+        url="https://api.cartola.globo.com/clubes",
+        cache_ttl=_DAY,
+        stale_while_revalidate=7 * _DAY,
+    ),
+    Endpoint(
+        name="posicoes",
+        url="https://api.cartola.globo.com/posicoes",
+        cache_ttl=_DAY,
+        stale_while_revalidate=7 * _DAY,
+    ),
+    Endpoint(
+        name="patrocinadores",
+        url="https://api.cartola.globo.com/patrocinadores",
+        cache_ttl=_DAY,
+        stale_while_revalidate=7 * _DAY,
+    ),
+    Endpoint(
+        name="partidas",
+        url="https://api.cartola.globo.com/partidas",
+        cache_ttl=5 * _MINUTE,
+    ),
     Endpoint(name="videos", url="https://api.cartola.globo.com/videos"),
     Endpoint(name="mercado_destaques", url="https://api.cartola.globo.com/mercado/destaques"),
     Endpoint(name="mercado_destaques_reservas", url="https://api.cartola.globo.com/mercado/destaques/reservas"),
-    Endpoint(name="rodadas", url="https://api.cartola.globo.com/rodadas"),
+    Endpoint(
+        name="rodadas",
+        url="https://api.cartola.globo.com/rodadas",
+        cache_ttl=_HOUR,
+        stale_while_revalidate=_DAY,
+    ),
     Endpoint(
         name="partidas_por_rodada",
         url="https://api.cartola.globo.com/partidas/{rodada}",
         requires_round=True,
+        cache_ttl=5 * _MINUTE,
+        immutable_when_finished=True,
     ),
     Endpoint(name="rankings", url="https://api.cartola.globo.com/rankings"),
     Endpoint(name="ligas", url="https://api.cartola.globo.com/ligas"),
-    Endpoint(name="esquemas", url="https://api.cartolafc.globo.com/esquemas"),
+    Endpoint(
+        name="esquemas",
+        url="https://api.cartolafc.globo.com/esquemas",
+        cache_ttl=_DAY,
+        stale_while_revalidate=7 * _DAY,
+    ),
 )
 
 
@@ -2,21 +2,89 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import importlib.util
 import json
 import logging
+import sqlite3
+import threading
 import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
 import httpx
 
+from . import codec
+from .cache import (
+    NOT_DECODED,
+    CacheEntry,
+    CacheStore,
+    MemoryCache,
+    open_cache_store,
+)
+from .cache_policy import (
+    CachePolicy,
+    finished_rounds_from_payload,
+    resolve_cache_policy,
+)
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 from .config import CartolaSettings, load_settings
-from .endpoints import Endpoint
+from .endpoints import Endpoint, iter_endpoints
+from .rate_limit import RateLimiter, decorrelated_jitter, parse_retry_after
+from .singleflight import AsyncSingleFlight, SingleFlight
 
 
-class CartolaClient:
-    """Thin wrapper around httpx with retry and cache support."""
+@dataclass(frozen=True)
+class FetchResult:
+    """Outcome of a single item fetched through :meth:`CartolaClient.fetch_many`."""
+
+    endpoint: Endpoint
+    rodada: int | None
+    payload: Any = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_MISSING = object()
+
+
+def _is_retryable_status(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+class _ConnectionTrace:
+    """httpcore ``trace`` hook recording whether a request opened a connection."""
+
+    def __init__(self) -> None:
+        self.opened = False
+
+    def observe(self, name: str, _info: dict[str, Any]) -> None:
+        if name == "connection.connect_tcp.complete":
+            self.opened = True
+
+    async def observe_async(self, name: str, info: dict[str, Any]) -> None:
+        self.observe(name, info)
+
+
+def _catalog_origins() -> list[str]:
+    """Scheme+host of every catalog endpoint; each gets its own pool."""
+    origins = set()
+    for endpoint in iter_endpoints():
+        parts = urlsplit(endpoint.url)
+        origins.add(f"{parts.scheme}://{parts.netloc}")
+    return sorted(origins)
+
+
+class _BaseCartolaClient:
+    """Shared configuration, cache and response handling for Cartola clients."""
 
     def __init__(
         self,
@@ -28,6 +96,11 @@ class CartolaClient:
         cache_dir: Path | None = None,
         headers: dict[str, str] | None = None,
         settings: CartolaSettings | None = None,
+        rate_limiter: RateLimiter | None = None,
+        finished_rounds: Iterable[int] | None = None,
+        share_responses: bool = False,
+        circuit_breaker: CircuitBreaker | None = None,
+        serve_stale: bool = True,
     ) -> None:
         self.settings = settings or load_settings()
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
@@ -46,20 +119,120 @@ class CartolaClient:
             else self.settings.backoff_factor
         )
         self.backoff_factor = max(backoff_candidate, 0.0)
+        self.backoff_max = max(self.settings.backoff_max, self.backoff_factor)
+        self.rate_limiter = rate_limiter or RateLimiter.from_settings(self.settings)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker.from_settings(
+            self.settings
+        )
         ttl_candidate = cache_ttl if cache_ttl is not None else self.settings.cache_ttl
         self.cache_ttl = max(ttl_candidate, 0)
         self.cache_dir = cache_dir if cache_dir is not None else self.settings.cache_dir
 
-        if self.cache_dir is not None:
-            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._cache: CacheStore | None = (
+            open_cache_store(
+                self.settings.cache_backend,
+                self.cache_dir,
+                max_bytes=self.settings.cache_max_bytes,
+                max_entries=self.settings.cache_max_entries,
+                compression=self.settings.cache_compression,
+                compression_level=self.settings.compression_level,
+            )
+            if self.cache_dir is not None
+            else None
+        )
+        self._memory = (
+            MemoryCache(self.settings.memory_cache_bytes)
+            if self.settings.memory_cache_bytes > 0
+            else None
+        )
+        self.memory_cache_policy = self.settings.memory_cache_policy
+        self.cache_stats = {"hits": 0, "stale": 0, "revalidations": 0, "misses": 0}
+        self._cache_writes = 0
+        self._stats_lock = threading.Lock()
+        self.finished_rounds: set[int] = set(finished_rounds or ())
+        self._refreshing: set[str] = set()
+        self.share_responses = share_responses
+        self.serve_stale = serve_stale
+        self._shared_payloads: dict[str, Any] = {}
+        self.raw_validate = self.settings.raw_validate
+        self.http2 = self._resolve_http2()
+        self.limits = httpx.Limits(
+            max_connections=self.settings.max_connections,
+            max_keepalive_connections=self.settings.max_keepalive_connections,
+            keepalive_expiry=self.settings.keepalive_expiry,
+        )
+        self.pool_stats: dict[str, dict[str, int]] = {}
 
-        resolved_headers = headers or default_headers(self.settings)
-        self._client = httpx.Client(
-            timeout=httpx.Timeout(self.timeout),
-            headers=resolved_headers,
-            follow_redirects=True,
+        self.headers = headers or default_headers(self.settings)
+
+    def _resolve_http2(self) -> bool:
+        if not self.settings.http2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            self.logger.warning(
+                "http2_unavailable",
+                extra={
+                    "event": "http2_unavailable",
+                    "error": "pacote 'h2' nao instalado; usando HTTP/1.1",
+                },
+            )
+            return False
+        return True
+
+    def _record_connection(self, url: str, trace: _ConnectionTrace) -> None:
+        """Track connections opened vs reused per host and log them at DEBUG."""
+        host = urlsplit(url).netloc
+        with self._stats_lock:
+            stats = self.pool_stats.setdefault(
+                host, {"requests": 0, "opened": 0, "reused": 0}
+            )
+            stats["requests"] += 1
+            stats["opened" if trace.opened else "reused"] += 1
+            snapshot = dict(stats)
+        self.logger.debug(
+            "http_connection",
+            extra={
+                "event": "http_connection",
+                "host": host,
+                "reused": not trace.opened,
+                "connections_opened": snapshot["opened"],
+                "connections_reused": snapshot["reused"],
+            },
         )
 
+    def _log_pool_stats(self) -> None:
+        with self._stats_lock:
+            pools = {host: dict(stats) for host, stats in self.pool_stats.items()}
+        self.logger.debug(
+            "http_pool_stats",
+            extra={"event": "http_pool_stats", "pools": pools},
+        )
+
+    def _close_cache(self) -> None:
+        """Persist this run's counters and prune once if anything was written."""
+        if self._cache is None:
+            return
+        with self._stats_lock:
+            counters = dict(self.cache_stats)
+            writes = self._cache_writes
+        try:
+            if any(counters.values()):
+                self._cache.record_counters(counters)
+            if writes:
+                removed = self._cache.prune()
+                self.logger.debug(
+                    "cache_pruned",
+                    extra={"event": "cache_pruned", "removed": removed},
+                )
+        except (OSError, sqlite3.Error) as err:
+            self.logger.warning(
+                "cache_maintenance_failed",
+                extra={"event": "cache_maintenance_failed", "error": str(err)},
+            )
+        finally:
+            self._cache.close()
+
+    def _log_initialized(self) -> None:
         self.logger.debug(
             "client_initialized",
             extra={
@@ -67,19 +240,579 @@ class CartolaClient:
                 "timeout": self.timeout,
                 "max_retries": self.max_retries,
                 "backoff_factor": self.backoff_factor,
+                "rate_limit": self.rate_limiter.rate,
+                "rate_limit_burst": self.rate_limiter.burst,
+                "circuit_threshold": self.circuit_breaker.threshold,
+                "circuit_cooldown": self.circuit_breaker.cooldown,
+                "http2": self.http2,
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry,
                 "cache_ttl": self.cache_ttl,
                 "cache_dir": str(self.cache_dir) if self.cache_dir else None,
+                "cache_backend": self.settings.cache_backend,
+            },
+        )
+
+    def _log_fetch_start(
+        self, endpoint: Endpoint, url: str, rodada: int | None, use_cache: bool
+    ) -> None:
+        self.logger.info(
+            "fetch_start",
+            extra={
+                "event": "fetch_start",
+                "endpoint": endpoint.name,
+                "url": url,
+                "rodada": rodada,
+                "use_cache": use_cache,
+            },
+        )
+
+    def _record_cache_event(
+        self, event: str, endpoint: Endpoint, url: str, tier: str = "disk"
+    ) -> None:
+        """Count a cache hit/revalidation/miss and log it with running totals."""
+        counter = {
+            "cache_hit": "hits",
+            "cache_stale": "stale",
+            "cache_revalidated": "revalidations",
+            "cache_miss": "misses",
+        }[event]
+        with self._stats_lock:
+            self.cache_stats[counter] += 1
+            totals = dict(self.cache_stats)
+        self.logger.info(
+            event,
+            extra={
+                "event": event,
+                "endpoint": endpoint.name,
+                "url": url,
+                "tier": tier,
+                "cache_hits": totals["hits"],
+                "cache_stale": totals["stale"],
+                "cache_revalidations": totals["revalidations"],
+                "cache_misses": totals["misses"],
             },
         )
 
+    @staticmethod
+    def _flight_key(url: str, as_bytes: bool) -> str:
+        """Key for coalescing/sharing; raw and decoded results never mix."""
+        return f"raw:{url}" if as_bytes else url
+
+    def _shared_payload(
+        self, endpoint: Endpoint, url: str, as_bytes: bool = False
+    ) -> Any:
+        """Payload already fetched for ``url`` in this run, if sharing is on."""
+        if not self.share_responses:
+            return _MISSING
+        payload = self._shared_payloads.get(self._flight_key(url, as_bytes), _MISSING)
+        if payload is not _MISSING:
+            self.logger.debug(
+                "fetch_shared",
+                extra={"event": "fetch_shared", "endpoint": endpoint.name, "url": url},
+            )
+        return payload
+
+    def _remember_payload(
+        self,
+        endpoint: Endpoint,
+        url: str,
+        payload: Any,
+        coalesced: bool,
+        as_bytes: bool = False,
+    ) -> None:
+        if coalesced:
+            self.logger.debug(
+                "fetch_coalesced",
+                extra={
+                    "event": "fetch_coalesced",
+                    "endpoint": endpoint.name,
+                    "url": url,
+                },
+            )
+        if self.share_responses:
+            self._shared_payloads[self._flight_key(url, as_bytes)] = payload
+
+    def _log_fetch_success(self, endpoint: Endpoint, url: str) -> None:
+        self.logger.info(
+            "fetch_success",
+            extra={
+                "event": "fetch_success",
+                "endpoint": endpoint.name,
+                "url": url,
+            },
+        )
+
+    def _log_http_request(self, url: str, endpoint_name: str, attempt: int) -> None:
+        self.logger.debug(
+            "http_request",
+            extra={
+                "event": "http_request",
+                "url": url,
+                "endpoint": endpoint_name,
+                "attempt": attempt + 1,
+            },
+        )
+
+    def _check_response(
+        self, response: httpx.Response, url: str, endpoint_name: str, attempt: int
+    ) -> httpx.Response:
+        """Validate a response status.
+
+        Raises ``httpx.HTTPStatusError`` for retryable statuses so callers can
+        apply their own (sync or async) backoff strategy.
+        """
+        if _is_retryable_status(response.status_code):
+            raise httpx.HTTPStatusError(
+                "Retryable response",
+                request=response.request,
+                response=response,
+            )
+        if response.status_code != httpx.codes.NOT_MODIFIED:
+            response.raise_for_status()
+        self.logger.info(
+            "http_success",
+            extra={
+                "event": "http_success",
+                "url": url,
+                "endpoint": endpoint_name,
+                "status": response.status_code,
+                "http_version": response.http_version,
+                "attempt": attempt + 1,
+            },
+        )
+        return response
+
+    def _decode_body(self, body: bytes, url: str, endpoint_name: str) -> Any:
+        if not body:
+            self.logger.warning(
+                "http_empty",
+                extra={
+                    "event": "http_empty",
+                    "url": url,
+                    "endpoint": endpoint_name,
+                },
+            )
+            return {}
+        try:
+            return codec.loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError) as err:
+            self.logger.error(
+                "http_invalid_json",
+                extra={
+                    "event": "http_invalid_json",
+                    "url": url,
+                    "endpoint": endpoint_name,
+                    "error": str(err),
+                },
+            )
+            raise ValueError("Resposta JSON invalida da API Cartola") from err
+
+    def _read_body(
+        self, body: bytes, url: str, endpoint_name: str, as_bytes: bool
+    ) -> Any:
+        """Decode ``body``, or return it untouched in raw-bytes mode.
+
+        Raw bytes are still parsed once (and discarded) when ``raw_validate``
+        is on, so invalid JSON never reaches the raw layer.
+        """
+        if not as_bytes:
+            return self._decode_body(body, url, endpoint_name)
+        if not body or self.raw_validate:
+            self._decode_body(body, url, endpoint_name)
+        return body or b"{}"
+
+    def _next_backoff(
+        self,
+        err: Exception,
+        url: str,
+        endpoint_name: str,
+        attempt: int,
+        previous_delay: float,
+    ) -> float:
+        """Log a failed attempt and return how long to wait before retrying.
+
+        Uses decorrelated jitter and honours ``Retry-After`` on 429/503
+        responses, pausing the host's rate-limit bucket so concurrent workers
+        back off together. Re-raises the exception once retries are exhausted.
+        """
+        if attempt >= self.max_retries:
+            self.logger.error(
+                "http_failure",
+                extra={
+                    "event": "http_failure",
+                    "url": url,
+                    "endpoint": endpoint_name,
+                    "attempt": attempt + 1,
+                    "error": str(err),
+                },
+            )
+            raise err
+        delay = decorrelated_jitter(
+            self.backoff_factor, previous_delay, self.backoff_max
+        )
+        retry_after = None
+        if isinstance(err, httpx.HTTPStatusError):
+            retry_after = parse_retry_after(err.response.headers.get("Retry-After"))
+        if retry_after is not None:
+            self.rate_limiter.defer(url, retry_after)
+            delay = max(delay, retry_after)
+        self.logger.warning(
+            "http_retry",
+            extra={
+                "event": "http_retry",
+                "url": url,
+                "endpoint": endpoint_name,
+                "attempt": attempt + 1,
+                "error": str(err),
+                "retry_after": retry_after,
+                "sleep_for": delay,
+            },
+        )
+        return delay
+
+    def _record_attempt_failure(self, url: str, err: Exception) -> None:
+        """Feed a failed attempt to the circuit breaker.
+
+        Client errors (4xx other than 429) mean the host is answering, so they
+        reset the failure count instead of adding to it. Raises
+        :class:`CircuitOpenError` when this failure opens the circuit, which
+        skips the remaining retries.
+        """
+        if isinstance(err, httpx.HTTPStatusError) and not _is_retryable_status(
+            err.response.status_code
+        ):
+            self.circuit_breaker.record_success(url)
+            return
+        self.circuit_breaker.record_failure(url)
+
+    def _stale_fallback(
+        self,
+        key: str,
+        endpoint: Endpoint,
+        url: str,
+        entry: CacheEntry | None,
+        err: CircuitOpenError,
+        as_bytes: bool,
+    ) -> Any:
+        """Expired cached payload to serve while the host's circuit is open."""
+        if entry is None or not self.settings.circuit_serve_stale:
+            return _MISSING
+        payload = self._cached_payload(key, entry, as_bytes)
+        if payload is _MISSING:
+            return _MISSING
+        self._record_cache_event("cache_stale", endpoint, url)
+        self.logger.warning(
+            "circuit_stale_served",
+            extra={
+                "event": "circuit_stale_served",
+                "endpoint": endpoint.name,
+                "url": url,
+                "age": entry.age(),
+                "error": str(err),
+            },
+        )
+        return payload
+
+    def _cache_key(self, url: str) -> str:
+        digest = hashlib.sha1(url.encode("utf-8"), usedforsecurity=False)
+        return digest.hexdigest()
+
+    def _lookup_cache(self, key: str) -> CacheEntry | None:
+        if self._cache is None or self.cache_ttl <= 0:
+            return None
+        return self._cache.get(key)
+
+    def cache_policy(self, endpoint: Endpoint, rodada: int | None) -> CachePolicy:
+        """Cache policy applied to ``endpoint``/``rodada`` by this client.
+
+        With ``serve_stale`` disabled (raw collection) the catalog's
+        stale-while-revalidate window is dropped, so an expired entry is
+        always refetched instead of being returned.
+        """
+        policy = resolve_cache_policy(
+            endpoint,
+            rodada,
+            default_ttl=self.cache_ttl,
+            finished_rounds=self.finished_rounds,
+        )
+        if not self.serve_stale:
+            return replace(policy, stale_while_revalidate=0)
+        return policy
+
+    def register_finished_rounds(self, rounds: Iterable[int]) -> None:
+        """Mark rounds as finished so round-aware entries become immutable."""
+        with self._stats_lock:
+            self.finished_rounds.update(rounds)
+
+    def _observe_payload(self, endpoint: Endpoint, payload: Any) -> None:
+        if endpoint.name != "rodadas":
+            return
+        if isinstance(payload, bytes):
+            try:
+                payload = codec.loads(payload)
+            except ValueError:
+                return
+        self.register_finished_rounds(finished_rounds_from_payload(payload))
+
+    def _cached_payload(
+        self, key: str, entry: CacheEntry, as_bytes: bool = False
+    ) -> Any:
+        """Decode a cached body, dropping the entry if it is unreadable.
+
+        With ``as_bytes`` the stored body itself is returned (after the
+        optional validation parse).
+        """
+        if not entry.body:
+            return b"{}" if as_bytes else {}
+        if as_bytes and not self.raw_validate:
+            return entry.body
+        try:
+            payload = codec.loads(entry.body)
+            return entry.body if as_bytes else payload
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            if self._cache is not None:
+                self._cache.delete(key)
+            self.logger.warning(
+                "cache_corrupted",
+                extra={"event": "cache_corrupted", "url": entry.url},
+            )
+            return _MISSING
+
+    def _memory_payload(
+        self,
+        key: str,
+        endpoint: Endpoint,
+        url: str,
+        policy: CachePolicy,
+        as_bytes: bool,
+    ) -> Any:
+        """Serve a fresh entry from the in-memory tier, or ``_MISSING``.
+
+        With the ``copy`` policy every hit decodes the stored bytes again, so
+        callers may mutate the result; ``shared`` hands out one decoded object
+        that must be treated as read-only.
+        """
+        if self._memory is None or self.cache_ttl <= 0:
+            return _MISSING
+        item = self._memory.get(key)
+        if item is None:
+            return _MISSING
+        entry, decoded = item
+        if not policy.is_fresh(entry.age()):
+            self._memory.discard(key)
+            return _MISSING
+        if as_bytes:
+            payload = entry.body
+        elif decoded is not NOT_DECODED and self.memory_cache_policy == "shared":
+            payload = decoded
+        else:
+            try:
+                payload = codec.loads(entry.body) if entry.body else {}
+            except ValueError:
+                self._memory.discard(key)
+                return _MISSING
+            if self.memory_cache_policy == "shared":
+                self._memory.put(key, entry, payload)
+        self._record_cache_event("cache_hit", endpoint, url, tier="memory")
+        return payload
+
+    def _remember_in_memory(
+        self, key: str, entry: CacheEntry, payload: Any, as_bytes: bool
+    ) -> None:
+        if self._memory is None:
+            return
+        shared = self.memory_cache_policy == "shared" and not as_bytes
+        self._memory.put(key, entry, payload if shared else NOT_DECODED)
+
+    def _fresh_cached_payload(
+        self,
+        key: str,
+        endpoint: Endpoint,
+        url: str,
+        entry: CacheEntry | None,
+        policy: CachePolicy,
+        as_bytes: bool = False,
+    ) -> tuple[Any, CacheEntry | None, bool]:
+        """Return ``(payload, entry, stale)`` for a usable entry.
+
+        ``payload`` is ``_MISSING`` when the network must be hit. Expired
+        entries are kept (not deleted) so their validators can be used for a
+        conditional request; ``stale`` flags entries served within the
+        stale-while-revalidate window that need a background refresh.
+        """
+        if entry is None:
+            return _MISSING, None, False
+        age = entry.age()
+        stale = False
+        if not policy.is_fresh(age):
+            if not policy.serves_stale(age):
+                self.logger.info(
+                    "cache_expired",
+                    extra={
+                        "event": "cache_expired",
+                        "endpoint": endpoint.name,
+                        "url": url,
+                    },
+                )
+                return _MISSING, entry, False
+            stale = True
+        payload = self._cached_payload(key, entry, as_bytes)
+        if payload is _MISSING:
+            return _MISSING, None, False
+        if not stale:
+            self._remember_in_memory(key, entry, payload, as_bytes)
+        self._record_cache_event("cache_stale" if stale else "cache_hit", endpoint, url)
+        return payload, entry, stale
+
+    def _claim_refresh(self, key: str) -> bool:
+        with self._stats_lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _release_refresh(self, key: str) -> None:
+        with self._stats_lock:
+            self._refreshing.discard(key)
+
+    def _log_refresh_failed(self, endpoint: Endpoint, url: str, err: Exception) -> None:
+        self.logger.warning(
+            "cache_refresh_failed",
+            extra={
+                "event": "cache_refresh_failed",
+                "endpoint": endpoint.name,
+                "url": url,
+                "error": str(err),
+            },
+        )
+
+    def _complete_fetch(
+        self,
+        key: str,
+        endpoint: Endpoint,
+        url: str,
+        entry: CacheEntry | None,
+        response: httpx.Response,
+        use_cache: bool,
+        as_bytes: bool = False,
+        policy: CachePolicy | None = None,
+    ) -> Any:
+        """Turn a (possibly ``304``) response into a payload and update the cache.
+
+        The cache stores ``response.content`` as-is, so raw-bytes callers get
+        the very same object that was written to the cache.
+        """
+        if response.status_code == httpx.codes.NOT_MODIFIED and entry is not None:
+            payload = self._cached_payload(key, entry, as_bytes)
+            if payload is _MISSING:
+                raise ValueError("Entrada de cache invalida apos revalidacao")
+            if self._cache is not None:
+                refreshed = self._cache.touch(key, entry, time.time())
+            else:
+                refreshed = replace(entry, stored_at=time.time())
+            self._remember_in_memory(key, refreshed, payload, as_bytes)
+            self._record_cache_event("cache_revalidated", endpoint, url)
+            return payload
+
+        payload = self._read_body(response.content, url, endpoint.name, as_bytes)
+        if not use_cache or self.cache_ttl <= 0:
+            return payload
+        active_policy = policy or self.cache_policy(endpoint, None)
+        new_entry = CacheEntry(
+            url=url,
+            endpoint=endpoint.name,
+            body=response.content,
+            stored_at=time.time(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            ttl=active_policy.retention(),
+        )
+        self._remember_in_memory(key, new_entry, payload, as_bytes)
+        if self._cache is not None:
+            self._record_cache_event("cache_miss", endpoint, url)
+            with self._stats_lock:
+                self._cache_writes += 1
+            self._cache.put(key, new_entry)
+            self.logger.debug(
+                "cache_store",
+                extra={
+                    "event": "cache_store",
+                    "path": self._cache.location(key),
+                    "cache_ttl": self.cache_ttl,
+                },
+            )
+        return payload
+
+
+class CartolaClient(_BaseCartolaClient):
+    """Thin wrapper around httpx with retry and cache support."""
+
+    def __init__(
+        self,
+        *,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+        backoff_factor: float | None = None,
+        cache_ttl: int | None = None,
+        cache_dir: Path | None = None,
+        headers: dict[str, str] | None = None,
+        settings: CartolaSettings | None = None,
+        rate_limiter: RateLimiter | None = None,
+        finished_rounds: Iterable[int] | None = None,
+        share_responses: bool = False,
+        circuit_breaker: CircuitBreaker | None = None,
+        serve_stale: bool = True,
+    ) -> None:
+        super().__init__(
+            timeout=timeout,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            cache_ttl=cache_ttl,
+            cache_dir=cache_dir,
+            headers=headers,
+            settings=settings,
+            rate_limiter=rate_limiter,
+            finished_rounds=finished_rounds,
+            share_responses=share_responses,
+            circuit_breaker=circuit_breaker,
+            serve_stale=serve_stale,
+        )
+        # One transport (and therefore one connection pool) per catalog host,
+        # all sharing a single SSL context.
+        ssl_context = httpx.create_ssl_context()
+        self._client = httpx.Client(
+            timeout=httpx.Timeout(self.timeout),
+            headers=self.headers,
+            follow_redirects=True,
+            verify=ssl_context,
+            http2=self.http2,
+            limits=self.limits,
+            mounts={
+                origin: httpx.HTTPTransport(
+                    verify=ssl_context, http2=self.http2, limits=self.limits
+                )
+                for origin in _catalog_origins()
+            },
+        )
+        self._refresh_executor: ThreadPoolExecutor | None = None
+        self._inflight = SingleFlight()
+        self._log_initialized()
+
     @classmethod
     def from_env(cls, **kwargs: Any) -> CartolaClient:
         """Instantiate client pulling configuration from .env/env vars."""
         return cls(settings=load_settings(), **kwargs)
 
     def close(self) -> None:
-        """Close the underlying HTTP client."""
+        """Wait for background refreshes and close the underlying HTTP client."""
+        if self._refresh_executor is not None:
+            self._refresh_executor.shutdown(wait=True)
+            self._refresh_executor = None
+        self._log_pool_stats()
         self._client.close()
+        self._close_cache()
 
     def __enter__(self) -> CartolaClient:  # pragma: no cover - convenience
         return self
@@ -94,180 +827,479 @@ class CartolaClient:
         rodada: int | None = None,
         use_cache: bool = True,
     ) -> Any:
-        """Fetch JSON payload for a given endpoint."""
+        """Fetch JSON payload for a given endpoint.
+
+        Concurrent calls for the same resolved URL share one in-flight request.
+        With ``share_responses`` enabled, later calls reuse the decoded payload.
+        Shared payloads are the same object for every caller: treat them as
+        read-only.
+        """
+        return self._fetch(endpoint, rodada, use_cache, as_bytes=False)
+
+    def fetch_raw(
+        self,
+        endpoint: Endpoint,
+        *,
+        rodada: int | None = None,
+        use_cache: bool = True,
+    ) -> bytes:
+        """Fetch the undecoded response body for a given endpoint.
+
+        The bytes are those received from the API (or stored in the cache),
+        checked with a single validation parse unless ``raw_validate`` is off.
+        """
+        body: bytes = self._fetch(endpoint, rodada, use_cache, as_bytes=True)
+        return body
+
+    def _fetch(
+        self, endpoint: Endpoint, rodada: int | None, use_cache: bool, as_bytes: bool
+    ) -> Any:
         url = endpoint.resolve(rodada)
-        self.logger.info(
-            "fetch_start",
-            extra={
-                "event": "fetch_start",
-                "endpoint": endpoint.name,
-                "url": url,
-                "rodada": rodada,
-                "use_cache": use_cache,
-            },
+        payload = self._shared_payload(endpoint, url, as_bytes)
+        if payload is not _MISSING:
+            return payload
+        payload, coalesced = self._inflight.do(
+            self._flight_key(url, as_bytes),
+            lambda: self._fetch_once(endpoint, url, rodada, use_cache, as_bytes),
         )
+        self._remember_payload(endpoint, url, payload, coalesced, as_bytes)
+        return payload
+
+    def _fetch_once(
+        self,
+        endpoint: Endpoint,
+        url: str,
+        rodada: int | None,
+        use_cache: bool,
+        as_bytes: bool = False,
+    ) -> Any:
+        self._log_fetch_start(endpoint, url, rodada, use_cache)
         cache_key = self._cache_key(url)
+        policy = self.cache_policy(endpoint, rodada)
         if use_cache:
-            cached = self._read_cache(cache_key)
-            if cached is not None:
-                self.logger.info(
-                    "cache_hit",
-                    extra={
-                        "event": "cache_hit",
-                        "endpoint": endpoint.name,
-                        "url": url,
-                    },
+            payload = self._memory_payload(
+                cache_key, endpoint, url, policy, as_bytes
+            )
+            if payload is not _MISSING:
+                self._observe_payload(endpoint, payload)
+                return payload
+        entry = self._lookup_cache(cache_key) if use_cache else None
+        payload, entry, stale = self._fresh_cached_payload(
+            cache_key, endpoint, url, entry, policy, as_bytes
+        )
+        if payload is not _MISSING:
+            if stale and entry is not None:
+                self._schedule_refresh(cache_key, endpoint, url, rodada, entry)
+            self._observe_payload(endpoint, payload)
+            return payload
+
+        validators = entry.validators() if entry is not None else {}
+        try:
+            response = self._request_with_retries(url, endpoint.name, validators)
+        except CircuitOpenError as err:
+            payload = self._stale_fallback(
+                cache_key, endpoint, url, entry, err, as_bytes
+            )
+            if payload is _MISSING:
+                raise
+            return payload
+        payload = self._complete_fetch(
+            cache_key, endpoint, url, entry, response, use_cache, as_bytes, policy
+        )
+        self._observe_payload(endpoint, payload)
+        self._log_fetch_success(endpoint, url)
+        return payload
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        endpoint: Endpoint,
+        url: str,
+        rodada: int | None,
+        entry: CacheEntry,
+    ) -> None:
+        """Revalidate a stale entry on a background thread."""
+        if not self._claim_refresh(key):
+            return
+        with self._stats_lock:
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="cartola-refresh"
                 )
-                return cached
+            executor = self._refresh_executor
+        executor.submit(self._refresh_entry, key, endpoint, url, rodada, entry)
 
-        response_json = self._request_with_retries(url, endpoint.name)
-        if use_cache:
-            self._write_cache(cache_key, response_json)
-        self.logger.info(
-            "fetch_success",
+    def _refresh_entry(
+        self,
+        key: str,
+        endpoint: Endpoint,
+        url: str,
+        rodada: int | None,
+        entry: CacheEntry,
+    ) -> None:
+        try:
+            response = self._request_with_retries(
+                url, endpoint.name, entry.validators()
+            )
+            payload = self._complete_fetch(
+                key,
+                endpoint,
+                url,
+                entry,
+                response,
+                True,
+                policy=self.cache_policy(endpoint, rodada),
+            )
+            self._observe_payload(endpoint, payload)
+        except Exception as err:
+            self._log_refresh_failed(endpoint, url, err)
+        finally:
+            self._release_refresh(key)
+
+    def fetch_many(
+        self,
+        requests: Iterable[tuple[Endpoint, int | None]],
+        *,
+        max_workers: int | None = None,
+        use_cache: bool = True,
+        on_result: Callable[[int, FetchResult], None] | None = None,
+        as_bytes: bool = False,
+    ) -> list[FetchResult]:
+        """Fetch several endpoint/round pairs on a thread pool.
+
+        All workers share this client's connection pool. Failures are captured
+        per item instead of aborting the batch, and results are returned in
+        input order. ``on_result`` runs inside the worker right after each
+        fetch (e.g. to persist the payload while other requests are in flight);
+        an exception raised there is recorded as that item's error. With
+        ``as_bytes`` each payload is the raw body from :meth:`fetch_raw`.
+        """
+        items = list(requests)
+        if not items:
+            return []
+
+        def _run(index: int, endpoint: Endpoint, rodada: int | None) -> FetchResult:
+            try:
+                payload = self._fetch(endpoint, rodada, use_cache, as_bytes)
+                result = FetchResult(endpoint=endpoint, rodada=rodada, payload=payload)
+                if on_result is not None:
+                    on_result(index, result)
+            except Exception as err:
+                return FetchResult(endpoint=endpoint, rodada=rodada, error=err)
+            return result
+
+        workers = max_workers or min(len(items), 8)
+        self.logger.debug(
+            "fetch_many_start",
             extra={
-                "event": "fetch_success",
-                "endpoint": endpoint.name,
-                "url": url,
+                "event": "fetch_many_start",
+                "items": len(items),
+                "max_workers": workers,
             },
         )
-        return response_json
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="cartola-fetch"
+        ) as executor:
+            futures = [
+                executor.submit(_run, index, endpoint, rodada)
+                for index, (endpoint, rodada) in enumerate(items)
+            ]
+            return [future.result() for future in futures]
 
-    def _request_with_retries(self, url: str, endpoint_name: str) -> Any:
+    def _request_with_retries(
+        self,
+        url: str,
+        endpoint_name: str,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
         attempt = 0
+        delay = 0.0
         while True:
+            self.circuit_breaker.before_request(url)
             try:
-                self.logger.debug(
-                    "http_request",
-                    extra={
-                        "event": "http_request",
-                        "url": url,
-                        "endpoint": endpoint_name,
-                        "attempt": attempt + 1,
-                    },
+                self._log_http_request(url, endpoint_name, attempt)
+                self.rate_limiter.acquire(url)
+                trace = _ConnectionTrace()
+                response = self._client.get(
+                    url, headers=headers, extensions={"trace": trace.observe}
                 )
-                response = self._client.get(url)
-                if response.status_code in {429} or response.status_code >= 500:
-                    raise httpx.HTTPStatusError(
-                        "Retryable response",
-                        request=response.request,
-                        response=response,
-                    )
-                response.raise_for_status()
-                self.logger.info(
-                    "http_success",
-                    extra={
-                        "event": "http_success",
-                        "url": url,
-                        "endpoint": endpoint_name,
-                        "status": response.status_code,
-                        "attempt": attempt + 1,
-                    },
-                )
-                if not response.content:
-                    self.logger.warning(
-                        "http_empty",
-                        extra={
-                            "event": "http_empty",
-                            "url": url,
-                            "endpoint": endpoint_name,
-                        },
-                    )
-                    return {}
-                try:
-                    return response.json()
-                except json.JSONDecodeError as err:
-                    self.logger.error(
-                        "http_invalid_json",
-                        extra={
-                            "event": "http_invalid_json",
-                            "url": url,
-                            "endpoint": endpoint_name,
-                            "error": str(err),
-                        },
-                    )
-                    raise ValueError(
-                        "Resposta JSON invalida da API Cartola"
-                    ) from err
+                self._record_connection(url, trace)
+                checked = self._check_response(response, url, endpoint_name, attempt)
             except (
                 httpx.TimeoutException,
                 httpx.TransportError,
                 httpx.HTTPStatusError,
             ) as err:
-                if attempt >= self.max_retries:
-                    self.logger.error(
-                        "http_failure",
-                        extra={
-                            "event": "http_failure",
-                            "url": url,
-                            "endpoint": endpoint_name,
-                            "attempt": attempt + 1,
-                            "error": str(err),
-                        },
-                    )
-                    raise
-                self.logger.warning(
-                    "http_retry",
-                    extra={
-                        "event": "http_retry",
-                        "url": url,
-                        "endpoint": endpoint_name,
-                        "attempt": attempt + 1,
-                        "error": str(err),
-                    },
-                )
-                sleep_for = self.backoff_factor * (2**attempt)
-                time.sleep(sleep_for)
+                self._record_attempt_failure(url, err)
+                delay = self._next_backoff(err, url, endpoint_name, attempt, delay)
+                time.sleep(delay)
                 attempt += 1
+            except BaseException:
+                # Cancelled or failed outside httpx: no verdict on the host,
+                # but a half-open probe must not keep its slot forever.
+                self.circuit_breaker.release(url)
+                raise
+            else:
+                self.circuit_breaker.record_success(url)
+                return checked
 
-    def _cache_key(self, url: str) -> str:
-        digest = hashlib.sha1(url.encode("utf-8"), usedforsecurity=False)
-        return digest.hexdigest()
 
-    def _cache_path(self, key: str) -> Path:
-        assert self.cache_dir is not None  # sanity
-        return self.cache_dir / f"{key}.json"
+class AsyncCartolaClient(_BaseCartolaClient):
+    """Asyncio counterpart of :class:`CartolaClient` built on ``httpx.AsyncClient``.
 
-    def _read_cache(self, key: str) -> Any | None:
-        if self.cache_dir is None or self.cache_ttl <= 0:
-            return None
-        path = self._cache_path(key)
-        if not path.exists():
-            return None
+    Retry, cache and logging semantics match the synchronous client, so many
+    fetches can share one connection pool when awaited concurrently.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+        backoff_factor: float | None = None,
+        cache_ttl: int | None = None,
+        cache_dir: Path | None = None,
+        headers: dict[str, str] | None = None,
+        settings: CartolaSettings | None = None,
+        rate_limiter: RateLimiter | None = None,
+        finished_rounds: Iterable[int] | None = None,
+        share_responses: bool = False,
+        circuit_breaker: CircuitBreaker | None = None,
+        serve_stale: bool = True,
+    ) -> None:
+        super().__init__(
+            timeout=timeout,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            cache_ttl=cache_ttl,
+            cache_dir=cache_dir,
+            headers=headers,
+            settings=settings,
+            rate_limiter=rate_limiter,
+            finished_rounds=finished_rounds,
+            share_responses=share_responses,
+            circuit_breaker=circuit_breaker,
+            serve_stale=serve_stale,
+        )
+        # One transport (and therefore one connection pool) per catalog host,
+        # all sharing a single SSL context.
+        ssl_context = httpx.create_ssl_context()
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout),
+            headers=self.headers,
+            follow_redirects=True,
+            verify=ssl_context,
+            http2=self.http2,
+            limits=self.limits,
+            mounts={
+                origin: httpx.AsyncHTTPTransport(
+                    verify=ssl_context, http2=self.http2, limits=self.limits
+                )
+                for origin in _catalog_origins()
+            },
+        )
+        self._refresh_tasks: set[asyncio.Task[None]] = set()
+        self._inflight = AsyncSingleFlight()
+        self._log_initialized()
+
+    @classmethod
+    def from_env(cls, **kwargs: Any) -> AsyncCartolaClient:
+        """Instantiate client pulling configuration from .env/env vars."""
+        return cls(settings=load_settings(), **kwargs)
+
+    async def aclose(self) -> None:
+        """Wait for background refreshes and close the underlying HTTP client."""
+        if self._refresh_tasks:
+            await asyncio.gather(*self._refresh_tasks, return_exceptions=True)
+        self._log_pool_stats()
+        await self._client.aclose()
+        await asyncio.to_thread(self._close_cache)
+
+    async def __aenter__(self) -> AsyncCartolaClient:
+        return self
+
+    async def __aexit__(self, *_args: Any) -> None:
+        await self.aclose()
+
+    async def fetch(
+        self,
+        endpoint: Endpoint,
+        *,
+        rodada: int | None = None,
+        use_cache: bool = True,
+    ) -> Any:
+        """Fetch JSON payload for a given endpoint.
+
+        Concurrent tasks requesting the same resolved URL share one in-flight
+        request; see :meth:`CartolaClient.fetch` for ``share_responses``.
+        """
+        return await self._fetch(endpoint, rodada, use_cache, as_bytes=False)
+
+    async def fetch_raw(
+        self,
+        endpoint: Endpoint,
+        *,
+        rodada: int | None = None,
+        use_cache: bool = True,
+    ) -> bytes:
+        """Async variant of :meth:`CartolaClient.fetch_raw`."""
+        body: bytes = await self._fetch(endpoint, rodada, use_cache, as_bytes=True)
+        return body
+
+    async def _fetch(
+        self, endpoint: Endpoint, rodada: int | None, use_cache: bool, as_bytes: bool
+    ) -> Any:
+        url = endpoint.resolve(rodada)
+        payload = self._shared_payload(endpoint, url, as_bytes)
+        if payload is not _MISSING:
+            return payload
+        payload, coalesced = await self._inflight.do(
+            self._flight_key(url, as_bytes),
+            lambda: self._fetch_once(endpoint, url, rodada, use_cache, as_bytes),
+        )
+        self._remember_payload(endpoint, url, payload, coalesced, as_bytes)
+        return payload
+
+    async def _fetch_once(
+        self,
+        endpoint: Endpoint,
+        url: str,
+        rodada: int | None,
+        use_cache: bool,
+        as_bytes: bool = False,
+    ) -> Any:
+        self._log_fetch_start(endpoint, url, rodada, use_cache)
+        cache_key = self._cache_key(url)
+        policy = self.cache_policy(endpoint, rodada)
+        if use_cache:
+            payload = self._memory_payload(
+                cache_key, endpoint, url, policy, as_bytes
+            )
+            if payload is not _MISSING:
+                self._observe_payload(endpoint, payload)
+                return payload
+        entry = (
+            await asyncio.to_thread(self._lookup_cache, cache_key)
+            if use_cache
+            else None
+        )
+        payload, entry, stale = self._fresh_cached_payload(
+            cache_key, endpoint, url, entry, policy, as_bytes
+        )
+        if payload is not _MISSING:
+            if stale and entry is not None:
+                self._schedule_refresh(cache_key, endpoint, url, rodada, entry)
+            self._observe_payload(endpoint, payload)
+            return payload
+
+        validators = entry.validators() if entry is not None else {}
         try:
-            raw = json.loads(path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            path.unlink(missing_ok=True)
-            self.logger.warning(
-                "cache_corrupted",
-                extra={"event": "cache_corrupted", "path": str(path)},
+            response = await self._request_with_retries(
+                url, endpoint.name, validators
             )
-            return None
-        timestamp = raw.get("timestamp")
-        payload = raw.get("payload")
-        if timestamp is None or time.time() - float(timestamp) > self.cache_ttl:
-            path.unlink(missing_ok=True)
-            self.logger.info(
-                "cache_expired",
-                extra={"event": "cache_expired", "path": str(path)},
+        except CircuitOpenError as err:
+            payload = self._stale_fallback(
+                cache_key, endpoint, url, entry, err, as_bytes
             )
-            return None
+            if payload is _MISSING:
+                raise
+            return payload
+        payload = await asyncio.to_thread(
+            self._complete_fetch,
+            cache_key,
+            endpoint,
+            url,
+            entry,
+            response,
+            use_cache,
+            as_bytes,
+            policy,
+        )
+        self._observe_payload(endpoint, payload)
+        self._log_fetch_success(endpoint, url)
         return payload
 
-    def _write_cache(self, key: str, payload: Any) -> None:
-        if self.cache_dir is None or self.cache_ttl <= 0:
+    def _schedule_refresh(
+        self,
+        key: str,
+        endpoint: Endpoint,
+        url: str,
+        rodada: int | None,
+        entry: CacheEntry,
+    ) -> None:
+        """Revalidate a stale entry in a background task."""
+        if not self._claim_refresh(key):
             return
-        path = self._cache_path(key)
-        data = {"timestamp": time.time(), "payload": payload}
-        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
-        self.logger.debug(
-            "cache_store",
-            extra={
-                "event": "cache_store",
-                "path": str(path),
-                "cache_ttl": self.cache_ttl,
-            },
+        task = asyncio.create_task(
+            self._refresh_entry(key, endpoint, url, rodada, entry)
         )
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh_entry(
+        self,
+        key: str,
+        endpoint: Endpoint,
+        url: str,
+        rodada: int | None,
+        entry: CacheEntry,
+    ) -> None:
+        try:
+            response = await self._request_with_retries(
+                url, endpoint.name, entry.validators()
+            )
+            payload = await asyncio.to_thread(
+                self._complete_fetch,
+                key,
+                endpoint,
+                url,
+                entry,
+                response,
+                True,
+                policy=self.cache_policy(endpoint, rodada),
+            )
+            self._observe_payload(endpoint, payload)
+        except Exception as err:
+            self._log_refresh_failed(endpoint, url, err)
+        finally:
+            self._release_refresh(key)
+
+    async def _request_with_retries(
+        self,
+        url: str,
+        endpoint_name: str,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        attempt = 0
+        delay = 0.0
+        while True:
+            self.circuit_breaker.before_request(url)
+            try:
+                self._log_http_request(url, endpoint_name, attempt)
+                await self.rate_limiter.acquire_async(url)
+                trace = _ConnectionTrace()
+                response = await self._client.get(
+                    url, headers=headers, extensions={"trace": trace.observe_async}
+                )
+                self._record_connection(url, trace)
+                checked = self._check_response(response, url, endpoint_name, attempt)
+            except (
+                httpx.TimeoutException,
+                httpx.TransportError,
+                httpx.HTTPStatusError,
+            ) as err:
+                self._record_attempt_failure(url, err)
+                delay = self._next_backoff(err, url, endpoint_name, attempt, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+            except BaseException:
+                # Cancelled or failed outside httpx: no verdict on the host,
+                # but a half-open probe must not keep its slot forever.
+                self.circuit_breaker.release(url)
+                raise
+            else:
+                self.circuit_breaker.record_success(url)
+                return checked
 
 
 def default_headers(settings: CartolaSettings | None = None) -> dict[str, str]:
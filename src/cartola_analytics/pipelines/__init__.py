@@ -1,14 +1,28 @@
 """Pipeline helpers for Cartola Analytics."""
 
 from .clubes_transform import transform_clubes
+from .engine import compile_schema, run_transform
 from .mercado_status_transform import transform_mercado_status
 from .partidas_transform import transform_partidas
-from .raw import build_output_path, collect_endpoint_payload
+from .raw import (
+    CollectResult,
+    RawWriter,
+    build_output_path,
+    collect_endpoint_payload,
+    collect_endpoint_payload_async,
+    collect_endpoint_payloads,
+)
 from .rodadas_transform import transform_rodadas
 
 __all__ = [
+    "CollectResult",
+    "RawWriter",
     "collect_endpoint_payload",
+    "collect_endpoint_payload_async",
+    "collect_endpoint_payloads",
     "build_output_path",
+    "compile_schema",
+    "run_transform",
     "transform_clubes",
     "transform_mercado_status",
     "transform_partidas",
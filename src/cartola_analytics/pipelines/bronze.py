@@ -0,0 +1,334 @@
+"""Columnar "bronze" copy of the raw payloads.
+
+Each collected payload is flattened with the same record extractor the
+transforms use and written as one Parquet file under a hive-partitioned tree::
+
+    <bronze>/<endpoint>/rodada_coleta=<n>/data_coleta=<YYYY-MM-DD>/<ts>.parquet
+
+Transforms reading ``source="bronze"`` scan those files as a single Arrow
+dataset instead of decoding the JSON history again. Files are written with
+the schema's Arrow types (see :mod:`.typed_frames`).
+
+A failed write leaves a ``.stale`` marker in the endpoint directory: the
+bronze copy is behind the raw history until :func:`build_bronze` converts it
+again (collectors do so on their next bronze write), and readers should use
+the raw payloads meanwhile (see :func:`bronze_is_stale`).
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import shutil
+import tempfile
+from collections.abc import Callable, Collection, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, datetime
+from functools import lru_cache
+from itertools import repeat
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from ..schema import SchemaSpec
+from .incremental import snapshot_key, snapshot_time
+from .raw_index import RawRecord
+from .raw_store import (
+    TIMESTAMP_FORMAT,
+    find_raw_records,
+    load_raw_snapshots,
+    read_raw_snapshots,
+)
+from .typed_frames import conform_frame, records_frame, to_table
+
+if TYPE_CHECKING:
+    from .engine import SchemaTransform
+
+logger = logging.getLogger(__name__)
+
+SOURCES = ("raw", "bronze")
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+STALE_MARKER = ".stale"
+# Chunks handed to each worker: enough to balance uneven snapshot sizes while
+# keeping the per-chunk pickling overhead small.
+CHUNKS_PER_WORKER = 4
+
+Extractor = Callable[[Any, datetime], list[dict[str, Any]]]
+
+
+@lru_cache(maxsize=1)
+def _transforms() -> dict[str, SchemaTransform]:
+    """Transforms compiled from the schemas (see :mod:`.engine`)."""
+    # Imported lazily: the engine imports this module.
+    from .engine import schema_transforms
+
+    return schema_transforms()
+
+
+def has_extractor(endpoint: str) -> bool:
+    return endpoint in _transforms()
+
+
+def mark_bronze_stale(bronze_base: Path, endpoint: str) -> None:
+    """Flag the bronze copy of ``endpoint`` as missing raw payloads."""
+    marker = bronze_base / endpoint / STALE_MARKER
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.touch()
+
+
+def bronze_is_stale(bronze_base: Path, endpoint: str) -> bool:
+    """Whether a bronze write of ``endpoint`` failed since its last build."""
+    return (bronze_base / endpoint / STALE_MARKER).exists()
+
+
+def bronze_path(
+    bronze_base: Path, endpoint: str, rodada: int | None, collected_at: datetime
+) -> Path:
+    collected_at = collected_at.astimezone(UTC)
+    rodada_part = NULL_PARTITION if rodada is None else str(rodada)
+    return (
+        bronze_base
+        / endpoint
+        / f"rodada_coleta={rodada_part}"
+        / f"data_coleta={collected_at:%Y-%m-%d}"
+        / f"{collected_at.strftime(TIMESTAMP_FORMAT)}.parquet"
+    )
+
+
+def write_bronze(
+    bronze_base: Path,
+    endpoint: str,
+    payload: Any,
+    *,
+    collected_at: datetime,
+    rodada: int | None,
+) -> Path | None:
+    """Flatten ``payload`` into a Parquet file typed by the endpoint schema.
+
+    Returns ``None`` for endpoints without an extractor and for payloads that
+    produce no records.
+    """
+    transform = _transforms().get(endpoint)
+    if transform is None:
+        return None
+    records = transform.extract(payload, collected_at)
+    if not records:
+        return None
+    frame = transform.coerce_frame(records_frame(records, transform.spec))
+    table = to_table(frame, transform.spec)
+    path = bronze_path(bronze_base, endpoint, rodada, collected_at)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    logger.debug(
+        "bronze_written",
+        extra={
+            "event": "bronze_written",
+            "endpoint": endpoint,
+            "rodada": rodada,
+            "path": str(path),
+            "rows": table.num_rows,
+        },
+    )
+    return path
+
+
+def build_bronze(
+    raw_base: Path,
+    bronze_base: Path,
+    endpoints: Iterable[str] | None = None,
+    *,
+    clear: bool = True,
+) -> int:
+    """Re-create the bronze dataset of ``endpoints`` from the raw history.
+
+    Defaults to every endpoint with an extractor; archived snapshots are
+    converted too. With ``clear=False`` existing files are kept and every
+    snapshot is (re)written in place, which is safe while collectors write
+    the same endpoint. A converted endpoint is no longer stale. Returns the
+    number of snapshots converted.
+    """
+    names = list(endpoints) if endpoints is not None else sorted(_transforms())
+    total = 0
+    for name in names:
+        if not has_extractor(name):
+            raise ValueError(f"Endpoint sem extrator bronze: {name}")
+        if clear:
+            shutil.rmtree(bronze_base / name, ignore_errors=True)
+        for snapshot in load_raw_snapshots(raw_base, name, tier=None):
+            written = write_bronze(
+                bronze_base,
+                name,
+                snapshot.payload,
+                collected_at=snapshot.collected_at,
+                rodada=snapshot.rodada,
+            )
+            total += written is not None
+        (bronze_base / name / STALE_MARKER).unlink(missing_ok=True)
+    return total
+
+
+def bronze_files(bronze_base: Path, endpoint: str) -> list[Path]:
+    endpoint_dir = bronze_base / endpoint
+    if not endpoint_dir.is_dir():
+        return []
+    return sorted(
+        endpoint_dir.rglob("*.parquet"), key=lambda path: (path.name, path)
+    )
+
+
+def read_bronze(
+    bronze_base: Path, endpoint: str, files: list[Path] | None = None
+) -> pd.DataFrame:
+    """All bronze records of ``endpoint`` (or just ``files``) in collection order.
+
+    Files written at different times may disagree on a column type (a column
+    that was all null, ints that later gained nulls); their schemas are
+    unified before the scan.
+    """
+    if files is None:
+        files = bronze_files(bronze_base, endpoint)
+    if not files:
+        return pd.DataFrame()
+    schema = pa.unify_schemas(
+        [pq.read_schema(path) for path in files], promote_options="permissive"
+    )
+    dataset = ds.dataset(
+        [str(path) for path in files], schema=schema, format="parquet"
+    )
+    return dataset.to_table().to_pandas()
+
+
+def _parse_records(
+    extractor: Extractor, records: Sequence[RawRecord]
+) -> tuple[list[dict[str, Any]], list[str]]:
+    rows: list[dict[str, Any]] = []
+    keys: list[str] = []
+    for snapshot in read_raw_snapshots(records):
+        rows.extend(extractor(snapshot.payload, snapshot.collected_at))
+        keys.append(snapshot_key(snapshot.rodada, snapshot.collected_at))
+    return rows, keys
+
+
+def load_endpoint_frame(
+    endpoint: str,
+    extractor: Extractor,
+    *,
+    source: str,
+    raw_base: Path,
+    bronze_base: Path,
+    include_archived: bool = False,
+    workers: int = 1,
+    schema: SchemaSpec | None = None,
+) -> pd.DataFrame:
+    """Records of ``endpoint`` read from the raw JSON or the bronze layer.
+
+    Raw reads cover the hot tier only unless ``include_archived`` is set.
+    """
+    frame, _ = load_new_records(
+        endpoint,
+        extractor,
+        source=source,
+        raw_base=raw_base,
+        bronze_base=bronze_base,
+        include_archived=include_archived,
+        workers=workers,
+        schema=schema,
+    )
+    return frame
+
+
+def load_new_records(
+    endpoint: str,
+    extractor: Extractor,
+    *,
+    source: str,
+    raw_base: Path,
+    bronze_base: Path,
+    include_archived: bool = False,
+    consumed: Collection[str] = (),
+    after: datetime | None = None,
+    workers: int = 1,
+    schema: SchemaSpec | None = None,
+) -> tuple[pd.DataFrame, list[str]]:
+    """Records of the snapshots of ``endpoint`` not listed in ``consumed``.
+
+    Snapshots collected before ``after`` are skipped as well. Returns the
+    frame and the keys of the snapshots it was built from. Raw snapshots are
+    keyed by :func:`snapshot_key`, bronze files by their path relative to the
+    endpoint directory. Only a missing or empty source raises; an empty frame
+    means every snapshot was already consumed.
+
+    With ``workers`` > 1 raw snapshots are decoded and flattened in a process
+    pool, in contiguous chunks whose results are concatenated in collection
+    order, so the frame is identical to a serial read. ``extractor`` must be
+    picklable (a module-level function). Bronze reads are already
+    multi-threaded by Arrow and ignore ``workers``.
+
+    With ``schema`` the frame is typed column by column from the YAML (see
+    :mod:`.typed_frames`) instead of inferred from the records.
+    """
+    if source == "bronze":
+        endpoint_dir = bronze_base / endpoint
+        files = bronze_files(bronze_base, endpoint)
+        if not files:
+            raise FileNotFoundError(f"No bronze files found in {endpoint_dir}")
+        keyed = {path.relative_to(endpoint_dir).as_posix(): path for path in files}
+        new = [
+            key
+            for key in keyed
+            if key not in consumed and (after is None or snapshot_time(key) >= after)
+        ]
+        frame = (
+            read_bronze(bronze_base, endpoint, [keyed[key] for key in new])
+            if new
+            else pd.DataFrame()
+        )
+        if schema is not None:
+            frame = conform_frame(frame, schema)
+        return frame, new
+    if source != "raw":
+        raise ValueError(f"Unknown source: {source}")
+
+    raw_dir = raw_base / endpoint
+    if not raw_dir.exists():
+        raise FileNotFoundError(f"Raw directory not found: {raw_dir}")
+    records = find_raw_records(
+        raw_base, endpoint, tier=None if include_archived else "hot"
+    )
+    if not records:
+        raise FileNotFoundError(f"No raw files found in {raw_dir}")
+
+    pending = [
+        record
+        for record in records
+        if (after is None or record.collected_at >= after)
+        and snapshot_key(record.rodada, record.collected_at) not in consumed
+    ]
+    if workers > 1 and len(pending) > 1:
+        size = math.ceil(len(pending) / (workers * CHUNKS_PER_WORKER))
+        chunks = [
+            pending[start : start + size] for start in range(0, len(pending), size)
+        ]
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            results = list(pool.map(_parse_records, repeat(extractor), chunks))
+    else:
+        results = [_parse_records(extractor, pending)]
+    rows = [row for chunk_rows, _ in results for row in chunk_rows]
+    keys = [key for _, chunk_keys in results for key in chunk_keys]
+    if pending and not keys:
+        raise FileNotFoundError(f"No raw files found in {raw_dir}")
+    if schema is not None:
+        return records_frame(rows, schema), keys
+    return pd.DataFrame(rows), keys
@@ -0,0 +1,80 @@
+"""Column-level timestamp coercion shared by the transforms.
+
+Raw payloads carry dates as epoch numbers or as strings in a handful of
+formats. Instead of parsing value by value, a whole column is split by value
+type: numbers go through one epoch conversion, strings through one
+``to_datetime`` call per known format, and only the strings no format matched
+reach the (slow, per-element) generic parser.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+
+import pandas as pd
+
+DATE_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%SZ",
+)
+
+_NUMBER_TYPES = (int, float, bool)
+_DATETIME_TYPES = (datetime, pd.Timestamp)
+
+
+def _parse_strings(values: pd.Series, formats: Sequence[str]) -> list[pd.Series]:
+    stripped = values.str.strip()
+    pending = stripped[stripped != ""]
+    parsed: list[pd.Series] = []
+    for fmt in formats:
+        if pending.empty:
+            return parsed
+        matched = pd.to_datetime(pending, format=fmt, errors="coerce")
+        hit = matched.notna()
+        parsed.append(matched[hit].dt.tz_localize("UTC"))
+        pending = pending[~hit]
+    if not pending.empty:
+        parsed.append(
+            pd.to_datetime(pending, utc=True, errors="coerce", format="mixed")
+        )
+    return parsed
+
+
+def coerce_datetime_column(
+    values: pd.Series, formats: Sequence[str] = DATE_FORMATS
+) -> pd.Series:
+    """Coerce raw date values to a ``datetime64[ns, UTC]`` series.
+
+    Numbers are epoch seconds; strings are stripped and tried against
+    ``formats`` (read as UTC) before the generic parser; datetimes are kept,
+    naive ones read as UTC. Empty strings, missing and unparsable values
+    become ``NaT``.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return pd.to_datetime(values, utc=True)
+    target = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns, UTC]")
+    if values.empty:
+        return target
+    if pd.api.types.is_numeric_dtype(values):
+        numbers, strings, moments = values, values.iloc[0:0], values.iloc[0:0]
+    else:
+        kinds = values.map(type)
+        numbers = values[kinds.isin(_NUMBER_TYPES)]
+        strings = values[kinds.isin([str])]
+        moments = values[kinds.isin(_DATETIME_TYPES)]
+
+    parts: list[pd.Series] = []
+    if not numbers.empty:
+        seconds = numbers.astype("float64")
+        parts.append(pd.to_datetime(seconds, unit="s", utc=True).dt.round("us"))
+    if not strings.empty:
+        parts.extend(_parse_strings(strings.astype(str), formats))
+    if not moments.empty:
+        parsed = pd.to_datetime(moments.tolist(), utc=True)
+        parts.append(pd.Series(parsed, index=moments.index))
+    for part in parts:
+        if not part.empty:
+            target.loc[part.index] = part.astype("datetime64[ns, UTC]")
+    return target
@@ -0,0 +1,540 @@
+"""Schema-driven transform engine.
+
+Each ``docs/schemas/<nome>.yaml`` describes where the records of a payload
+live and where every field comes from::
+
+    raw_source:
+      endpoint: partidas
+      records:
+        layout: list              # list | mapping | object
+        path: partidas            # list key (or candidates); root lists work too
+        skip_without: [partida_id]
+    fields:
+      - name: rodada
+        type: int
+        source: $payload.rodada   # payload-level value shared by every record
+      - name: transmissao_label
+        type: string
+        source: transmissao.label # dotted path inside the record
+      - name: partida_data
+        type: timestamp
+        fallback: timestamp_coleta
+
+``layout: mapping`` reads a dict of records keyed by id (``key: int`` skips
+keys that are not ints; ``source: $key`` reads the key); ``layout: object``
+reads the payload itself as the single record. ``source`` defaults to the
+field name, and a list of paths takes the first truthy value. ``coerce``
+defaults from the field type (see :data:`COERCIONS`); ``default`` replaces
+missing values, ``fallback`` copies another field, and a ``required`` field
+still missing raises. ``$collected_at`` is the collection time.
+
+``stage.distinct_on`` lists columns whose repeated values describe the same
+fact (a payload polled again before it changed): only the earliest
+collection of each combination reaches stage and processed.
+
+:func:`compile_schema` turns a spec into a picklable :class:`SchemaTransform`
+once; :func:`run_transform` runs it with the shared parallel, incremental and
+typed-column machinery.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from ..schema import FieldSpec, SchemaSpec, load_schema, schema_dir
+from .bronze import load_new_records
+from .datetimes import coerce_datetime_column
+from .incremental import load_state, primary_key, update_processed
+from .typed_frames import write_parquet
+
+LAYOUTS = ("list", "mapping", "object")
+COLLECTED_AT = "$collected_at"
+KEY = "$key"
+PAYLOAD_PREFIX = "$payload."
+
+
+def _project_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def _to_int(value: Any) -> int | None:
+    return None if value is None else int(value)
+
+
+def _maybe_int(value: Any) -> int | None:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _maybe_float(value: Any) -> float | None:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _clean_string(value: Any) -> str | None:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _text(value: Any) -> str | None:
+    return str(value) if value else None
+
+
+def _to_bool(value: Any) -> bool:
+    return bool(value)
+
+
+def _maybe_bool(value: Any) -> bool | None:
+    return None if value is None else bool(value)
+
+
+def _sequence(value: Any) -> str | None:
+    if not isinstance(value, list):
+        return None
+    tokens = [str(item).strip() for item in value if item]
+    cleaned = [token for token in tokens if token]
+    return "".join(cleaned) if cleaned else None
+
+
+def _epoch(value: Any) -> int | float | None:
+    return value if isinstance(value, (int, float)) else None
+
+
+def _raw(value: Any) -> Any:
+    return value
+
+
+def _label(value: Any, *, labels: Mapping[Any, str]) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        number = int(value)
+        return labels.get(number, str(number))
+    return labels.get(value, str(value))
+
+
+COERCIONS: dict[str, Callable[[Any], Any]] = {
+    "int": _to_int,
+    "maybe_int": _maybe_int,
+    "float": _maybe_float,
+    "string": _clean_string,
+    "text": _text,
+    "bool": _to_bool,
+    "maybe_bool": _maybe_bool,
+    "sequence": _sequence,
+    "epoch": _epoch,
+    "raw": _raw,
+}
+
+
+def _default_coercion(field: FieldSpec) -> str:
+    if field.labels is not None:
+        return "label"
+    if field.type == "int":
+        return "int" if field.required else "maybe_int"
+    if field.type == "bool":
+        return "bool" if field.required else "maybe_bool"
+    if field.type == "timestamp":
+        return "raw"
+    if field.type == "float":
+        return "float"
+    return "string"
+
+
+@dataclass(frozen=True)
+class FieldPlan:
+    """How one output column is read from a record."""
+
+    name: str
+    scope: str  # "record", "payload", "key" or "collected_at"
+    paths: tuple[tuple[str, ...], ...]
+    coerce: Callable[[Any], Any]
+    default: Any = None
+    fallback: str | None = None
+    required: bool = False
+    timestamp: bool = False
+
+    def lookup(self, source: Any) -> Any:
+        value = None
+        for path in self.paths:
+            value = source
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if value:
+                return value
+        return value
+
+
+def _compile_field(field: FieldSpec, spec: SchemaSpec) -> FieldPlan:
+    sources = field.source if field.source is not None else field.name
+    if isinstance(sources, str):
+        sources = [sources]
+    scope = "record"
+    paths: list[tuple[str, ...]] = []
+    for source in sources:
+        if source == COLLECTED_AT:
+            scope = "collected_at"
+        elif source == KEY:
+            scope = "key"
+        elif source.startswith(PAYLOAD_PREFIX):
+            scope = "payload"
+            paths.append(tuple(source[len(PAYLOAD_PREFIX) :].split(".")))
+        else:
+            paths.append(tuple(source.split(".")))
+    coercion = field.coerce or _default_coercion(field)
+    coerce: Callable[[Any], Any]
+    if coercion == "label":
+        coerce = functools.partial(_label, labels=dict(field.labels or {}))
+    elif coercion in COERCIONS:
+        coerce = COERCIONS[coercion]
+    else:
+        raise ValueError(f"Coercao desconhecida para {field.name}: {coercion}")
+    names = [other.name for other in spec.fields]
+    if field.type != "timestamp":
+        # Record-level fallbacks read a value already extracted.
+        names = names[: names.index(field.name)]
+    if field.fallback is not None and field.fallback not in names:
+        raise ValueError(
+            f"Fallback de {field.name} precisa ser um campo anterior: {field.fallback}"
+        )
+    return FieldPlan(
+        name=field.name,
+        scope=scope,
+        paths=tuple(paths),
+        coerce=coerce,
+        default=field.default,
+        fallback=field.fallback,
+        required=field.required,
+        timestamp=field.type == "timestamp",
+    )
+
+
+RowBuilder = Callable[[dict[str, Any], Any, dict[str, Any]], dict[str, Any]]
+
+
+FieldGetter = Callable[[dict[str, Any], Any, dict[str, Any]], Any]
+
+
+def _read_getter(plan: FieldPlan) -> FieldGetter:
+    if plan.scope == "key":
+        return lambda item, key, shared: key
+    if len(plan.paths) == 1 and len(plan.paths[0]) == 1:
+        path = plan.paths[0][0]
+        return lambda item, key, shared: item.get(path)
+    lookup = plan.lookup
+    return lambda item, key, shared: lookup(item)
+
+
+def _field_getter(plan: FieldPlan) -> FieldGetter:
+    """Closure reading and coercing the value of ``plan`` for one record."""
+    name = plan.name
+    if plan.scope in ("payload", "collected_at"):
+        return lambda item, key, shared: shared[name]
+    read = _read_getter(plan)
+    if plan.coerce is _raw:
+        return read
+    coerce = plan.coerce
+    return lambda item, key, shared: coerce(read(item, key, shared))
+
+
+def _row_builder(plans: tuple[FieldPlan, ...]) -> RowBuilder:
+    """Compose ``build_row(item, key, shared)`` returning one raw record.
+
+    Each field is resolved once into a closure (direct ``dict.get`` for
+    top-level keys), so a record costs one call per field instead of
+    interpreting its plan.
+    """
+    getters = tuple((plan.name, _field_getter(plan)) for plan in plans)
+
+    def build_row(
+        item: dict[str, Any], key: Any, shared: dict[str, Any]
+    ) -> dict[str, Any]:
+        return {name: get(item, key, shared) for name, get in getters}
+
+    return build_row
+
+
+@dataclass(frozen=True)
+class SchemaTransform:
+    """A schema compiled into a record extractor and column coercion.
+
+    Instances pickle as their spec and are compiled again on load, so
+    :meth:`extract` can run in worker processes.
+    """
+
+    spec: SchemaSpec
+    endpoint: str
+    layout: str
+    paths: tuple[str, ...]
+    key_type: str | None
+    skip_without: tuple[str, ...]
+    fields: tuple[FieldPlan, ...]
+    build_row: RowBuilder = field(init=False, repr=False, compare=False)
+    # Record fields that may still need a default, fallback or check.
+    checked: tuple[FieldPlan, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        checked = tuple(
+            plan
+            for plan in self.fields
+            if plan.scope in ("record", "key")
+            and (
+                plan.default is not None
+                or plan.required
+                or (plan.fallback is not None and not plan.timestamp)
+            )
+        )
+        object.__setattr__(self, "build_row", _row_builder(self.fields))
+        object.__setattr__(self, "checked", checked)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return compile_schema, (self.spec,)
+
+    def _entries(self, payload: Any) -> Iterator[tuple[Any, dict[str, Any]]]:
+        if self.layout == "object":
+            if isinstance(payload, dict):
+                yield None, payload
+            return
+        kind = list if self.layout == "list" else dict
+        container = payload
+        if self.paths and isinstance(payload, dict):
+            container = next(
+                (
+                    payload[path]
+                    for path in self.paths
+                    if isinstance(payload.get(path), kind)
+                ),
+                None,
+            )
+        if not isinstance(container, kind):
+            return
+        if isinstance(container, list):
+            for item in container:
+                if isinstance(item, dict):
+                    yield None, item
+            return
+        for key, item in container.items():
+            if not isinstance(item, dict):
+                continue
+            if self.key_type == "int":
+                try:
+                    key = int(key)
+                except (TypeError, ValueError):
+                    continue
+            yield key, item
+
+    def _finish(self, plan: FieldPlan, value: Any, row: dict[str, Any]) -> Any:
+        if value is None and plan.default is not None:
+            value = plan.coerce(plan.default)
+        if plan.timestamp:
+            # Parsed, with its fallback, a column at a time in coerce_frame.
+            if value is None and plan.required and plan.fallback is None:
+                raise ValueError(f"Campo obrigatorio ausente: {plan.name}")
+            return value
+        if value is None and plan.fallback is not None:
+            value = plan.coerce(row[plan.fallback])
+        if value is None and plan.required:
+            raise ValueError(f"Campo obrigatorio ausente: {plan.name}")
+        return value
+
+    def extract(self, payload: Any, collected_at: datetime) -> list[dict[str, Any]]:
+        """Flatten one payload into records with the schema's columns."""
+        shared: dict[str, Any] = {}
+        for plan in self.fields:
+            if plan.scope == "collected_at":
+                shared[plan.name] = collected_at
+            elif plan.scope == "payload":
+                shared[plan.name] = self._finish(
+                    plan, plan.coerce(plan.lookup(payload)), shared
+                )
+        build_row, checked, skip = self.build_row, self.checked, self.skip_without
+        records: list[dict[str, Any]] = []
+        for key, item in self._entries(payload):
+            if skip and not all(name in item for name in skip):
+                continue
+            row = build_row(item, key, shared)
+            for plan in checked:
+                if row[plan.name] is None:
+                    row[plan.name] = self._finish(plan, None, row)
+            records.append(row)
+        return records
+
+    def coerce_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Parse the timestamp columns and apply their fallbacks."""
+        timestamps = [plan for plan in self.fields if plan.timestamp]
+        for plan in sorted(timestamps, key=lambda plan: plan.fallback is not None):
+            column = coerce_datetime_column(frame[plan.name])
+            if plan.fallback is not None:
+                column = column.fillna(frame[plan.fallback])
+            frame[plan.name] = column
+        return frame
+
+
+def compile_schema(spec: SchemaSpec) -> SchemaTransform:
+    """Compile the record location and field sources of ``spec``."""
+    records = spec.raw_source.get("records")
+    if not isinstance(records, dict):
+        raise ValueError(f"Schema sem raw_source.records: {spec.name}")
+    layout = records.get("layout", "list")
+    if layout not in LAYOUTS:
+        raise ValueError(f"Layout de registros invalido em {spec.name}: {layout}")
+    paths = records.get("path", [])
+    plans = [_compile_field(field, spec) for field in spec.fields]
+    return SchemaTransform(
+        spec=spec,
+        endpoint=spec.raw_source.get("endpoint", spec.name),
+        layout=layout,
+        paths=(paths,) if isinstance(paths, str) else tuple(paths),
+        key_type=records.get("key"),
+        skip_without=tuple(records.get("skip_without", [])),
+        fields=tuple(plans),
+    )
+
+
+@functools.cache
+def schema_transform(name: str) -> SchemaTransform:
+    """Compiled transform of the bundled schema ``name``."""
+    return compile_schema(load_schema(name))
+
+
+def schema_names(*, base_dir: Path | None = None) -> list[str]:
+    """Schemas that declare ``raw_source.records`` (and can be transformed)."""
+    directory = base_dir / "docs" / "schemas" if base_dir else schema_dir()
+    return [
+        path.stem
+        for path in sorted(directory.glob("*.yaml"))
+        if "records" in load_schema(path.stem, base_dir=base_dir).raw_source
+    ]
+
+
+def schema_transforms() -> dict[str, SchemaTransform]:
+    """Bundled compiled transforms keyed by raw endpoint."""
+    transforms = (schema_transform(name) for name in schema_names())
+    return {transform.endpoint: transform for transform in transforms}
+
+
+def run_transform(
+    name: str,
+    *,
+    base_dir: Path | None = None,
+    schema: SchemaSpec | None = None,
+    raw_root: Path | None = None,
+    source: str = "raw",
+    bronze_root: Path | None = None,
+    include_archived: bool = False,
+    incremental: bool = False,
+    workers: int = 1,
+) -> dict[str, Any]:
+    """Transform the raw payloads of schema ``name`` into stage and processed data.
+
+    ``source="bronze"`` reads the columnar copy under ``bronze_root``
+    (default ``data/bronze``) instead of decoding the raw JSON. A full run
+    rebuilds the processed dataset from every snapshot, archived ones
+    included. With ``incremental`` only snapshots newer than the state's
+    high-water mark, and not yet merged, are parsed and merged into the
+    processed dataset (see :mod:`.incremental`); they come from the hot tier
+    unless ``include_archived`` is set. Without a usable state (first run,
+    removed file, other source or schema version) an incremental run
+    rebuilds like a full one. ``workers`` > 1 parses the raw files in that
+    many processes; the output is the same as a serial run.
+    """
+    project_root = base_dir or _project_root()
+    spec = schema or load_schema(name, base_dir=project_root)
+    transform = compile_schema(spec)
+
+    raw_base = Path(raw_root) if raw_root is not None else project_root / "data" / "raw"
+    bronze_base = (
+        Path(bronze_root)
+        if bronze_root is not None
+        else project_root / "data" / "bronze"
+    )
+    processed_path = project_root / spec.processed.get(
+        "dataset",
+        f"data/processed/{spec.name}/{spec.name}.parquet",
+    )
+    state = (
+        load_state(processed_path, source=source, schema_version=spec.version)
+        if incremental
+        else None
+    )
+    frame, new_keys = load_new_records(
+        transform.endpoint,
+        transform.extract,
+        source=source,
+        raw_base=raw_base,
+        bronze_base=bronze_base,
+        include_archived=include_archived or state is None,
+        consumed=state.consumed if state else frozenset(),
+        after=state.high_water_mark if state else None,
+        workers=workers,
+        schema=spec,
+    )
+    if frame.empty and state is None:
+        raise ValueError(f"No records produced for {spec.name}")
+
+    distinct_on = list(spec.stage.get("distinct_on", []))
+    stage_path = None
+    if not frame.empty:
+        frame = transform.coerce_frame(frame)
+        if distinct_on:
+            frame = (
+                frame.sort_values("timestamp_coleta", kind="mergesort")
+                .drop_duplicates(subset=distinct_on, keep="first")
+                .reset_index(drop=True)
+            )
+
+        stage_dir = project_root / "data" / "stage" / spec.name
+        stage_dir.mkdir(parents=True, exist_ok=True)
+        run_timestamp = datetime.now(tz=UTC).strftime("%Y%m%dT%H%M%SZ")
+        stage_path = stage_dir / f"{run_timestamp}.parquet"
+        write_parquet(frame, stage_path, spec)
+
+    processed, rows_added, rows_replaced = update_processed(
+        processed_path,
+        frame,
+        key=primary_key(spec, [spec.fields[0].name]),
+        source=source,
+        schema_version=spec.version,
+        previous=state,
+        new_keys=new_keys,
+        spec=spec,
+        distinct_on=distinct_on,
+    )
+
+    return {
+        "stage_path": stage_path,
+        "processed_path": processed_path,
+        "rows_stage": len(frame),
+        "rows_processed": len(processed),
+        "rows_added": rows_added,
+        "rows_replaced": rows_replaced,
+    }
+
+
+def schema_transformers(
+    *, base_dir: Path | None = None
+) -> dict[str, Callable[..., dict[str, Any]]]:
+    """``run_transform`` bound to each transformable schema, keyed by endpoint."""
+    transformers: dict[str, Callable[..., dict[str, Any]]] = {}
+    for name in schema_names(base_dir=base_dir):
+        spec = load_schema(name, base_dir=base_dir)
+        endpoint = spec.raw_source.get("endpoint", spec.name)
+        transformers[endpoint] = functools.partial(run_transform, name)
+    return transformers
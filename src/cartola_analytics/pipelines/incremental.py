@@ -0,0 +1,228 @@
+"""Incremental state and keyed merge shared by the transforms.
+
+A transform records, next to its processed Parquet, which snapshots it has
+already consumed::
+
+    data/processed/clubes/clubes.parquet
+    data/processed/clubes/clubes.parquet.state.json
+
+The state keeps a high-water mark, the newest collection time consumed, and
+only the keys collected at that instant; older keys are pruned, so the file
+stays small however long the history grows. With ``incremental=True``
+snapshots collected before the mark are skipped, snapshots at the mark are
+checked against the key list, and the rows of the rest are merged into the
+processed dataset by the schema ``primary_key``: the row with the latest
+``timestamp_coleta`` wins. A snapshot copied in later with an older
+collection time is only picked up by a full run. Full runs rebuild the
+dataset from every snapshot, archived ones included, and start a new state.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path, PurePosixPath
+
+import pandas as pd
+
+from ..schema import SchemaSpec
+from .raw_store import TIMESTAMP_FORMAT
+from .typed_frames import conform_frame, write_parquet
+
+logger = logging.getLogger(__name__)
+
+STATE_SUFFIX = ".state.json"
+STATE_VERSION = 1
+ORDER_COLUMN = "timestamp_coleta"
+
+
+def snapshot_key(rodada: int | None, collected_at: datetime) -> str:
+    """Stable identity of a raw snapshot, whatever layout or tier holds it."""
+    round_part = "-" if rodada is None else str(rodada)
+    return f"{round_part}@{collected_at.astimezone(UTC).isoformat()}"
+
+
+def snapshot_time(key: str) -> datetime:
+    """Collection time of a raw snapshot key or of a bronze file key."""
+    if "@" in key:
+        return datetime.fromisoformat(key.split("@", 1)[1])
+    stem = PurePosixPath(key).stem
+    return datetime.strptime(stem, TIMESTAMP_FORMAT).replace(tzinfo=UTC)
+
+
+def state_path(processed_path: Path) -> Path:
+    return processed_path.with_name(processed_path.name + STATE_SUFFIX)
+
+
+def primary_key(spec: SchemaSpec, default: Sequence[str]) -> list[str]:
+    return list(spec.processed.get("primary_key") or default)
+
+
+@dataclass(frozen=True)
+class TransformState:
+    """Snapshots already merged into one processed dataset.
+
+    ``high_water_mark`` is the newest collection time consumed and
+    ``consumed`` the keys collected at that instant. The state only applies
+    to the same ``source`` and schema version; anything else forces a full
+    rebuild.
+    """
+
+    source: str
+    schema_version: int
+    consumed: frozenset[str]
+    high_water_mark: datetime | None = None
+
+    def matches(self, source: str, schema_version: int) -> bool:
+        return self.source == source and self.schema_version == schema_version
+
+    def advance(self, keys: Iterable[str]) -> TransformState:
+        """State after consuming ``keys``, pruned below the new mark."""
+        times = {key: snapshot_time(key) for key in self.consumed.union(keys)}
+        marks = list(times.values())
+        if self.high_water_mark is not None:
+            marks.append(self.high_water_mark)
+        mark = max(marks, default=None)
+        return TransformState(
+            source=self.source,
+            schema_version=self.schema_version,
+            consumed=frozenset(
+                key for key, moment in times.items() if moment == mark
+            ),
+            high_water_mark=mark,
+        )
+
+
+def read_state(path: Path) -> TransformState | None:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        mark = raw.get("high_water_mark")
+        return TransformState(
+            source=str(raw["source"]),
+            schema_version=int(raw["schema_version"]),
+            consumed=frozenset(raw["consumed"]),
+            high_water_mark=datetime.fromisoformat(mark) if mark else None,
+        )
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, TypeError) as exc:
+        logger.warning(
+            "transform_state_invalid",
+            extra={
+                "event": "transform_state_invalid",
+                "path": str(path),
+                "error": str(exc),
+            },
+        )
+        return None
+
+
+def write_state(path: Path, state: TransformState) -> None:
+    body = {
+        "version": STATE_VERSION,
+        "source": state.source,
+        "schema_version": state.schema_version,
+        "high_water_mark": (
+            state.high_water_mark.isoformat() if state.high_water_mark else None
+        ),
+        "consumed": sorted(state.consumed),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(body, handle)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def load_state(
+    processed_path: Path, *, source: str, schema_version: int
+) -> TransformState | None:
+    """State of ``processed_path``; ``None`` means rebuild."""
+    if not processed_path.exists():
+        return None
+    state = read_state(state_path(processed_path))
+    if state is None or not state.matches(source, schema_version):
+        return None
+    return state
+
+
+def merge_keyed(
+    existing: pd.DataFrame | None, new: pd.DataFrame, key: Sequence[str]
+) -> tuple[pd.DataFrame, int, int]:
+    """Merge ``new`` rows into ``existing`` by ``key``, last write wins.
+
+    Rows are ordered by ``timestamp_coleta``; on ties the new row wins. The
+    result is sorted by ``key``. Returns the merged frame and the number of
+    rows added and replaced.
+    """
+    columns = list(key)
+    if new.empty:
+        if existing is None:
+            return new, 0, 0
+        return existing.sort_values(columns).reset_index(drop=True), 0, 0
+    base = new.iloc[0:0] if existing is None else existing
+    combined = pd.concat(
+        [base.assign(_novo=False), new.assign(_novo=True)], ignore_index=True
+    )
+    merged = (
+        combined.sort_values(ORDER_COLUMN, kind="mergesort")
+        .drop_duplicates(subset=columns, keep="last")
+        .sort_values(columns)
+        .reset_index(drop=True)
+    )
+    known = pd.MultiIndex.from_frame(base[columns]).unique()
+    from_new = merged["_novo"].to_numpy(dtype=bool)
+    existed = pd.MultiIndex.from_frame(merged[columns]).isin(known)
+    added = int((from_new & ~existed).sum())
+    replaced = int((from_new & existed).sum())
+    return merged.drop(columns="_novo"), added, replaced
+
+
+def update_processed(
+    processed_path: Path,
+    frame: pd.DataFrame,
+    *,
+    key: Sequence[str],
+    source: str,
+    schema_version: int,
+    previous: TransformState | None,
+    new_keys: Iterable[str],
+    spec: SchemaSpec | None = None,
+    distinct_on: Sequence[str] = (),
+) -> tuple[pd.DataFrame, int, int]:
+    """Merge ``frame`` into the processed dataset and record its snapshots.
+
+    ``frame`` is merged into the existing dataset whenever there is a
+    ``previous`` state; otherwise the dataset is rebuilt from ``frame``
+    alone. With ``spec`` the Parquet is written with
+    the schema's column types. Rows of ``frame`` whose ``distinct_on``
+    values are already in the dataset are dropped. Returns the processed
+    frame and the rows added and replaced.
+    """
+    existing = pd.read_parquet(processed_path) if previous is not None else None
+    if distinct_on and existing is not None and not frame.empty:
+        columns = list(distinct_on)
+        known = pd.MultiIndex.from_frame(existing[columns])
+        frame = frame[~pd.MultiIndex.from_frame(frame[columns]).isin(known)]
+    processed, added, replaced = merge_keyed(existing, frame, key)
+    processed_path.parent.mkdir(parents=True, exist_ok=True)
+    if spec is not None:
+        processed = conform_frame(processed, spec)
+        write_parquet(processed, processed_path, spec)
+    else:
+        processed.to_parquet(processed_path, index=False)
+    if previous is None:
+        previous = TransformState(
+            source=source, schema_version=schema_version, consumed=frozenset()
+        )
+    write_state(state_path(processed_path), previous.advance(new_keys))
+    return processed, added, replaced
@@ -2,17 +2,61 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
+from types import TracebackType
+from typing import Any
 
+from .. import codec
+from ..compression import compress, resolve, suffix_for
 from ..config import CartolaSettings, load_settings
 from ..endpoints import Endpoint
-from ..http_client import CartolaClient
+from ..http_client import AsyncCartolaClient, CartolaClient, FetchResult
+from .bronze import (
+    bronze_is_stale,
+    build_bronze,
+    has_extractor,
+    mark_bronze_stale,
+    write_bronze,
+)
+from .raw_delta import DELTA_ENDPOINTS, DeltaSnapshotStore
+from .raw_index import RawIndex, RawRecord
+from .raw_segments import SegmentWriter
+from .raw_store import (
+    ManifestEntry,
+    append_manifest,
+    content_hash,
+    rebuild_index,
+    store_object,
+)
 
 logger = logging.getLogger(__name__)
 
+# Serialise the one-off conversions of existing history (first indexed write
+# of a tree, first bronze write of an endpoint); concurrent writers wait for
+# them instead of racing them.
+_index_bootstrap_lock = threading.Lock()
+_bronze_bootstrap_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CollectResult:
+    """Outcome of one endpoint/round pair persisted by a batch collection."""
+
+    endpoint: Endpoint
+    rodada: int | None
+    path: Path | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
 
 def build_output_path(
     base_dir: Path,
@@ -20,15 +64,20 @@ def build_output_path(
     *,
     rodada: int | None,
     timestamp: datetime,
+    compression: str = "none",
 ) -> Path:
-    """Build target path for a raw payload file."""
+    """Build target path for a raw payload file.
+
+    ``compression`` appends ``.gz``/``.zst`` to the ``.json`` name.
+    """
     parts = [endpoint.name]
     if rodada is not None:
         parts.append(f"rodada={rodada:03d}")
     directory = base_dir.joinpath(*parts)
     directory.mkdir(parents=True, exist_ok=True)
     filename = timestamp.strftime("%Y%m%dT%H%M%SZ")
-    return directory / f"{filename}.json"
+    suffix = suffix_for(compression)
+    return directory / f"{filename}.json{suffix}"
 
 
 def collect_endpoint_payload(
@@ -40,28 +89,423 @@ def collect_endpoint_payload(
     base_dir: Path | None = None,
     timestamp: datetime | None = None,
     use_cache: bool = False,
+    writer: RawWriter | None = None,
 ) -> Path:
-    """Fetch endpoint payload and persist it to disk."""
+    """Fetch endpoint payload and persist it to disk.
+
+    Pass the run's ``writer`` when collecting many payloads so they share one
+    raw index connection instead of opening one per payload.
+    """
     active_settings = settings or load_settings()
     target_dir = base_dir or active_settings.raw_dir
     current_timestamp = (timestamp or datetime.now(UTC)).astimezone(UTC)
-    path = build_output_path(
-        target_dir,
-        endpoint,
-        rodada=rodada,
-        timestamp=current_timestamp,
+
+    owns_client = client is None
+    active_client = client or CartolaClient(
+        settings=active_settings, serve_stale=False
+    )
+
+    try:
+        if _raw_bytes_mode(active_settings):
+            payload = active_client.fetch_raw(
+                endpoint, rodada=rodada, use_cache=use_cache
+            )
+        else:
+            payload = active_client.fetch(
+                endpoint, rodada=rodada, use_cache=use_cache
+            )
+    finally:
+        if owns_client:
+            active_client.close()
+
+    if writer is not None:
+        return writer.store(endpoint, rodada, current_timestamp, payload)
+    return _store_once(
+        target_dir, active_settings, endpoint, rodada, current_timestamp, payload
     )
 
+
+def collect_endpoint_payloads(
+    requests: Iterable[tuple[Endpoint, int | None]],
+    *,
+    client: CartolaClient | None = None,
+    settings: CartolaSettings | None = None,
+    base_dir: Path | None = None,
+    timestamp: datetime | None = None,
+    use_cache: bool = False,
+    max_workers: int | None = None,
+    writer: RawWriter | None = None,
+) -> list[CollectResult]:
+    """Fetch and persist several endpoint/round pairs on a thread pool.
+
+    Each payload is written from the worker that fetched it, so disk writes
+    overlap with the remaining network I/O. Results keep the input order.
+    All workers share ``writer`` (one is opened for the batch by default).
+    """
+    active_settings = settings or load_settings()
+    target_dir = base_dir or active_settings.raw_dir
+    owns_writer = writer is None
+    active_writer = writer or RawWriter(target_dir, active_settings)
+    paths: dict[int, Path] = {}
+
+    def _persist(index: int, result: FetchResult) -> None:
+        current_timestamp = (timestamp or datetime.now(UTC)).astimezone(UTC)
+        paths[index] = active_writer.store(
+            result.endpoint, result.rodada, current_timestamp, result.payload
+        )
+
     owns_client = client is None
-    active_client = client or CartolaClient(settings=active_settings)
+    active_client = client or CartolaClient(
+        settings=active_settings, serve_stale=False
+    )
 
     try:
-        payload = active_client.fetch(endpoint, rodada=rodada, use_cache=use_cache)
+        fetched = active_client.fetch_many(
+            requests,
+            max_workers=max_workers,
+            use_cache=use_cache,
+            on_result=_persist,
+            as_bytes=_raw_bytes_mode(active_settings),
+        )
     finally:
+        if owns_writer:
+            active_writer.close()
         if owns_client:
             active_client.close()
 
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding='utf-8')
+    return [
+        CollectResult(
+            endpoint=item.endpoint,
+            rodada=item.rodada,
+            path=paths.get(index),
+            error=item.error,
+        )
+        for index, item in enumerate(fetched)
+    ]
+
+
+async def collect_endpoint_payload_async(
+    endpoint: Endpoint,
+    *,
+    rodada: int | None = None,
+    client: AsyncCartolaClient | None = None,
+    settings: CartolaSettings | None = None,
+    base_dir: Path | None = None,
+    timestamp: datetime | None = None,
+    use_cache: bool = False,
+    writer: RawWriter | None = None,
+) -> Path:
+    """Async variant of :func:`collect_endpoint_payload`."""
+    active_settings = settings or load_settings()
+    target_dir = base_dir or active_settings.raw_dir
+    current_timestamp = (timestamp or datetime.now(UTC)).astimezone(UTC)
+
+    owns_client = client is None
+    active_client = client or AsyncCartolaClient(
+        settings=active_settings, serve_stale=False
+    )
+
+    try:
+        if _raw_bytes_mode(active_settings):
+            payload = await active_client.fetch_raw(
+                endpoint, rodada=rodada, use_cache=use_cache
+            )
+        else:
+            payload = await active_client.fetch(
+                endpoint, rodada=rodada, use_cache=use_cache
+            )
+    finally:
+        if owns_client:
+            await active_client.aclose()
+
+    if writer is not None:
+        return await asyncio.to_thread(
+            writer.store, endpoint, rodada, current_timestamp, payload
+        )
+    return await asyncio.to_thread(
+        _store_once,
+        target_dir,
+        active_settings,
+        endpoint,
+        rodada,
+        current_timestamp,
+        payload,
+    )
+
+
+def _raw_bytes_mode(settings: CartolaSettings) -> bool:
+    return settings.raw_format == "bytes"
+
+
+class RawWriter:
+    """Writes payloads under ``target_dir`` following the raw settings.
+
+    Chooses between timestamped files, deduplicated objects and segment
+    files, applies the compression setting and appends every write to the raw
+    index. Deduplication only applies to the ``files`` layout. With
+    ``settings.raw_delta``, endpoints listed in ``DELTA_ENDPOINTS`` go to their
+    delta store instead. With ``settings.bronze`` the payload is also
+    flattened into the bronze layer.
+
+    One writer is meant to serve a whole collection run: :meth:`store` is
+    thread-safe, and the index connection (plus the one-off indexing of
+    payloads collected before the index existed) is shared by every job.
+    """
+
+    def __init__(self, target_dir: Path, settings: CartolaSettings) -> None:
+        self.target_dir = target_dir
+        self.settings = settings
+        self.compression = resolve(settings.raw_compression)
+        self.index: RawIndex | None = None
+        self.segments: dict[str, SegmentWriter] = {}
+        self.deltas: dict[str, DeltaSnapshotStore] = {}
+        self._lock = threading.Lock()
+        if settings.raw_index:
+            with _index_bootstrap_lock:
+                if not RawIndex.exists(target_dir) and target_dir.is_dir():
+                    # First indexed write: pick up payloads collected before.
+                    rebuild_index(target_dir)
+            self.index = RawIndex(target_dir)
+
+    def __enter__(self) -> RawWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def store(
+        self, endpoint: Endpoint, rodada: int | None, timestamp: datetime, payload: Any
+    ) -> Path:
+        if isinstance(payload, bytes):
+            document = payload
+        else:
+            document = codec.dumps(payload, indent=True)
+        offset = 0
+        member: str | None = None
+        delta = None
+        if self.settings.raw_delta and endpoint.name in DELTA_ENDPOINTS:
+            delta = self._append_delta(document, endpoint, rodada, timestamp, payload)
+        if delta is not None:
+            path, digest, size, member = delta
+        elif self.settings.raw_layout == "segments":
+            path, digest, size, offset = self._append_segment(
+                document, endpoint, rodada, timestamp
+            )
+        elif self.settings.raw_dedup:
+            path, digest, size = _write_deduplicated(
+                self.target_dir / endpoint.name,
+                document,
+                endpoint,
+                rodada,
+                timestamp,
+                self.compression,
+                self.settings.compression_level,
+            )
+        else:
+            path = build_output_path(
+                self.target_dir,
+                endpoint,
+                rodada=rodada,
+                timestamp=timestamp,
+                compression=self.compression,
+            )
+            size = _write_payload(
+                path,
+                document,
+                endpoint,
+                rodada,
+                self.compression,
+                self.settings.compression_level,
+            )
+            digest = content_hash(document)
+        if self.index is not None:
+            self.index.record(
+                RawRecord(
+                    endpoint=endpoint.name,
+                    rodada=rodada,
+                    collected_at=timestamp,
+                    path=path,
+                    size=size,
+                    content_hash=digest,
+                    byte_offset=offset,
+                    member=member,
+                )
+            )
+        if self.settings.bronze and has_extractor(endpoint.name):
+            self._write_bronze(endpoint, rodada, timestamp, payload, document)
+        return path
+
+    def _write_bronze(
+        self,
+        endpoint: Endpoint,
+        rodada: int | None,
+        timestamp: datetime,
+        payload: Any,
+        document: bytes,
+    ) -> None:
+        """Bronze failures mark the endpoint stale; the raw payload is safe.
+
+        A stale endpoint is converted again on its next bronze write.
+        """
+        bronze_dir = self.settings.bronze_dir
+        try:
+            with _bronze_bootstrap_lock:
+                if not (bronze_dir / endpoint.name).exists() or bronze_is_stale(
+                    bronze_dir, endpoint.name
+                ):
+                    # First bronze write, or one after a failure: convert the
+                    # history, this payload included. Nothing is deleted, so
+                    # payloads bronzed by other writers meanwhile are simply
+                    # rewritten.
+                    build_bronze(
+                        self.target_dir, bronze_dir, [endpoint.name], clear=False
+                    )
+                    return
+            write_bronze(
+                bronze_dir,
+                endpoint.name,
+                codec.loads(document) if isinstance(payload, bytes) else payload,
+                collected_at=timestamp,
+                rodada=rodada,
+            )
+        except (ValueError, KeyError, TypeError, AttributeError, OSError) as exc:
+            try:
+                mark_bronze_stale(bronze_dir, endpoint.name)
+            except OSError:
+                pass
+            logger.warning(
+                "bronze_write_failed",
+                extra={
+                    "event": "bronze_write_failed",
+                    "endpoint": endpoint.name,
+                    "rodada": rodada,
+                    "error": str(exc),
+                },
+            )
+
+    def _append_delta(
+        self,
+        document: bytes,
+        endpoint: Endpoint,
+        rodada: int | None,
+        timestamp: datetime,
+        payload: Any,
+    ) -> tuple[Path, str, int, str] | None:
+        """Returns ``None`` when the payload does not have the expected shape."""
+        with self._lock:
+            store = self.deltas.get(endpoint.name)
+            if store is None:
+                store = DeltaSnapshotStore.for_endpoint(
+                    self.target_dir / endpoint.name,
+                    keyframe_interval=self.settings.raw_delta_keyframe_interval,
+                )
+                self.deltas[endpoint.name] = store
+        try:
+            snapshot = store.append(
+                codec.loads(document) if isinstance(payload, bytes) else payload,
+                collected_at=timestamp,
+                rodada=rodada,
+                document=document,
+            )
+        except ValueError as exc:
+            logger.warning(
+                "raw_delta_unsupported_payload",
+                extra={
+                    "event": "raw_delta_unsupported_payload",
+                    "endpoint": endpoint.name,
+                    "rodada": rodada,
+                    "error": str(exc),
+                },
+            )
+            return None
+        logger.info(
+            "raw_payload_saved",
+            extra={
+                "event": "raw_payload_saved",
+                "endpoint": endpoint.name,
+                "rodada": rodada,
+                "path": str(store.path),
+                "bytes": snapshot.size,
+                "seq": snapshot.seq,
+                "changed": snapshot.changed,
+                "removed": snapshot.removed,
+                "keyframe": snapshot.is_keyframe,
+            },
+        )
+        return store.path, snapshot.content_hash, snapshot.size, str(snapshot.seq)
+
+    def _append_segment(
+        self,
+        document: bytes,
+        endpoint: Endpoint,
+        rodada: int | None,
+        timestamp: datetime,
+    ) -> tuple[Path, str, int, int]:
+        with self._lock:
+            writer = self.segments.get(endpoint.name)
+            if writer is None:
+                writer = SegmentWriter(
+                    self.target_dir / endpoint.name,
+                    max_bytes=self.settings.raw_segment_max_bytes,
+                    max_age=self.settings.raw_segment_max_age,
+                    compression_name=self.compression,
+                    compression_level=self.settings.compression_level,
+                )
+                self.segments[endpoint.name] = writer
+        path, record = writer.append(document, collected_at=timestamp, rodada=rodada)
+        logger.info(
+            "raw_payload_saved",
+            extra={
+                "event": "raw_payload_saved",
+                "endpoint": endpoint.name,
+                "rodada": rodada,
+                "path": str(path),
+                "bytes": record.size,
+                "offset": record.offset,
+            },
+        )
+        return path, record.content_hash, record.size, record.offset
+
+    def close(self) -> None:
+        for store in self.deltas.values():
+            store.close()
+        if self.index is not None:
+            self.index.close()
+
+
+def _store_once(
+    target_dir: Path,
+    settings: CartolaSettings,
+    endpoint: Endpoint,
+    rodada: int | None,
+    timestamp: datetime,
+    payload: Any,
+) -> Path:
+    with RawWriter(target_dir, settings) as writer:
+        return writer.store(endpoint, rodada, timestamp, payload)
+
+
+def _write_payload(
+    path: Path,
+    document: bytes,
+    endpoint: Endpoint,
+    rodada: int | None,
+    compression: str = "none",
+    compression_level: int = 0,
+) -> int:
+    """Write the JSON ``document``; bytes from ``fetch_raw`` arrive verbatim.
+
+    The document is compressed as a whole when ``compression`` is set, so the
+    decompressed file matches the uncompressed one byte for byte. Returns the
+    number of bytes written.
+    """
+    data = compress(document, compression, compression_level)
+    path.write_bytes(data)
     logger.info(
         "raw_payload_saved",
         extra={
@@ -69,7 +513,49 @@ def collect_endpoint_payload(
             "endpoint": endpoint.name,
             "rodada": rodada,
             "path": str(path),
+            "bytes": len(data),
         },
     )
-    return path
+    return len(data)
 
+
+def _write_deduplicated(
+    endpoint_dir: Path,
+    document: bytes,
+    endpoint: Endpoint,
+    rodada: int | None,
+    timestamp: datetime,
+    compression: str,
+    compression_level: int,
+) -> tuple[Path, str, int]:
+    """Store ``document`` once per content hash and record it in the manifest."""
+    path, digest, created = store_object(
+        endpoint_dir,
+        document,
+        compression_name=compression,
+        compression_level=compression_level,
+    )
+    size = path.stat().st_size
+    append_manifest(
+        endpoint_dir,
+        ManifestEntry(
+            collected_at=timestamp,
+            rodada=rodada,
+            content_hash=digest,
+            path=path,
+            size=size,
+        ),
+    )
+    logger.info(
+        "raw_payload_saved",
+        extra={
+            "event": "raw_payload_saved",
+            "endpoint": endpoint.name,
+            "rodada": rodada,
+            "path": str(path),
+            "bytes": size,
+            "content_hash": digest,
+            "deduplicated": not created,
+        },
+    )
+    return path, digest, size
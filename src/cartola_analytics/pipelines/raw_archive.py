@@ -0,0 +1,145 @@
+"""Zip archives holding the cold tier of the raw tree.
+
+Archived snapshots are moved from ``<endpoint>/...`` into
+``<endpoint>/archive/rodada=NNN.zip`` (or ``<YYYY-MM>.zip`` for payloads
+collected without a round). Members keep their path relative to the endpoint
+directory and their original bytes, so compressed payloads are stored as is.
+Each archive carries an ``index.jsonl`` member listing ``collected_at``,
+``rodada``, the content hash and the size of every payload, which lets the
+raw index be rebuilt without decompressing anything.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from .. import codec, compression
+
+ARCHIVE_DIR = "archive"
+ARCHIVE_SUFFIX = ".zip"
+INDEX_MEMBER = "index.jsonl"
+TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+
+
+@dataclass(frozen=True)
+class ArchivedPayload:
+    """One entry of an archive ``index.jsonl``."""
+
+    member: str
+    collected_at: datetime
+    rodada: int | None
+    content_hash: str
+    size: int
+
+    def to_json(self) -> bytes:
+        return codec.dumps(
+            {
+                "member": self.member,
+                "collected_at": self.collected_at.strftime(TIMESTAMP_FORMAT),
+                "rodada": self.rodada,
+                "hash": self.content_hash,
+                "bytes": self.size,
+            }
+        )
+
+
+def archive_name(rodada: int | None, collected_at: datetime) -> str:
+    if rodada is not None:
+        return f"rodada={rodada:03d}{ARCHIVE_SUFFIX}"
+    return f"{collected_at.astimezone(UTC):%Y-%m}{ARCHIVE_SUFFIX}"
+
+
+def archive_paths(endpoint_dir: Path) -> list[Path]:
+    directory = endpoint_dir / ARCHIVE_DIR
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob(f"*{ARCHIVE_SUFFIX}"))
+
+
+def _parse_index(data: bytes) -> list[ArchivedPayload]:
+    entries: list[ArchivedPayload] = []
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        item = codec.loads(line)
+        collected_at = datetime.strptime(item["collected_at"], TIMESTAMP_FORMAT)
+        entries.append(
+            ArchivedPayload(
+                member=item["member"],
+                collected_at=collected_at.replace(tzinfo=UTC),
+                rodada=item.get("rodada"),
+                content_hash=item["hash"],
+                size=int(item.get("bytes", 0)),
+            )
+        )
+    return entries
+
+
+def read_archive_index(path: Path) -> list[ArchivedPayload]:
+    with zipfile.ZipFile(path) as archive:
+        return _parse_index(archive.read(INDEX_MEMBER))
+
+
+def read_member(archive: zipfile.ZipFile, member: str) -> bytes:
+    """The uncompressed JSON document stored under ``member``."""
+    return compression.decompress(
+        archive.read(member), compression.algorithm_for(Path(member))
+    )
+
+
+def add_to_archive(
+    path: Path, payloads: list[tuple[ArchivedPayload, bytes]]
+) -> list[ArchivedPayload]:
+    """Add ``payloads`` (entry plus stored bytes) to the archive at ``path``.
+
+    The archive is rewritten next to the old one and swapped in atomically.
+    Members already present are kept as they are, so re-running after an
+    interrupted archive pass is harmless. Returns the entries added.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    existing: list[ArchivedPayload] = []
+    if path.exists():
+        existing = read_archive_index(path)
+    known = {entry.member for entry in existing}
+    added = [(entry, data) for entry, data in payloads if entry.member not in known]
+    if not added:
+        return []
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(tmp_name, "w") as target:
+            if existing:
+                with zipfile.ZipFile(path) as source:
+                    for entry in existing:
+                        target.writestr(
+                            source.getinfo(entry.member),
+                            source.read(entry.member),
+                        )
+            for entry, data in added:
+                already_compressed = compression.algorithm_for(Path(entry.member))
+                target.writestr(
+                    entry.member,
+                    data,
+                    compress_type=(
+                        zipfile.ZIP_STORED
+                        if already_compressed != "none"
+                        else zipfile.ZIP_DEFLATED
+                    ),
+                )
+            index = [entry for entry, _ in added]
+            target.writestr(
+                INDEX_MEMBER,
+                b"".join(entry.to_json() + b"\n" for entry in [*existing, *index]),
+                compress_type=zipfile.ZIP_DEFLATED,
+            )
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return [entry for entry, _ in added]
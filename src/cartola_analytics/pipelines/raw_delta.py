@@ -0,0 +1,416 @@
+"""Delta-encoded snapshot store for list-shaped endpoints.
+
+Polls of ``atletas_mercado`` repeat the same ~800 athletes with only a few of
+them changing price, status or scouts. Instead of a full document per poll,
+``<endpoint>/delta.sqlite3`` keeps:
+
+* ``snapshots``: one row per poll (time, round, hash of the document, and the
+  document frame and item order when they changed);
+* ``changes``: the items that differ from the previous poll (``NULL`` body
+  for removed items), written for every poll;
+* ``keyframe_items``: the full item set every ``keyframe_interval`` polls, so
+  rebuilding an old snapshot never replays more than one interval;
+* ``latest``: the current item set, which answers "latest state" directly.
+
+Items are compared by their encoded bytes, keyed by ``id_key``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from .. import codec
+
+DELTA_STORE_NAME = "delta.sqlite3"
+DEFAULT_KEYFRAME_INTERVAL = 96
+
+# endpoint -> (key of the item list, key of the item id)
+DELTA_ENDPOINTS: dict[str, tuple[str, str]] = {
+    "atletas_mercado": ("atletas", "atleta_id"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    seq INTEGER PRIMARY KEY,
+    collected_at REAL NOT NULL,
+    rodada INTEGER,
+    keyframe INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    frame BLOB,
+    ids BLOB,
+    changed INTEGER NOT NULL,
+    removed INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_time ON snapshots (collected_at);
+CREATE TABLE IF NOT EXISTS keyframe_items (
+    keyframe INTEGER NOT NULL,
+    item_id TEXT NOT NULL,
+    body BLOB NOT NULL,
+    PRIMARY KEY (keyframe, item_id)
+);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER NOT NULL,
+    item_id TEXT NOT NULL,
+    body BLOB,
+    PRIMARY KEY (seq, item_id)
+);
+CREATE INDEX IF NOT EXISTS changes_item ON changes (item_id, seq);
+CREATE TABLE IF NOT EXISTS latest (
+    item_id TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    seq INTEGER NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class DeltaSnapshot:
+    """Metadata of one stored poll."""
+
+    seq: int
+    collected_at: datetime
+    rodada: int | None
+    keyframe: int
+    content_hash: str
+    changed: int
+    removed: int
+    size: int
+
+    @property
+    def is_keyframe(self) -> bool:
+        return self.seq == self.keyframe
+
+
+@dataclass(frozen=True)
+class ItemChange:
+    """An item as it became at ``collected_at``; ``item`` is ``None`` if removed."""
+
+    seq: int
+    collected_at: datetime
+    item_id: str
+    item: dict[str, Any] | None
+
+
+def _timestamp(value: float) -> datetime:
+    return datetime.fromtimestamp(value, tz=UTC)
+
+
+class DeltaSnapshotStore:
+    """``delta.sqlite3`` of one endpoint directory."""
+
+    def __init__(
+        self,
+        endpoint_dir: Path,
+        *,
+        list_key: str,
+        id_key: str,
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+        busy_timeout: float = 30.0,
+    ) -> None:
+        endpoint_dir.mkdir(parents=True, exist_ok=True)
+        self.path = endpoint_dir / DELTA_STORE_NAME
+        self.list_key = list_key
+        self.id_key = id_key
+        self.keyframe_interval = max(keyframe_interval, 1)
+        self._lock = threading.Lock()
+        self._cursor: tuple[int, dict[str, bytes]] | None = None
+        self._conn = sqlite3.connect(
+            self.path,
+            timeout=busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def for_endpoint(
+        cls, endpoint_dir: Path, *, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL
+    ) -> DeltaSnapshotStore:
+        list_key, id_key = DELTA_ENDPOINTS[endpoint_dir.name]
+        return cls(
+            endpoint_dir,
+            list_key=list_key,
+            id_key=id_key,
+            keyframe_interval=keyframe_interval,
+        )
+
+    @staticmethod
+    def exists(endpoint_dir: Path) -> bool:
+        return (endpoint_dir / DELTA_STORE_NAME).exists()
+
+    def __enter__(self) -> DeltaSnapshotStore:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # -- writing -----------------------------------------------------------
+
+    def _split(self, payload: Any) -> tuple[bytes, list[Any], dict[str, bytes]]:
+        """Frame (document without items), item ids in order, encoded items."""
+        if not isinstance(payload, dict) or not isinstance(
+            payload.get(self.list_key), list
+        ):
+            raise ValueError(f"Payload sem a lista '{self.list_key}'")
+        ids: list[Any] = []
+        items: dict[str, bytes] = {}
+        for item in payload[self.list_key]:
+            if not isinstance(item, dict) or item.get(self.id_key) is None:
+                raise ValueError(f"Item sem o campo '{self.id_key}'")
+            ids.append(item[self.id_key])
+            items[str(item[self.id_key])] = codec.dumps(item)
+        frame = codec.dumps({**payload, self.list_key: None})
+        return frame, ids, items
+
+    def _last_value(self, column: str, seq: int | None = None) -> bytes | None:
+        query = f"SELECT {column} FROM snapshots WHERE {column} IS NOT NULL"
+        params: tuple[int, ...] = ()
+        if seq is not None:
+            query += " AND seq <= ?"
+            params = (seq,)
+        query += " ORDER BY seq DESC LIMIT 1"
+        row = self._conn.execute(query, params).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def append(
+        self,
+        payload: Any,
+        *,
+        collected_at: datetime,
+        rodada: int | None = None,
+        document: bytes | None = None,
+    ) -> DeltaSnapshot:
+        """Store one poll; ``document`` (the raw bytes) only feeds the hash.
+
+        Raises ``ValueError`` when ``payload`` is not a mapping holding a list
+        of items with ``id_key``.
+        """
+        frame, ids, items = self._split(payload)
+        digest = hashlib.sha256(document or codec.dumps(payload)).hexdigest()
+        ids_bytes = codec.dumps(ids)
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                previous = conn.execute(
+                    "SELECT seq, keyframe FROM snapshots ORDER BY seq DESC LIMIT 1"
+                ).fetchone()
+                current = dict(conn.execute("SELECT item_id, body FROM latest"))
+                upserts = {
+                    key: body
+                    for key, body in items.items()
+                    if current.get(key) != body
+                }
+                removed = [key for key in current if key not in items]
+                since_keyframe = (
+                    conn.execute(
+                        "SELECT count(*) FROM snapshots WHERE keyframe = ?",
+                        (previous[1],),
+                    ).fetchone()[0]
+                    if previous is not None
+                    else 0
+                )
+                is_keyframe = (
+                    previous is None or since_keyframe >= self.keyframe_interval
+                )
+                store_frame = is_keyframe or frame != self._last_value("frame")
+                store_ids = is_keyframe or ids_bytes != self._last_value("ids")
+                size = sum(len(body) for body in upserts.values())
+                if store_frame:
+                    size += len(frame)
+                if store_ids:
+                    size += len(ids_bytes)
+                if is_keyframe:
+                    size += sum(len(body) for body in items.values())
+                cursor = conn.execute(
+                    "INSERT INTO snapshots (collected_at, rodada, keyframe,"
+                    " content_hash, frame, ids, changed, removed, size)"
+                    " VALUES (?, ?, 0, ?, ?, ?, ?, ?, ?)",
+                    (
+                        collected_at.timestamp(),
+                        rodada,
+                        digest,
+                        frame if store_frame else None,
+                        ids_bytes if store_ids else None,
+                        len(upserts),
+                        len(removed),
+                        size,
+                    ),
+                )
+                seq = int(cursor.lastrowid or 0)
+                keyframe = seq if is_keyframe else int(previous[1])
+                conn.execute(
+                    "UPDATE snapshots SET keyframe = ? WHERE seq = ?", (keyframe, seq)
+                )
+                conn.executemany(
+                    "INSERT INTO changes (seq, item_id, body) VALUES (?, ?, ?)",
+                    [(seq, key, body) for key, body in upserts.items()]
+                    + [(seq, key, None) for key in removed],
+                )
+                if is_keyframe:
+                    conn.executemany(
+                        "INSERT INTO keyframe_items (keyframe, item_id, body)"
+                        " VALUES (?, ?, ?)",
+                        [(seq, key, body) for key, body in items.items()],
+                    )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO latest (item_id, body, seq)"
+                    " VALUES (?, ?, ?)",
+                    [(key, body, seq) for key, body in upserts.items()],
+                )
+                conn.executemany(
+                    "DELETE FROM latest WHERE item_id = ?", [(key,) for key in removed]
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return DeltaSnapshot(
+            seq=seq,
+            collected_at=collected_at,
+            rodada=rodada,
+            keyframe=keyframe,
+            content_hash=digest,
+            changed=len(upserts),
+            removed=len(removed),
+            size=size,
+        )
+
+    # -- reading -----------------------------------------------------------
+
+    def snapshots(self) -> list[DeltaSnapshot]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, collected_at, rodada, keyframe, content_hash, changed,"
+                " removed, size FROM snapshots ORDER BY seq"
+            ).fetchall()
+        return [
+            DeltaSnapshot(
+                seq=row[0],
+                collected_at=_timestamp(row[1]),
+                rodada=row[2],
+                keyframe=row[3],
+                content_hash=row[4],
+                changed=row[5],
+                removed=row[6],
+                size=row[7],
+            )
+            for row in rows
+        ]
+
+    def _seq_at(self, when: datetime) -> int | None:
+        row = self._conn.execute(
+            "SELECT max(seq) FROM snapshots WHERE collected_at <= ?",
+            (when.timestamp(),),
+        ).fetchone()
+        return None if row[0] is None else int(row[0])
+
+    def _apply_changes(self, state: dict[str, bytes], after: int, upto: int) -> None:
+        for key, body in self._conn.execute(
+            "SELECT item_id, body FROM changes WHERE seq > ? AND seq <= ?"
+            " ORDER BY seq",
+            (after, upto),
+        ):
+            if body is None:
+                state.pop(key, None)
+            else:
+                state[key] = bytes(body)
+
+    def _state(self, seq: int) -> dict[str, bytes]:
+        """Items at ``seq``, moving forward from the last state built if cheaper."""
+        row = self._conn.execute(
+            "SELECT keyframe FROM snapshots WHERE seq = ?", (seq,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(seq)
+        keyframe = int(row[0])
+        if self._cursor is not None and keyframe <= self._cursor[0] <= seq:
+            start, state = self._cursor[0], dict(self._cursor[1])
+        else:
+            start = keyframe
+            state = {
+                key: bytes(body)
+                for key, body in self._conn.execute(
+                    "SELECT item_id, body FROM keyframe_items WHERE keyframe = ?",
+                    (keyframe,),
+                )
+            }
+        self._apply_changes(state, start, seq)
+        self._cursor = (seq, state)
+        return state
+
+    def _assemble(self, seq: int, state: dict[str, bytes]) -> dict[str, Any]:
+        frame = self._last_value("frame", seq)
+        ids_bytes = self._last_value("ids", seq)
+        if frame is None or ids_bytes is None:  # pragma: no cover - defensive
+            raise KeyError(seq)
+        document: dict[str, Any] = codec.loads(frame)
+        ordered = [state[str(item_id)] for item_id in codec.loads(ids_bytes)]
+        document[self.list_key] = codec.loads(b"[" + b",".join(ordered) + b"]")
+        return document
+
+    def snapshot(self, seq: int) -> dict[str, Any]:
+        """The document stored as poll ``seq``."""
+        with self._lock:
+            return self._assemble(seq, self._state(seq))
+
+    def document(self, seq: int) -> bytes:
+        return codec.dumps(self.snapshot(seq))
+
+    def snapshot_at(self, when: datetime) -> dict[str, Any] | None:
+        """The document as of ``when`` (the last poll at or before it)."""
+        with self._lock:
+            seq = self._seq_at(when)
+            if seq is None:
+                return None
+            return self._assemble(seq, self._state(seq))
+
+    def latest(self) -> dict[str, Any] | None:
+        """Current document, read from the ``latest`` table without replaying."""
+        with self._lock:
+            row = self._conn.execute("SELECT max(seq) FROM snapshots").fetchone()
+            if row[0] is None:
+                return None
+            state = {
+                key: bytes(body)
+                for key, body in self._conn.execute("SELECT item_id, body FROM latest")
+            }
+            return self._assemble(int(row[0]), state)
+
+    def changes_since(self, since: datetime) -> list[ItemChange]:
+        """Every item change recorded after ``since``, in poll order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.seq, s.collected_at, c.item_id, c.body FROM changes AS c"
+                " JOIN snapshots AS s ON s.seq = c.seq"
+                " WHERE s.collected_at > ? ORDER BY c.seq, c.item_id",
+                (since.timestamp(),),
+            ).fetchall()
+        return [
+            ItemChange(
+                seq=seq,
+                collected_at=_timestamp(collected_at),
+                item_id=item_id,
+                item=None if body is None else codec.loads(body),
+            )
+            for seq, collected_at, item_id, body in rows
+        ]
@@ -0,0 +1,231 @@
+"""SQLite index of the raw tree so transforms can query instead of globbing."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from types import TracebackType
+
+INDEX_NAME = "raw_index.sqlite3"
+SCHEMA_VERSION = 1
+TIERS = ("hot", "archive")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS raw_files (
+    endpoint TEXT NOT NULL,
+    rodada INTEGER,
+    collected_at REAL NOT NULL,
+    path TEXT NOT NULL,
+    byte_offset INTEGER NOT NULL DEFAULT 0,
+    member TEXT NOT NULL DEFAULT '',
+    size INTEGER NOT NULL,
+    content_hash TEXT,
+    tier TEXT NOT NULL DEFAULT 'hot',
+    PRIMARY KEY (path, member, byte_offset, collected_at)
+);
+CREATE INDEX IF NOT EXISTS raw_files_endpoint_time
+    ON raw_files (endpoint, collected_at);
+CREATE INDEX IF NOT EXISTS raw_files_endpoint_rodada
+    ON raw_files (endpoint, rodada);
+"""
+
+
+@dataclass(frozen=True)
+class RawRecord:
+    """One collected payload: where it lives and when it was fetched.
+
+    ``content_hash`` is ``None`` for files indexed without reading them; the
+    reader hashes those on demand. ``byte_offset`` locates a record inside a
+    segment file and is ``0`` for standalone files. Archived payloads live in
+    the ``member`` of the zip at ``path`` and have ``tier="archive"``.
+    """
+
+    endpoint: str
+    rodada: int | None
+    collected_at: datetime
+    path: Path
+    size: int
+    content_hash: str | None = None
+    byte_offset: int = 0
+    member: str | None = None
+    tier: str = "hot"
+
+
+class RawIndex:
+    """``raw_index.sqlite3`` at the root of a raw tree.
+
+    Collectors append one row per payload written; paths are stored relative
+    to the root so the tree can be moved. WAL mode lets a transform read while
+    a collection is writing.
+    """
+
+    def __init__(self, raw_base: Path, *, busy_timeout: float = 30.0) -> None:
+        raw_base.mkdir(parents=True, exist_ok=True)
+        self.raw_base = raw_base
+        self.path = raw_base / INDEX_NAME
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path,
+            timeout=busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    @staticmethod
+    def exists(raw_base: Path) -> bool:
+        return (raw_base / INDEX_NAME).exists()
+
+    def __enter__(self) -> RawIndex:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def record(self, record: RawRecord) -> None:
+        self.record_many([record])
+
+    def record_many(self, records: Iterable[RawRecord]) -> int:
+        rows = [
+            (
+                record.endpoint,
+                record.rodada,
+                record.collected_at.timestamp(),
+                self._relative(record.path),
+                record.byte_offset,
+                record.member or "",
+                record.size,
+                record.content_hash,
+                record.tier,
+            )
+            for record in records
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO raw_files (endpoint, rodada, collected_at,"
+                " path, byte_offset, member, size, content_hash, tier)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def query(
+        self,
+        endpoint: str,
+        *,
+        rodada: int | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        tier: str | None = "hot",
+    ) -> list[RawRecord]:
+        """Records of ``endpoint``, oldest first.
+
+        ``since`` is inclusive and ``until`` exclusive; ``rodada`` keeps only
+        payloads collected for that round. ``tier=None`` includes archived
+        payloads.
+        """
+        clauses = ["endpoint = ?"]
+        params: list[object] = [endpoint]
+        if tier is not None:
+            clauses.append("tier = ?")
+            params.append(tier)
+        if rodada is not None:
+            clauses.append("rodada = ?")
+            params.append(rodada)
+        if since is not None:
+            clauses.append("collected_at >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            clauses.append("collected_at < ?")
+            params.append(until.timestamp())
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT endpoint, rodada, collected_at, path, byte_offset, member,"
+                " size, content_hash, tier FROM raw_files"
+                f" WHERE {' AND '.join(clauses)}"
+                " ORDER BY collected_at, path, member, byte_offset",
+                params,
+            ).fetchall()
+        return [
+            RawRecord(
+                endpoint=name,
+                rodada=round_id,
+                collected_at=datetime.fromtimestamp(collected_at, tz=UTC),
+                path=self.raw_base / path,
+                size=size,
+                content_hash=digest,
+                byte_offset=offset,
+                member=member or None,
+                tier=tier_name,
+            )
+            for (
+                name,
+                round_id,
+                collected_at,
+                path,
+                offset,
+                member,
+                size,
+                digest,
+                tier_name,
+            ) in rows
+        ]
+
+    def endpoints(self) -> dict[str, int]:
+        """Number of indexed payloads per endpoint."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT endpoint, count(*) FROM raw_files GROUP BY endpoint"
+            ).fetchall()
+        return dict(rows)
+
+    def forget(self, records: Iterable[RawRecord]) -> int:
+        """Drop the rows of ``records`` (for example after archiving them)."""
+        rows = [
+            (
+                self._relative(record.path),
+                record.member or "",
+                record.byte_offset,
+                record.collected_at.timestamp(),
+            )
+            for record in records
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM raw_files WHERE path = ? AND member = ?"
+                " AND byte_offset = ? AND collected_at = ?",
+                rows,
+            )
+        return len(rows)
+
+    def clear(self, endpoint: str | None = None) -> int:
+        with self._lock:
+            if endpoint is None:
+                cursor = self._conn.execute("DELETE FROM raw_files")
+            else:
+                cursor = self._conn.execute(
+                    "DELETE FROM raw_files WHERE endpoint = ?", (endpoint,)
+                )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.raw_base).as_posix()
+        except ValueError:
+            return path.as_posix()
@@ -0,0 +1,203 @@
+"""Retention rules and the hot-to-archive move of raw snapshots.
+
+Rules come from ``raw_source.retention`` in the schema YAML::
+
+    raw_source:
+      endpoint: partidas
+      retention:
+        hot_days: 30          # archive snapshots older than this
+        finished_rounds: true # archive rounds whose ``fim`` has passed
+
+Archived snapshots leave the hot tree, so transforms (which read the hot tier
+by default) stop scanning them, but they stay replayable through the raw
+index or :func:`load_raw_snapshots` with ``tier=None``.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from .. import compression
+from ..cache_policy import finished_rounds_from_payload
+from ..schema import load_schema, schema_dir
+from .raw_archive import ARCHIVE_DIR, ArchivedPayload, add_to_archive, archive_name
+from .raw_index import RawIndex, RawRecord
+from .raw_store import (
+    content_hash,
+    find_raw_records,
+    load_raw_snapshots,
+    scan_payload_files,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """When a snapshot of one endpoint moves from the hot tier to an archive."""
+
+    hot_days: float | None = None
+    finished_rounds: bool = False
+
+    def is_cold(
+        self, record: RawRecord, *, now: datetime, finished: set[int]
+    ) -> bool:
+        if self.hot_days is not None and record.collected_at <= now - timedelta(
+            days=self.hot_days
+        ):
+            return True
+        return (
+            self.finished_rounds
+            and record.rodada is not None
+            and record.rodada in finished
+        )
+
+
+def _parse_policy(name: str, rules: Any) -> RetentionPolicy:
+    if not isinstance(rules, dict):
+        raise ValueError(f"Regra de retencao invalida para {name}: {rules!r}")
+    hot_days = rules.get("hot_days")
+    try:
+        days = None if hot_days is None else float(hot_days)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(
+            f"Regra de retencao invalida para {name}: hot_days={hot_days!r}"
+        ) from exc
+    return RetentionPolicy(
+        hot_days=days, finished_rounds=bool(rules.get("finished_rounds", False))
+    )
+
+
+def retention_policies(*, base_dir: Path | None = None) -> dict[str, RetentionPolicy]:
+    """Policies declared in the schema YAMLs, keyed by raw endpoint."""
+    directory = base_dir / "docs" / "schemas" if base_dir else schema_dir()
+    policies: dict[str, RetentionPolicy] = {}
+    for path in sorted(directory.glob("*.yaml")):
+        spec = load_schema(path.stem, base_dir=base_dir)
+        rules = spec.raw_source.get("retention")
+        if rules is None:
+            continue
+        endpoint = spec.raw_source.get("endpoint", spec.name)
+        policies[endpoint] = _parse_policy(spec.name, rules)
+    return policies
+
+
+def finished_rounds(raw_base: Path, *, now: datetime | None = None) -> set[int]:
+    """Rounds already over according to the latest ``rodadas`` snapshot."""
+    records = find_raw_records(raw_base, "rodadas", tier=None)
+    if not records:
+        return set()
+    latest = load_raw_snapshots(
+        raw_base, "rodadas", since=records[-1].collected_at, tier=None
+    )
+    if not latest:
+        return set()
+    return finished_rounds_from_payload(latest[-1].payload, now=now)
+
+
+def _remove_empty_parents(path: Path, stop: Path) -> None:
+    for parent in path.parents:
+        if parent == stop or stop not in parent.parents:
+            return
+        try:
+            parent.rmdir()
+        except OSError:
+            return
+
+
+def _archive_group(
+    endpoint_dir: Path, target: Path, records: list[RawRecord]
+) -> list[RawRecord]:
+    payloads: list[tuple[ArchivedPayload, bytes]] = []
+    archived: list[RawRecord] = []
+    for record in records:
+        data = record.path.read_bytes()
+        document = compression.decompress(data, compression.algorithm_for(record.path))
+        entry = ArchivedPayload(
+            member=record.path.relative_to(endpoint_dir).as_posix(),
+            collected_at=record.collected_at,
+            rodada=record.rodada,
+            content_hash=content_hash(document),
+            size=len(data),
+        )
+        payloads.append((entry, data))
+        archived.append(
+            RawRecord(
+                endpoint=record.endpoint,
+                rodada=record.rodada,
+                collected_at=record.collected_at,
+                path=target,
+                size=entry.size,
+                content_hash=entry.content_hash,
+                member=entry.member,
+                tier="archive",
+            )
+        )
+    add_to_archive(target, payloads)
+    return archived
+
+
+def archive_raw(
+    raw_base: Path,
+    policies: Mapping[str, RetentionPolicy],
+    *,
+    endpoints: Iterable[str] | None = None,
+    now: datetime | None = None,
+) -> dict[str, int]:
+    """Move cold snapshots of ``endpoints`` into per-round zip archives.
+
+    Defaults to every endpoint with a policy. Only timestamped files are
+    archived; deduplicated objects and segments stay where they are. Returns
+    the number of snapshots archived per endpoint.
+    """
+    names = list(endpoints) if endpoints is not None else sorted(policies)
+    missing = [name for name in names if name not in policies]
+    if missing:
+        raise ValueError(f"Endpoint sem regra de retencao: {', '.join(missing)}")
+    reference = now or datetime.now(tz=UTC)
+    finished = (
+        finished_rounds(raw_base, now=reference)
+        if any(policies[name].finished_rounds for name in names)
+        else set()
+    )
+    index = RawIndex(raw_base) if RawIndex.exists(raw_base) else None
+    counts: dict[str, int] = {}
+    try:
+        for name in names:
+            endpoint_dir = raw_base / name
+            groups: dict[str, list[RawRecord]] = defaultdict(list)
+            for record in scan_payload_files(raw_base, name):
+                if policies[name].is_cold(record, now=reference, finished=finished):
+                    groups[archive_name(record.rodada, record.collected_at)].append(
+                        record
+                    )
+            counts[name] = 0
+            for archive_file, records in sorted(groups.items()):
+                target = endpoint_dir / ARCHIVE_DIR / archive_file
+                archived = _archive_group(endpoint_dir, target, records)
+                if index is not None:
+                    index.forget(records)
+                    index.record_many(archived)
+                for record in records:
+                    record.path.unlink()
+                    _remove_empty_parents(record.path, endpoint_dir)
+                counts[name] += len(records)
+                logger.info(
+                    "raw_archived",
+                    extra={
+                        "event": "raw_archived",
+                        "endpoint": name,
+                        "path": str(target),
+                        "snapshots": len(records),
+                    },
+                )
+    finally:
+        if index is not None:
+            index.close()
+    return counts
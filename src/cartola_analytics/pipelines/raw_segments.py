@@ -0,0 +1,300 @@
+"""Append-only segment files holding many raw payloads per endpoint.
+
+Instead of one file per snapshot, payloads are appended to
+``<endpoint>/segments/<seq>-<timestamp>.seg``; a new segment starts once the
+active one exceeds a size or age limit. Each record is length-prefixed::
+
+    >II header_length body_length | header (JSON) | body
+
+The header carries ``collected_at``, ``rodada``, the body ``compression``, the
+sha256 of the uncompressed document and a crc32 of the stored body. Record
+offsets go to the raw index for random access; the transforms read segments
+front to back.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import BinaryIO
+
+from .. import codec, compression
+
+logger = logging.getLogger(__name__)
+
+SEGMENTS_DIR = "segments"
+SEGMENT_SUFFIX = ".seg"
+TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+_LENGTHS = struct.Struct(">II")
+
+_append_lock = threading.Lock()
+
+
+class SegmentCorruptedError(ValueError):
+    """Raised when a record cannot be decoded at the requested offset."""
+
+
+@dataclass(frozen=True)
+class SegmentRecord:
+    """A record as stored in a segment; ``body`` is still compressed."""
+
+    offset: int
+    collected_at: datetime
+    rodada: int | None
+    content_hash: str
+    compression: str
+    body: bytes
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def document(self) -> bytes:
+        return compression.decompress(self.body, self.compression)
+
+
+def is_segment(path: Path) -> bool:
+    return path.suffix == SEGMENT_SUFFIX
+
+
+def segment_paths(endpoint_dir: Path) -> list[Path]:
+    directory = endpoint_dir / SEGMENTS_DIR
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+
+def _encode_record(
+    document: bytes,
+    *,
+    collected_at: datetime,
+    rodada: int | None,
+    compression_name: str,
+    compression_level: int,
+) -> tuple[bytes, str, bytes]:
+    body = compression.compress(document, compression_name, compression_level)
+    digest = hashlib.sha256(document).hexdigest()
+    header = codec.dumps(
+        {
+            "collected_at": collected_at.astimezone(UTC).strftime(TIMESTAMP_FORMAT),
+            "rodada": rodada,
+            "compression": compression_name,
+            "hash": digest,
+            "crc32": zlib.crc32(body),
+        }
+    )
+    return _LENGTHS.pack(len(header), len(body)) + header + body, digest, body
+
+
+def _read_at(handle: BinaryIO, offset: int) -> SegmentRecord | None:
+    """Decode the record at ``offset``; ``None`` at a clean end of file."""
+    handle.seek(offset)
+    prefix = handle.read(_LENGTHS.size)
+    if not prefix:
+        return None
+    if len(prefix) < _LENGTHS.size:
+        raise SegmentCorruptedError(f"Registro truncado no offset {offset}")
+    header_length, body_length = _LENGTHS.unpack(prefix)
+    header_bytes = handle.read(header_length)
+    body = handle.read(body_length)
+    if len(header_bytes) < header_length or len(body) < body_length:
+        raise SegmentCorruptedError(f"Registro truncado no offset {offset}")
+    try:
+        header = codec.loads(header_bytes)
+        collected_at = datetime.strptime(header["collected_at"], TIMESTAMP_FORMAT)
+    except (ValueError, KeyError, TypeError) as exc:
+        raise SegmentCorruptedError(
+            f"Cabecalho invalido no offset {offset}: {exc}"
+        ) from exc
+    if zlib.crc32(body) != header.get("crc32"):
+        raise SegmentCorruptedError(f"CRC divergente no offset {offset}")
+    return SegmentRecord(
+        offset=offset,
+        collected_at=collected_at.replace(tzinfo=UTC),
+        rodada=header.get("rodada"),
+        content_hash=str(header["hash"]),
+        compression=str(header.get("compression", "none")),
+        body=body,
+    )
+
+
+def read_record(handle: BinaryIO, offset: int) -> SegmentRecord:
+    """Random access to the record starting at ``offset``."""
+    record = _read_at(handle, offset)
+    if record is None:
+        raise SegmentCorruptedError(f"Nenhum registro no offset {offset}")
+    return record
+
+
+def iter_segment(path: Path) -> Iterator[SegmentRecord]:
+    """Stream the records of ``path`` in write order.
+
+    A damaged tail (for example a write cut short by a crash) ends the
+    iteration with a warning instead of failing the whole segment.
+    """
+    with path.open("rb") as handle:
+        offset = 0
+        while True:
+            try:
+                record = _read_at(handle, offset)
+            except SegmentCorruptedError as exc:
+                logger.warning(
+                    "raw_segment_corrupted",
+                    extra={
+                        "event": "raw_segment_corrupted",
+                        "path": str(path),
+                        "offset": offset,
+                        "error": str(exc),
+                    },
+                )
+                return
+            if record is None:
+                return
+            yield record
+            offset = handle.tell()
+
+
+def _intact_length(path: Path) -> int:
+    """Bytes of ``path`` up to the end of its last intact record."""
+    with path.open("rb") as handle:
+        offset = 0
+        while True:
+            try:
+                record = _read_at(handle, offset)
+            except SegmentCorruptedError:
+                return offset
+            if record is None:
+                return offset
+            offset = handle.tell()
+
+
+def _sequence(path: Path) -> int:
+    try:
+        return int(path.stem.split("-", 1)[0])
+    except ValueError:
+        return 0
+
+
+class SegmentWriter:
+    """Appends payloads to the active segment of one endpoint.
+
+    A segment is closed once it holds ``max_bytes`` or its first record is
+    ``max_age`` seconds older than the incoming one (``0`` disables either
+    limit). Each record goes out in a single ``O_APPEND`` write.
+
+    The active segment and its size are looked up once, on the first append.
+    If that segment ends in a torn record (a write cut short by a crash),
+    appending after it would hide every new record from readers, so the
+    writer starts a new segment instead.
+    """
+
+    def __init__(
+        self,
+        endpoint_dir: Path,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age: float = 86400.0,
+        compression_name: str = "none",
+        compression_level: int = 0,
+    ) -> None:
+        self.directory = endpoint_dir / SEGMENTS_DIR
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compression = compression_name
+        self.compression_level = compression_level
+        self._current: Path | None = None
+        self._size = 0
+        self._torn = False
+
+    def append(
+        self, document: bytes, *, collected_at: datetime, rodada: int | None
+    ) -> tuple[Path, SegmentRecord]:
+        data, digest, body = _encode_record(
+            document,
+            collected_at=collected_at,
+            rodada=rodada,
+            compression_name=self.compression,
+            compression_level=self.compression_level,
+        )
+        with _append_lock:
+            path = self._active_segment(collected_at)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, data)
+                self._size = os.lseek(fd, 0, os.SEEK_CUR)
+                offset = self._size - len(data)
+            finally:
+                os.close(fd)
+        record = SegmentRecord(
+            offset=offset,
+            collected_at=collected_at,
+            rodada=rodada,
+            content_hash=digest,
+            compression=self.compression,
+            body=body,
+        )
+        return path, record
+
+    def _active_segment(self, collected_at: datetime) -> Path:
+        if self._current is None:
+            self._current = self._last_segment()
+        current = self._current
+        if current is not None and not self._should_rotate(current, collected_at):
+            return current
+        stamp = collected_at.astimezone(UTC).strftime(TIMESTAMP_FORMAT)
+        sequence = _sequence(current) + 1 if current is not None else 1
+        path = self.directory / f"{sequence:06d}-{stamp}{SEGMENT_SUFFIX}"
+        if current is not None:
+            logger.info(
+                "raw_segment_rotated",
+                extra={
+                    "event": "raw_segment_rotated",
+                    "closed": str(current),
+                    "path": str(path),
+                },
+            )
+        self._current, self._size, self._torn = path, 0, False
+        return path
+
+    def _last_segment(self) -> Path | None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        existing = sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+        if not existing:
+            return None
+        last = existing[-1]
+        self._size = last.stat().st_size
+        intact = _intact_length(last)
+        if intact < self._size:
+            logger.warning(
+                "raw_segment_torn_tail",
+                extra={
+                    "event": "raw_segment_torn_tail",
+                    "path": str(last),
+                    "offset": intact,
+                },
+            )
+            self._torn = True
+        return last
+
+    def _should_rotate(self, path: Path, collected_at: datetime) -> bool:
+        if self._torn:
+            return True
+        if self.max_bytes > 0 and self._size >= self.max_bytes:
+            return True
+        if self.max_age <= 0:
+            return False
+        try:
+            started = datetime.strptime(
+                path.stem.split("-", 1)[1], TIMESTAMP_FORMAT
+            ).replace(tzinfo=UTC)
+        except (IndexError, ValueError):
+            return False
+        return (collected_at - started).total_seconds() >= self.max_age
@@ -0,0 +1,433 @@
+"""Content-addressed raw storage and the snapshot reader used by transforms.
+
+With deduplication enabled, each distinct payload is written once under
+``<endpoint>/objects/<aa>/<sha256>.json`` and every collection appends a line
+to ``<endpoint>/manifest.jsonl`` pointing at the object it produced. The hash
+is taken over the uncompressed JSON document, so switching compression does
+not break deduplication.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import zipfile
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from .. import codec, compression
+from .raw_archive import ARCHIVE_DIR, archive_paths, read_archive_index, read_member
+from .raw_delta import DELTA_ENDPOINTS, DELTA_STORE_NAME, DeltaSnapshotStore
+from .raw_index import RawIndex, RawRecord
+from .raw_segments import (
+    SEGMENTS_DIR,
+    is_segment,
+    iter_segment,
+    read_record,
+    segment_paths,
+)
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.jsonl"
+OBJECTS_DIR = "objects"
+TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+
+_manifest_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """One collection recorded in an endpoint manifest."""
+
+    collected_at: datetime
+    rodada: int | None
+    content_hash: str
+    path: Path
+    size: int
+
+    def to_json(self, endpoint_dir: Path) -> bytes:
+        return codec.dumps(
+            {
+                "collected_at": self.collected_at.strftime(TIMESTAMP_FORMAT),
+                "rodada": self.rodada,
+                "hash": self.content_hash,
+                "path": self.path.relative_to(endpoint_dir).as_posix(),
+                "bytes": self.size,
+            }
+        )
+
+
+@dataclass(frozen=True)
+class RawSnapshot:
+    """A payload as seen at one collection time.
+
+    Snapshots with the same content share a single decoded ``payload`` object,
+    so consumers must treat it as read-only.
+    """
+
+    collected_at: datetime
+    payload: Any
+    path: Path
+    content_hash: str
+    rodada: int | None = None
+
+
+def content_hash(document: bytes) -> str:
+    return hashlib.sha256(document).hexdigest()
+
+
+def object_path(endpoint_dir: Path, digest: str, compression_name: str) -> Path:
+    suffix = compression.suffix_for(compression_name)
+    return endpoint_dir / OBJECTS_DIR / digest[:2] / f"{digest}.json{suffix}"
+
+
+def store_object(
+    endpoint_dir: Path,
+    document: bytes,
+    *,
+    compression_name: str = "none",
+    compression_level: int = 0,
+) -> tuple[Path, str, bool]:
+    """Write ``document`` unless an identical one exists.
+
+    Returns ``(path, digest, created)``. An object already stored under another
+    compression is reused as is.
+    """
+    digest = content_hash(document)
+    for algorithm in (compression_name, *compression.ALGORITHMS):
+        existing = object_path(endpoint_dir, digest, algorithm)
+        if existing.exists():
+            return existing, digest, False
+    path = object_path(endpoint_dir, digest, compression_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = compression.compress(document, compression_name, compression_level)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return path, digest, True
+
+
+def append_manifest(endpoint_dir: Path, entry: ManifestEntry) -> None:
+    """Append ``entry`` as one JSON line (a single write per line)."""
+    line = entry.to_json(endpoint_dir) + b"\n"
+    with _manifest_lock, (endpoint_dir / MANIFEST_NAME).open("ab") as handle:
+        handle.write(line)
+
+
+def read_manifest(endpoint_dir: Path) -> list[ManifestEntry]:
+    path = endpoint_dir / MANIFEST_NAME
+    if not path.exists():
+        return []
+    entries: list[ManifestEntry] = []
+    for line in path.read_bytes().splitlines():
+        if not line.strip():
+            continue
+        item = codec.loads(line)
+        collected_at = datetime.strptime(item["collected_at"], TIMESTAMP_FORMAT)
+        entries.append(
+            ManifestEntry(
+                collected_at=collected_at.replace(tzinfo=UTC),
+                rodada=item.get("rodada"),
+                content_hash=item["hash"],
+                path=endpoint_dir / item["path"],
+                size=int(item.get("bytes", 0)),
+            )
+        )
+    return entries
+
+
+def _timestamp_from_name(path: Path) -> datetime:
+    try:
+        return datetime.strptime(
+            compression.payload_stem(path), TIMESTAMP_FORMAT
+        ).replace(tzinfo=UTC)
+    except ValueError:
+        return datetime.now(tz=UTC)
+
+
+def _rodada_from_parents(path: Path, endpoint_dir: Path) -> int | None:
+    for parent in path.relative_to(endpoint_dir).parents:
+        if parent.name.startswith("rodada="):
+            try:
+                return int(parent.name.split("=", 1)[1])
+            except ValueError:
+                return None
+    return None
+
+
+def scan_payload_files(raw_base: Path, endpoint: str) -> list[RawRecord]:
+    """Timestamped payload files of the hot tier, at any depth.
+
+    Deduplicated objects, segments and archives are left out.
+    """
+    endpoint_dir = raw_base / endpoint
+    if not endpoint_dir.is_dir():
+        return []
+    skipped = {(OBJECTS_DIR,), (SEGMENTS_DIR,), (ARCHIVE_DIR,)}
+    records: list[RawRecord] = []
+    for directory in sorted(
+        {endpoint_dir, *(path for path in endpoint_dir.rglob("*") if path.is_dir())}
+    ):
+        relative = directory.relative_to(endpoint_dir)
+        if relative.parts[:1] in skipped:
+            continue
+        for path in compression.payload_files(directory):
+            records.append(
+                RawRecord(
+                    endpoint=endpoint,
+                    rodada=_rodada_from_parents(path, endpoint_dir),
+                    collected_at=_timestamp_from_name(path),
+                    path=path,
+                    size=path.stat().st_size,
+                )
+            )
+    return records
+
+
+def scan_raw_records(raw_base: Path, endpoint: str) -> list[RawRecord]:
+    """Walk ``<raw_base>/<endpoint>`` the slow way (used to build the index).
+
+    Covers timestamped files at any depth (including ``rodada=NNN``
+    directories), the entries of a deduplication manifest, the records of
+    every segment file, the polls of a delta store and the payloads of the
+    archive tier.
+    """
+    endpoint_dir = raw_base / endpoint
+    if not endpoint_dir.is_dir():
+        return []
+    records = scan_payload_files(raw_base, endpoint)
+    for entry in read_manifest(endpoint_dir):
+        records.append(
+            RawRecord(
+                endpoint=endpoint,
+                rodada=entry.rodada,
+                collected_at=entry.collected_at,
+                path=entry.path,
+                size=entry.size,
+                content_hash=entry.content_hash,
+            )
+        )
+    for segment in segment_paths(endpoint_dir):
+        for item in iter_segment(segment):
+            records.append(
+                RawRecord(
+                    endpoint=endpoint,
+                    rodada=item.rodada,
+                    collected_at=item.collected_at,
+                    path=segment,
+                    size=item.size,
+                    content_hash=item.content_hash,
+                    byte_offset=item.offset,
+                )
+            )
+    if endpoint in DELTA_ENDPOINTS and DeltaSnapshotStore.exists(endpoint_dir):
+        with DeltaSnapshotStore.for_endpoint(endpoint_dir) as store:
+            for poll in store.snapshots():
+                records.append(
+                    RawRecord(
+                        endpoint=endpoint,
+                        rodada=poll.rodada,
+                        collected_at=poll.collected_at,
+                        path=store.path,
+                        size=poll.size,
+                        content_hash=poll.content_hash,
+                        member=str(poll.seq),
+                    )
+                )
+    for archive in archive_paths(endpoint_dir):
+        for archived in read_archive_index(archive):
+            records.append(
+                RawRecord(
+                    endpoint=endpoint,
+                    rodada=archived.rodada,
+                    collected_at=archived.collected_at,
+                    path=archive,
+                    size=archived.size,
+                    content_hash=archived.content_hash,
+                    member=archived.member,
+                    tier="archive",
+                )
+            )
+    records.sort(key=lambda record: record.collected_at)
+    return records
+
+
+def rebuild_index(raw_base: Path, endpoints: Iterable[str] | None = None) -> int:
+    """Re-create the index rows of ``endpoints`` (default: every directory).
+
+    Needed after files are copied into the tree by hand; collectors keep the
+    index current on their own.
+    """
+    names = (
+        list(endpoints)
+        if endpoints is not None
+        else sorted(
+            path.name
+            for path in raw_base.iterdir()
+            if path.is_dir() and not path.name.startswith((".", "_"))
+        )
+    )
+    with RawIndex(raw_base) as index:
+        total = 0
+        for name in names:
+            index.clear(name)
+            total += index.record_many(scan_raw_records(raw_base, name))
+    return total
+
+
+def find_raw_records(
+    raw_base: Path,
+    endpoint: str,
+    *,
+    rodada: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    tier: str | None = "hot",
+) -> list[RawRecord]:
+    """Query the index, or scan the tree when it has never indexed ``endpoint``.
+
+    Only the hot tier is returned unless ``tier`` says otherwise (``None``
+    for every tier).
+    """
+    if RawIndex.exists(raw_base):
+        with RawIndex(raw_base) as index:
+            if endpoint in index.endpoints():
+                return index.query(
+                    endpoint, rodada=rodada, since=since, until=until, tier=tier
+                )
+    return [
+        record
+        for record in scan_raw_records(raw_base, endpoint)
+        if (tier is None or record.tier == tier)
+        and (rodada is None or record.rodada == rodada)
+        and (since is None or record.collected_at >= since)
+        and (until is None or record.collected_at < until)
+    ]
+
+
+class _DocumentReader:
+    """Reads documents for :func:`load_raw_snapshots`.
+
+    Segment handles, archives and delta stores stay open while consecutive
+    records come from the same file, so a segment is streamed front to back
+    and a delta store replays each poll from the previous one.
+    """
+
+    def __init__(self) -> None:
+        self._path: Path | None = None
+        self._handle: BinaryIO | None = None
+        self._archive: zipfile.ZipFile | None = None
+        self._delta: DeltaSnapshotStore | None = None
+
+    def read(self, record: RawRecord) -> bytes:
+        if record.member is not None and record.path.name == DELTA_STORE_NAME:
+            if record.path != self._path or self._delta is None:
+                self.close()
+                if not record.path.exists():
+                    raise FileNotFoundError(record.path)
+                self._delta = DeltaSnapshotStore.for_endpoint(record.path.parent)
+                self._path = record.path
+            try:
+                return self._delta.document(int(record.member))
+            except KeyError as exc:
+                raise FileNotFoundError(record.member) from exc
+        if record.member is not None:
+            if record.path != self._path or self._archive is None:
+                self.close()
+                self._archive = zipfile.ZipFile(record.path)
+                self._path = record.path
+            try:
+                return read_member(self._archive, record.member)
+            except KeyError as exc:
+                raise FileNotFoundError(record.member) from exc
+        if not is_segment(record.path):
+            return compression.read_bytes(record.path)
+        if record.path != self._path or self._handle is None:
+            self.close()
+            self._handle = record.path.open("rb")
+            self._path = record.path
+        return read_record(self._handle, record.byte_offset).document()
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+        if self._archive is not None:
+            self._archive.close()
+        if self._delta is not None:
+            self._delta.close()
+        self._handle = None
+        self._archive = None
+        self._delta = None
+        self._path = None
+
+
+def load_raw_snapshots(
+    raw_base: Path,
+    endpoint: str,
+    *,
+    rodada: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    tier: str | None = "hot",
+) -> list[RawSnapshot]:
+    """Decoded payloads of ``endpoint``, oldest first.
+
+    Every distinct document is decoded once: records carrying a hash are not
+    even read again, the others are hashed before parsing. Index rows whose
+    file is gone are skipped with a warning. Archived payloads are only
+    replayed with ``tier="archive"`` or ``tier=None``.
+    """
+    records = find_raw_records(
+        raw_base, endpoint, rodada=rodada, since=since, until=until, tier=tier
+    )
+    return read_raw_snapshots(records)
+
+
+def read_raw_snapshots(records: Iterable[RawRecord]) -> list[RawSnapshot]:
+    """Decode the payloads of ``records`` (see :func:`load_raw_snapshots`)."""
+    decoded: dict[str, Any] = {}
+    snapshots: list[RawSnapshot] = []
+    reader = _DocumentReader()
+    try:
+        for record in records:
+            digest = record.content_hash
+            if digest is None or digest not in decoded:
+                try:
+                    document = reader.read(record)
+                except FileNotFoundError:
+                    logger.warning(
+                        "raw_index_missing_file",
+                        extra={
+                            "event": "raw_index_missing_file",
+                            "endpoint": record.endpoint,
+                            "path": str(record.path),
+                        },
+                    )
+                    continue
+                digest = digest or content_hash(document)
+                if digest not in decoded:
+                    decoded[digest] = codec.loads(document)
+            snapshots.append(
+                RawSnapshot(
+                    collected_at=record.collected_at,
+                    payload=decoded[digest],
+                    path=record.path,
+                    content_hash=digest,
+                    rodada=record.rodada,
+                )
+            )
+    finally:
+        reader.close()
+    return snapshots
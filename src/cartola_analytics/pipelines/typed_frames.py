@@ -0,0 +1,107 @@
+"""Frames and Parquet tables typed by the schema YAML.
+
+Records are transposed into one Arrow array per schema field, so ints with
+nulls stay ints (pandas ``Int64``), repetitive strings become ``category``
+(Arrow dictionaries) and nothing goes through object-column inference. Stage
+and processed Parquet files are written with :func:`arrow_schema`, so their
+column types are exactly the ones the YAML declares.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ..schema import FieldSpec, SchemaSpec, arrow_schema
+
+_PANDAS_TYPES: dict[pa.DataType, Any] = {
+    pa.int64(): pd.Int64Dtype(),
+    pa.float64(): pd.Float64Dtype(),
+}
+
+
+def _pandas_dtype(field: FieldSpec) -> Any:
+    if field.is_dictionary:
+        return "category"
+    if field.type == "int":
+        return pd.Int64Dtype()
+    if field.type == "bool":
+        return "boolean" if not field.required else bool
+    if field.type == "timestamp":
+        return "datetime64[ns, UTC]"
+    if field.type == "float":
+        return pd.Float64Dtype()
+    return object
+
+
+def _column(field: FieldSpec, values: list[Any]) -> pd.Series | list[Any]:
+    if field.type == "timestamp" and not all(
+        value is None or isinstance(value, datetime) for value in values
+    ):
+        # Raw date values (strings, epochs) are parsed later by the
+        # transform's ``coerce_frame``; Arrow would read epoch ints as ns.
+        return pd.Series(values, dtype=object)
+    array = pa.array(values, type=field.arrow_type())
+    return array.to_pandas(types_mapper=_PANDAS_TYPES.get)
+
+
+def records_frame(
+    records: Sequence[dict[str, Any]], spec: SchemaSpec
+) -> pd.DataFrame:
+    """Build a frame from ``records`` one typed column at a time.
+
+    Columns follow the schema order; keys the schema does not declare are
+    appended with pandas' own inference.
+    """
+    if not records:
+        return pd.DataFrame()
+    declared = {field.name for field in spec.fields}
+    columns: dict[str, Any] = {
+        field.name: _column(field, [record.get(field.name) for record in records])
+        for field in spec.fields
+    }
+    for name in records[0]:
+        if name not in declared:
+            columns[name] = pd.Series([record.get(name) for record in records])
+    return pd.DataFrame(columns)
+
+
+def conform_frame(frame: pd.DataFrame, spec: SchemaSpec) -> pd.DataFrame:
+    """Cast the declared columns of ``frame`` to their schema dtypes.
+
+    Used on frames that did not come from :func:`records_frame` (bronze
+    reads, merges of old and new rows).
+    """
+    if frame.empty:
+        return frame
+    casts = {
+        field.name: _pandas_dtype(field)
+        for field in spec.fields
+        if field.name in frame and field.type != "timestamp"
+    }
+    frame = frame.astype(casts)
+    for field in spec.fields:
+        if field.type == "timestamp" and field.name in frame:
+            frame[field.name] = pd.to_datetime(frame[field.name], utc=True)
+    return frame
+
+
+def to_table(frame: pd.DataFrame, spec: SchemaSpec) -> pa.Table:
+    """Arrow table of ``frame`` with the schema's exact column types."""
+    schema = arrow_schema(spec)
+    extra = [name for name in frame.columns if name not in schema.names]
+    if extra:
+        raise ValueError(f"Colunas fora do schema {spec.name}: {', '.join(extra)}")
+    return pa.Table.from_pandas(
+        conform_frame(frame, spec), schema=schema, preserve_index=False
+    )
+
+
+def write_parquet(frame: pd.DataFrame, path: Path, spec: SchemaSpec) -> None:
+    pq.write_table(to_table(frame, spec), path)
@@ -0,0 +1,155 @@
+"""Per-host token-bucket rate limiting and retry helpers for Cartola clients."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Callable, Mapping
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from .config import CartolaSettings
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second.
+
+    ``reserve`` never blocks: it books the next token and returns how long the
+    caller must wait before using it, so the same bucket serves threads and
+    asyncio tasks alike.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return the delay (seconds) before it is valid."""
+        with self._lock:
+            now = self._clock()
+            elapsed = max(now - self._updated, 0.0)
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now, 0.0)
+
+    def pause(self, seconds: float) -> None:
+        """Block every caller of this bucket for ``seconds`` (e.g. Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class RateLimiter:
+    """Keeps one :class:`TokenBucket` per host.
+
+    A ``rate`` of zero (or less) disables limiting for hosts without an
+    explicit override.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        *,
+        host_limits: Mapping[str, tuple[float, int]] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.host_limits = dict(host_limits or {})
+        self._clock = clock
+        self._buckets: dict[str, TokenBucket | None] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: CartolaSettings) -> RateLimiter:
+        return cls(
+            settings.rate_limit,
+            settings.rate_limit_burst,
+            host_limits=settings.rate_limit_hosts,
+        )
+
+    def bucket_for(self, url: str) -> TokenBucket | None:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                rate, burst = self.host_limits.get(host, (self.rate, self.burst))
+                self._buckets[host] = (
+                    TokenBucket(rate, burst, clock=self._clock) if rate > 0 else None
+                )
+            return self._buckets[host]
+
+    def reserve(self, url: str) -> float:
+        bucket = self.bucket_for(url)
+        return bucket.reserve() if bucket is not None else 0.0
+
+    def acquire(self, url: str) -> float:
+        """Block the current thread until a request to ``url`` may be sent."""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        """Asyncio variant of :meth:`acquire`."""
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def defer(self, url: str, seconds: float) -> None:
+        """Hold back every request to the host of ``url`` for ``seconds``."""
+        bucket = self.bucket_for(url)
+        if bucket is not None and seconds > 0:
+            bucket.pause(seconds)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header (delta-seconds or HTTP-date)."""
+    if value is None or not value.strip():
+        return None
+    text = value.strip()
+    try:
+        return max(float(text), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return max((moment - datetime.now(tz=UTC)).total_seconds(), 0.0)
+
+
+def decorrelated_jitter(
+    base: float,
+    previous: float,
+    cap: float,
+    *,
+    rng: Callable[[float, float], float] = random.uniform,
+) -> float:
+    """Return the next backoff using the "decorrelated jitter" strategy.
+
+    ``sleep = min(cap, uniform(base, previous * 3))`` keeps retries spread out
+    when many workers fail at the same time.
+    """
+    if base <= 0:
+        return 0.0
+    upper = max(previous * 3, base)
+    return float(min(cap, rng(base, upper)))
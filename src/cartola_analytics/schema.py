@@ -2,11 +2,21 @@
 from pathlib import Path
 from typing import Any
 
+import pyarrow as pa
 import yaml
 
 _BASE_DIR = Path(__file__).resolve().parents[2]
 _SCHEMA_DIR = _BASE_DIR / "docs" / "schemas"
 
+ARROW_TYPES: dict[str, pa.DataType] = {
+    "int": pa.int64(),
+    "float": pa.float64(),
+    "bool": pa.bool_(),
+    "string": pa.string(),
+    "timestamp": pa.timestamp("ns", tz="UTC"),
+}
+DICTIONARY_TYPE = pa.dictionary(pa.int32(), pa.string())
+
 
 @dataclass(frozen=True)
 class FieldSpec:
@@ -15,6 +25,27 @@ class FieldSpec:
     required: bool = False
     description: str | None = None
     enum: list[str] | None = None
+    dictionary: bool = False
+    source: str | list[str] | None = None
+    coerce: str | None = None
+    default: Any = None
+    fallback: str | None = None
+    labels: dict[Any, str] | None = None
+
+    @property
+    def is_dictionary(self) -> bool:
+        """Strings with few distinct values (``enum`` or ``dictionary: true``)."""
+        return self.type == "string" and (self.dictionary or self.enum is not None)
+
+    def arrow_type(self) -> pa.DataType:
+        if self.is_dictionary:
+            return DICTIONARY_TYPE
+        try:
+            return ARROW_TYPES[self.type]
+        except KeyError:
+            raise ValueError(
+                f"Tipo de campo desconhecido: {self.name} ({self.type})"
+            ) from None
 
 
 @dataclass(frozen=True)
@@ -50,6 +81,20 @@ def load_schema(schema_name: str, *, base_dir: Path | None = None) -> SchemaSpec
     )
 
 
+def arrow_schema(spec: SchemaSpec) -> pa.Schema:
+    """Compile the fields of ``spec`` into a pyarrow schema.
+
+    Fields that are not ``required`` are nullable; ints stay ``int64`` with
+    nulls and repetitive strings are dictionary-encoded.
+    """
+    return pa.schema(
+        [
+            pa.field(field.name, field.arrow_type(), nullable=not field.required)
+            for field in spec.fields
+        ]
+    )
+
+
 def schema_dir() -> Path:
     """Return the base directory where schemas are stored."""
     return _SCHEMA_DIR
@@ -0,0 +1,87 @@
+"""Request coalescing ("single-flight") helpers for Cartola clients."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from typing import Any
+
+
+class SingleFlight:
+    """Run at most one call per key at a time across threads.
+
+    Callers arriving while a call for the same key is in flight block until it
+    finishes and receive the same result (or exception).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future[Any]] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is True for followers."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if future is None:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            return future.result(), True
+        try:
+            result = fn()
+        except BaseException as err:
+            future.set_exception(err)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+class _LeaderCancelled(Exception):
+    """Set on a call whose leader was cancelled; its followers retry."""
+
+
+class AsyncSingleFlight:
+    """Asyncio counterpart of :class:`SingleFlight` for one event loop.
+
+    Cancelling the leader does not cancel its followers: the first of them
+    to wake up runs ``fn`` again as the new leader.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Future[Any]] = {}
+
+    async def do(
+        self, key: str, fn: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is True for followers."""
+        while (future := self._calls.get(key)) is not None:
+            try:
+                return await asyncio.shield(future), True
+            except _LeaderCancelled:
+                continue
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as err:
+            future.set_exception(err)
+            # Followers re-raise it; mark as retrieved so asyncio does not warn.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
@@ -0,0 +1,309 @@
+import json
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+import respx
+
+from cartola_analytics import CartolaClient, CartolaSettings, Endpoint
+from cartola_analytics.pipelines import (
+    collect_endpoint_payload,
+    collect_endpoint_payloads,
+    raw,
+    transform_clubes,
+    transform_mercado_status,
+    transform_partidas,
+    transform_rodadas,
+)
+from cartola_analytics.pipelines.bronze import (
+    NULL_PARTITION,
+    bronze_is_stale,
+    build_bronze,
+    read_bronze,
+    write_bronze,
+)
+from cartola_analytics.schema import arrow_schema, load_schema
+
+PAYLOADS: dict[str, list[dict[str, object]]] = {
+    "clubes": [
+        {"1": {"nome": "Alpha", "escudos": {}}, "2": {"nome": "Beta"}},
+        {"1": {"nome": "Alpha FC", "apelido": "Alf"}},
+    ],
+    "mercado_status": [
+        {
+            "temporada": 2025,
+            "rodada_atual": 1,
+            "rodada_final": 38,
+            "status_mercado": 1,
+        },
+        {
+            "temporada": 2025,
+            "rodada_atual": 2,
+            "rodada_final": 38,
+            "status_mercado": 2,
+            "fechamento": {"timestamp": 1758999600},
+        },
+    ],
+    "partidas": [
+        {
+            "rodada": 1,
+            "partidas": [
+                {
+                    "partida_id": 10,
+                    "clube_casa_id": 1,
+                    "clube_visitante_id": 2,
+                    "partida_data": "2025-04-01 16:00:00",
+                    "placar_oficial_mandante": 2,
+                }
+            ],
+        },
+        {
+            "rodada": 1,
+            "partidas": [
+                {
+                    "partida_id": 10,
+                    "clube_casa_id": 1,
+                    "clube_visitante_id": 2,
+                    "placar_oficial_mandante": None,
+                    "local": "Estadio",
+                }
+            ],
+        },
+    ],
+    "rodadas": [
+        {"rodadas": [{"rodada_id": 1, "nome_rodada": "Rodada 1"}]},
+        [
+            {"rodada_id": 1, "nome_rodada": "Rodada 1", "inicio": "2025-04-01"},
+            {"rodada_id": 2, "nome_rodada": "Rodada 2"},
+        ],
+    ],
+}
+
+TRANSFORMS = {
+    "clubes": transform_clubes,
+    "mercado_status": transform_mercado_status,
+    "partidas": transform_partidas,
+    "rodadas": transform_rodadas,
+}
+
+
+def _write_project(base_dir: Path) -> None:
+    schema_root = Path(__file__).resolve().parents[2] / "docs" / "schemas"
+    target = base_dir / "docs" / "schemas"
+    target.mkdir(parents=True, exist_ok=True)
+    for name in TRANSFORMS:
+        target.joinpath(f"{name}.yaml").write_text(
+            schema_root.joinpath(f"{name}.yaml").read_text(encoding="utf-8"),
+            encoding="utf-8",
+        )
+        raw_dir = base_dir / "data" / "raw" / name
+        raw_dir.mkdir(parents=True, exist_ok=True)
+        for hour, payload in enumerate(PAYLOADS[name]):
+            raw_dir.joinpath(f"20250401T{hour:02d}0000Z.json").write_text(
+                json.dumps(payload), encoding="utf-8"
+            )
+
+
+@pytest.mark.parametrize("name", sorted(TRANSFORMS))
+def test_transforms_read_the_same_rows_from_bronze(tmp_path: Path, name: str) -> None:
+    _write_project(tmp_path)
+    assert build_bronze(tmp_path / "data" / "raw", tmp_path / "data" / "bronze") == 8
+
+    transform = TRANSFORMS[name]
+    from_raw = transform(base_dir=tmp_path)
+    stage_raw = pd.read_parquet(from_raw["stage_path"])
+    processed_raw = pd.read_parquet(from_raw["processed_path"])
+    from_bronze = transform(base_dir=tmp_path, source="bronze")
+
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(from_bronze["stage_path"]), stage_raw
+    )
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(from_bronze["processed_path"]), processed_raw
+    )
+
+
+def test_transforms_require_a_bronze_dataset(tmp_path: Path) -> None:
+    _write_project(tmp_path)
+
+    with pytest.raises(FileNotFoundError):
+        transform_clubes(base_dir=tmp_path, source="bronze")
+    with pytest.raises(ValueError):
+        transform_clubes(base_dir=tmp_path, source="csv")
+
+
+def test_write_bronze_uses_hive_partitions(tmp_path: Path) -> None:
+    collected_at = datetime(2025, 4, 1, 12, tzinfo=UTC)
+
+    with_round = write_bronze(
+        tmp_path,
+        "partidas",
+        PAYLOADS["partidas"][0],
+        collected_at=collected_at,
+        rodada=1,
+    )
+    without_round = write_bronze(
+        tmp_path,
+        "clubes",
+        PAYLOADS["clubes"][0],
+        collected_at=collected_at,
+        rodada=None,
+    )
+
+    assert with_round == (
+        tmp_path
+        / "partidas"
+        / "rodada_coleta=1"
+        / "data_coleta=2025-04-01"
+        / "20250401T120000Z.parquet"
+    )
+    assert without_round is not None
+    assert without_round.parent.parent.name == f"rodada_coleta={NULL_PARTITION}"
+    assert pq.read_schema(with_round).equals(
+        arrow_schema(load_schema("partidas")), check_metadata=False
+    )
+    for endpoint in ("videos", "clubes"):
+        # No extractor for videos; an empty clubes mapping yields no records.
+        assert (
+            write_bronze(
+                tmp_path, endpoint, {}, collected_at=collected_at, rodada=None
+            )
+            is None
+        )
+
+
+@respx.mock
+def test_collectors_write_bronze_after_the_raw_payload(tmp_path: Path) -> None:
+    endpoint = Endpoint(name="clubes", url="https://example.com/clubes")
+    legacy = tmp_path / "raw" / "clubes" / "20250101T000000Z.json"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(json.dumps(PAYLOADS["clubes"][0]))
+    respx.get(endpoint.url).mock(
+        side_effect=[
+            httpx.Response(200, json=PAYLOADS["clubes"][1]),
+            httpx.Response(200, json=PAYLOADS["clubes"][1]),
+        ]
+    )
+    settings = CartolaSettings(
+        bronze=True, bronze_dir=tmp_path / "bronze", log_level="ERROR"
+    )
+
+    with CartolaClient(settings=settings, cache_dir=None, cache_ttl=0) as client:
+        for hour in (1, 2):
+            collect_endpoint_payload(
+                endpoint,
+                client=client,
+                settings=settings,
+                base_dir=tmp_path / "raw",
+                timestamp=datetime(2025, 1, 1, hour, tzinfo=UTC),
+            )
+
+    frame = read_bronze(tmp_path / "bronze", "clubes")
+    # The first bronze write converts the history collected before it.
+    assert frame["timestamp_coleta"].dt.hour.tolist() == [0, 0, 1, 2]
+    assert frame["nome"].tolist() == ["Alpha", "Beta", "Alpha FC", "Alpha FC"]
+
+
+@respx.mock
+def test_concurrent_collectors_bootstrap_bronze_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    endpoint = Endpoint(
+        name="clubes", url="https://example.com/clubes/{rodada}", requires_round=True
+    )
+    legacy = tmp_path / "raw" / "clubes" / "20250101T000000Z.json"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(json.dumps(PAYLOADS["clubes"][0]))
+    respx.get(url__startswith="https://example.com/clubes/").mock(
+        return_value=httpx.Response(200, json=PAYLOADS["clubes"][1])
+    )
+    settings = CartolaSettings(
+        bronze=True, bronze_dir=tmp_path / "bronze", log_level="ERROR"
+    )
+    builds: list[list[str]] = []
+
+    def _slow_build(*args: Any, **kwargs: Any) -> int:
+        builds.append(list(args[2]))
+        time.sleep(0.05)
+        return build_bronze(*args, **kwargs)
+
+    monkeypatch.setattr(raw, "build_bronze", _slow_build)
+
+    with CartolaClient(settings=settings, cache_dir=None, cache_ttl=0) as client:
+        results = collect_endpoint_payloads(
+            [(endpoint, rodada) for rodada in range(1, 9)],
+            client=client,
+            settings=settings,
+            base_dir=tmp_path / "raw",
+            timestamp=datetime(2025, 1, 1, 1, tzinfo=UTC),
+            max_workers=8,
+        )
+
+    assert all(result.ok for result in results)
+    assert builds == [["clubes"]]
+    frame = read_bronze(tmp_path / "bronze", "clubes")
+    # Two rows of history plus one per round; no payload lost to a rebuild.
+    assert len(frame) == 2 + 8
+
+
+@respx.mock
+def test_bronze_failures_do_not_fail_the_collection(tmp_path: Path) -> None:
+    endpoint = Endpoint(name="partidas", url="https://example.com/partidas")
+    respx.get(endpoint.url).mock(return_value=httpx.Response(200, json={"x": 1}))
+    settings = CartolaSettings(
+        bronze=True, bronze_dir=tmp_path / "bronze", log_level="ERROR"
+    )
+
+    with CartolaClient(settings=settings, cache_dir=None, cache_ttl=0) as client:
+        path = collect_endpoint_payload(
+            endpoint, client=client, settings=settings, base_dir=tmp_path / "raw"
+        )
+
+    assert path.exists()
+    assert read_bronze(tmp_path / "bronze", "partidas").empty
+
+
+@respx.mock
+def test_failed_bronze_writes_mark_the_endpoint_until_rebuilt(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    endpoint = Endpoint(name="clubes", url="https://example.com/clubes")
+    respx.get(endpoint.url).mock(
+        return_value=httpx.Response(200, json=PAYLOADS["clubes"][1])
+    )
+    settings = CartolaSettings(
+        bronze=True, bronze_dir=tmp_path / "bronze", log_level="ERROR"
+    )
+    bronze_dir = tmp_path / "bronze"
+
+    def _collect(hour: int) -> None:
+        with CartolaClient(settings=settings, cache_dir=None, cache_ttl=0) as client:
+            collect_endpoint_payload(
+                endpoint,
+                client=client,
+                settings=settings,
+                base_dir=tmp_path / "raw",
+                timestamp=datetime(2025, 1, 1, hour, tzinfo=UTC),
+            )
+
+    _collect(0)
+
+    def _fail(*args: Any, **kwargs: Any) -> None:
+        raise OSError("disco cheio")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(raw, "write_bronze", _fail)
+        _collect(1)
+    assert bronze_is_stale(bronze_dir, "clubes")
+    assert len(read_bronze(bronze_dir, "clubes")) == 1
+
+    # The next write converts the history again, the missed payload included.
+    _collect(2)
+    assert not bronze_is_stale(bronze_dir, "clubes")
+    frame = read_bronze(bronze_dir, "clubes")
+    assert frame["timestamp_coleta"].dt.hour.tolist() == [0, 1, 2]
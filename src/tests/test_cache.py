@@ -0,0 +1,312 @@
+import os
+import sqlite3
+import time
+
+import pytest
+
+from cartola_analytics import compression
+from cartola_analytics.cache import (
+    NOT_DECODED,
+    CacheEntry,
+    FileCacheStore,
+    MemoryCache,
+    SQLiteCacheStore,
+    open_cache_store,
+)
+
+
+def _entry(**overrides) -> CacheEntry:
+    data = {
+        "url": "https://example.com/clubes",
+        "endpoint": "clubes",
+        "body": b'{"ok": true}',
+        "stored_at": 100.0,
+        "etag": '"abc"',
+        "last_modified": None,
+    }
+    data.update(overrides)
+    return CacheEntry(**data)
+
+
+def test_file_cache_store_roundtrip_and_touch(tmp_path):
+    store = FileCacheStore(tmp_path)
+    store.put("key", _entry())
+
+    loaded = store.get("key")
+    assert loaded == _entry()
+    assert loaded.validators() == {"If-None-Match": '"abc"'}
+
+    store.touch("key", loaded, 200.0)
+    assert store.get("key").stored_at == 200.0
+    assert store.body_path("key").read_bytes() == b'{"ok": true}'
+
+
+def test_file_cache_store_drops_corrupted_metadata(tmp_path):
+    store = FileCacheStore(tmp_path)
+    store.put("key", _entry())
+    store.meta_path("key").write_text("{not json", encoding="utf-8")
+
+    assert store.get("key") is None
+    assert not store.body_path("key").exists()
+    assert not store.meta_path("key").exists()
+
+
+def test_file_cache_store_reclaims_bodies_without_sidecar(tmp_path):
+    legacy = tmp_path / "legacy.json"
+    legacy.write_text('{"timestamp": 1, "payload": {}}', encoding="utf-8")
+    store = FileCacheStore(tmp_path)
+    store.put("key", _entry(stored_at=time.time(), ttl=None))
+
+    stats = store.stats()
+    assert stats.entries == 2
+    assert stats.by_endpoint[FileCacheStore.orphan_endpoint] == (
+        1,
+        legacy.stat().st_size,
+    )
+    assert store.prune() == 1
+    assert not legacy.exists()
+    assert store.get("key") is not None
+
+    legacy.write_text('{"timestamp": 1, "payload": {}}', encoding="utf-8")
+    bounded = FileCacheStore(tmp_path, max_entries=2)
+    bounded.put("other", _entry(stored_at=time.time(), ttl=None))
+    assert not legacy.exists()
+    assert bounded.get("key") is not None
+
+
+def test_file_cache_store_compresses_bodies(tmp_path):
+    body = b'{"atletas": [' + b'{"atleta_id": 1},' * 500 + b"{}]}"
+    plain = FileCacheStore(tmp_path)
+    plain.put("old", _entry(body=b"[1]"))
+    store = FileCacheStore(tmp_path, compression="gzip", compression_level=9)
+    store.put("key", _entry(body=body))
+
+    path = store.body_path("key")
+    assert path.name == "key.json.gz"
+    assert len(path.read_bytes()) < len(body) / 10
+    assert store.get("key") == _entry(body=body)
+    assert store.stats().bytes < len(body)
+
+    # Entries written before compression was enabled remain readable.
+    old = store.get("old")
+    assert old.body == b"[1]"
+    store.touch("old", old, 200.0)
+    assert store.get("old") == _entry(body=b"[1]", stored_at=200.0)
+
+    store.put("old", _entry(body=b"[2]"))
+    assert not plain.body_path("old").exists()
+    assert plain.get("old").body == b"[2]"
+
+    store.delete("key")
+    assert not path.exists()
+
+
+def test_sqlite_cache_store_roundtrip_touch_and_delete(tmp_path):
+    store = SQLiteCacheStore(tmp_path)
+    store.put("key", _entry(ttl=60.0))
+
+    loaded = store.get("key")
+    assert loaded == _entry(ttl=60.0)
+    assert loaded.expires_at() == 160.0
+
+    store.touch("key", loaded, 200.0)
+    assert store.get("key").stored_at == 200.0
+
+    store.delete("key")
+    assert store.get("key") is None
+    store.close()
+
+
+def test_sqlite_cache_store_uses_wal_and_compresses_bodies(tmp_path):
+    store = SQLiteCacheStore(tmp_path)
+    body = b'{"atletas": [' + b'{"atleta_id": 1},' * 500 + b"{}]}"
+    store.put("key", _entry(body=body))
+    store.close()
+
+    with sqlite3.connect(tmp_path / SQLiteCacheStore.filename) as conn:
+        (mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+        (stored,) = conn.execute("SELECT length(body) FROM http_cache").fetchone()
+    assert mode == "wal"
+    assert stored < len(body) / 10
+
+
+def test_sqlite_cache_store_is_shared_between_connections(tmp_path):
+    writer = SQLiteCacheStore(tmp_path)
+    reader = SQLiteCacheStore(tmp_path)
+
+    writer.put("key", _entry())
+
+    assert reader.get("key") == _entry()
+    writer.close()
+    reader.close()
+
+
+def test_sqlite_cache_store_purges_expired_entries(tmp_path):
+    store = SQLiteCacheStore(tmp_path)
+    store.put("old", _entry(stored_at=0.0, ttl=10.0))
+    store.put("fresh", _entry(stored_at=100.0, ttl=10.0))
+    store.put("forever", _entry(stored_at=0.0, ttl=None))
+
+    assert store.purge_expired(now=50.0) == 1
+    assert store.get("old") is None
+    assert store.get("fresh") is not None
+    assert store.get("forever") is not None
+    store.close()
+
+
+def test_sqlite_cache_store_keeps_running_totals(tmp_path):
+    store = SQLiteCacheStore(tmp_path)
+    store.put("a", _entry(body=b"x" * 100))
+    store.put("b", _entry(body=b"y" * 10))
+    store.put("a", _entry(body=os.urandom(300)))
+    store.delete("b")
+    store.put("c", _entry(stored_at=0.0, ttl=1.0))
+    store.purge_expired()
+
+    with sqlite3.connect(tmp_path / SQLiteCacheStore.filename) as conn:
+        totals = conn.execute("SELECT entries, bytes FROM cache_totals").fetchone()
+        actual = conn.execute("SELECT count(*), sum(size) FROM http_cache").fetchone()
+    assert totals == actual
+    assert totals[0] == 1
+    store.close()
+
+
+def test_sqlite_cache_store_batches_last_access_writes(tmp_path):
+    store = SQLiteCacheStore(tmp_path)
+    store.put("a", _entry())
+    path = tmp_path / SQLiteCacheStore.filename
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE http_cache SET last_access = 0")
+
+    assert store.get("a") is not None
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT last_access FROM http_cache").fetchone() == (0,)
+
+    store.close()
+    with sqlite3.connect(path) as conn:
+        (last_access,) = conn.execute("SELECT last_access FROM http_cache").fetchone()
+    assert last_access > 0
+
+
+def test_sqlite_cache_store_drops_corrupted_body(tmp_path):
+    store = SQLiteCacheStore(tmp_path)
+    store.put("key", _entry())
+    with sqlite3.connect(store.path) as conn:
+        conn.execute("UPDATE http_cache SET body = x'00ff'")
+
+    assert store.get("key") is None
+    assert store.get("key") is None
+    store.close()
+
+
+def test_open_cache_store_selects_backend(tmp_path):
+    assert isinstance(open_cache_store("files", tmp_path), FileCacheStore)
+    sqlite_store = open_cache_store("sqlite", tmp_path)
+    assert isinstance(sqlite_store, SQLiteCacheStore)
+    sqlite_store.close()
+    with pytest.raises(ValueError):
+        open_cache_store("redis", tmp_path)
+
+
+def test_open_cache_store_falls_back_without_zstandard(tmp_path, monkeypatch):
+    monkeypatch.setattr(compression, "_zstandard", lambda: None)
+
+    files = open_cache_store("files", tmp_path, compression="zstd")
+    sqlite_store = open_cache_store("sqlite", tmp_path, compression="zstd")
+
+    assert files.compression == "gzip"
+    assert sqlite_store.compression == "zlib"
+    sqlite_store.close()
+
+
+@pytest.fixture(params=["files", "sqlite"])
+def store_factory(request, tmp_path):
+    stores = []
+
+    def _open(**limits):
+        store = open_cache_store(request.param, tmp_path, **limits)
+        stores.append(store)
+        return store
+
+    yield _open
+    for store in stores:
+        store.close()
+
+
+def test_store_evicts_least_recently_used_entry(store_factory):
+    store = store_factory(max_entries=2)
+    store.put("a", _entry(url="a", stored_at=1000.0))
+    store.put("b", _entry(url="b", stored_at=1000.0))
+    time.sleep(0.01)
+    assert store.get("a") is not None  # "b" becomes the LRU entry
+
+    store.put("c", _entry(url="c", stored_at=1000.0))
+
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert store.get("c") is not None
+
+
+def test_store_evicts_expired_entries_before_lru(store_factory):
+    now = time.time()
+    store = store_factory(max_entries=2)
+    store.put("expired", _entry(stored_at=now - 100, ttl=10.0))
+    store.put("fresh", _entry(stored_at=now, ttl=60.0))
+    store.get("expired")
+
+    store.put("new", _entry(stored_at=now, ttl=60.0))
+
+    assert store.get("expired") is None
+    assert store.get("fresh") is not None
+
+
+def test_store_respects_byte_budget(store_factory):
+    body = os.urandom(4096)  # incompressible, so both backends store ~4 KB
+    store = store_factory(max_bytes=len(body) * 2 + 500)
+    for key in ("a", "b", "c", "d"):
+        store.put(key, _entry(url=key, body=body, stored_at=time.time()))
+
+    stats = store.stats()
+    assert stats.entries <= 2
+    assert stats.bytes <= len(body) * 2 + 500
+    assert store.get("d") is not None
+
+
+def test_store_stats_prune_and_clear(store_factory):
+    now = time.time()
+    store = store_factory()
+    store.put("old", _entry(endpoint="clubes", stored_at=now - 100, ttl=10.0))
+    store.put("p1", _entry(endpoint="partidas", stored_at=now, ttl=60.0))
+    store.put("p2", _entry(endpoint="partidas", stored_at=now, ttl=None))
+    store.record_counters({"hits": 3, "misses": 1})
+    store.record_counters({"hits": 1, "revalidations": 1, "misses": 1})
+
+    stats = store.stats()
+    assert stats.entries == 3
+    assert stats.bytes > 0
+    assert stats.oldest == pytest.approx(now - 100)
+    assert stats.oldest_endpoint == "clubes"
+    assert stats.by_endpoint["partidas"][0] == 2
+    assert stats.counters == {"hits": 4, "stale": 0, "revalidations": 1, "misses": 2}
+    assert stats.hit_ratio == pytest.approx(5 / 7)
+
+    assert store.prune() == 1
+    assert store.clear("partidas") == 2
+    assert store.stats().entries == 0
+
+
+def test_memory_cache_is_bounded_by_bytes_and_lru():
+    memory = MemoryCache(max_bytes=10)
+    memory.put("a", _entry(body=b"aaaa"))
+    memory.put("b", _entry(body=b"bbbb"), payload={"b": 1})
+    assert memory.get("a") is not None  # "b" becomes the LRU item
+
+    memory.put("c", _entry(body=b"cccc"))
+
+    assert memory.get("b") is None
+    assert memory.get("a")[1] is NOT_DECODED
+    assert len(memory) == 2 and memory.bytes == 8
+
+    memory.put("huge", _entry(body=b"x" * 11))
+    assert memory.get("huge") is None
+    assert memory.bytes == 8
@@ -0,0 +1,55 @@
+from datetime import UTC, datetime
+
+from cartola_analytics import Endpoint
+from cartola_analytics.cache_policy import (
+    CachePolicy,
+    finished_rounds_from_payload,
+    resolve_cache_policy,
+)
+
+
+def test_resolve_cache_policy_uses_endpoint_overrides():
+    endpoint = Endpoint(
+        name="clubes",
+        url="https://example.com/clubes",
+        cache_ttl=30,
+        stale_while_revalidate=60,
+    )
+    policy = resolve_cache_policy(endpoint, None, default_ttl=600)
+
+    assert policy == CachePolicy(ttl=30, stale_while_revalidate=60)
+    assert policy.is_fresh(30) and not policy.is_fresh(31)
+    assert policy.serves_stale(90) and not policy.serves_stale(91)
+
+
+def test_resolve_cache_policy_marks_finished_rounds_immutable():
+    endpoint = Endpoint(
+        name="partidas_por_rodada",
+        url="https://example.com/partidas/{rodada}",
+        requires_round=True,
+        immutable_when_finished=True,
+    )
+
+    finished = resolve_cache_policy(
+        endpoint, 3, default_ttl=60, finished_rounds={1, 2, 3}
+    )
+    running = resolve_cache_policy(
+        endpoint, 4, default_ttl=60, finished_rounds={1, 2, 3}
+    )
+
+    assert finished.immutable and finished.is_fresh(10**9)
+    assert not running.immutable and running.ttl == 60
+
+
+def test_finished_rounds_from_payload():
+    payload = [
+        {"rodada_id": 1, "fim": "2025-03-31 20:00:00"},
+        {"rodada_id": 2, "fim": "2025-04-06T20:30:00Z"},
+        {"rodada_id": 3, "fim": "2025-12-01 20:00:00"},
+        {"rodada_id": 4},
+    ]
+    now = datetime(2025, 6, 1, tzinfo=UTC)
+
+    assert finished_rounds_from_payload(payload, now=now) == {1, 2}
+    assert finished_rounds_from_payload({"rodadas": payload}, now=now) == {1, 2}
+    assert finished_rounds_from_payload("invalid", now=now) == set()
@@ -0,0 +1,99 @@
+import logging
+
+import pytest
+
+from cartola_analytics.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    Circuit,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_circuit_opens_after_threshold_and_half_opens_after_cooldown():
+    clock = FakeClock()
+    circuit = Circuit(threshold=2, cooldown=10, clock=clock)
+
+    assert circuit.record_failure() is None
+    assert circuit.record_failure() == OPEN
+    assert circuit.allow() == (False, None)
+    assert circuit.retry_in() == 10
+
+    clock.now = 10
+    assert circuit.allow() == (True, HALF_OPEN)
+    # Only one probe is let through while half-open.
+    assert circuit.allow() == (False, None)
+    assert circuit.record_success() == CLOSED
+    assert circuit.allow() == (True, None)
+
+
+def test_failed_probe_reopens_circuit():
+    clock = FakeClock()
+    circuit = Circuit(threshold=1, cooldown=5, clock=clock)
+    circuit.record_failure()
+
+    clock.now = 6
+    assert circuit.allow() == (True, HALF_OPEN)
+    assert circuit.record_failure() == OPEN
+    assert circuit.retry_in() == 5
+
+
+def test_released_probe_lets_the_next_request_probe():
+    clock = FakeClock()
+    circuit = Circuit(threshold=1, cooldown=5, clock=clock)
+    circuit.record_failure()
+
+    clock.now = 5
+    assert circuit.allow() == (True, HALF_OPEN)
+    assert circuit.allow() == (False, None)
+    circuit.release()
+    assert circuit.state == HALF_OPEN
+    assert circuit.allow() == (True, None)
+
+
+def test_success_resets_consecutive_failures():
+    circuit = Circuit(threshold=2, cooldown=5, clock=FakeClock())
+    circuit.record_failure()
+    circuit.record_success()
+
+    assert circuit.record_failure() is None
+    assert circuit.state == CLOSED
+
+
+def test_breaker_is_per_host_and_logs_transitions(caplog):
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, cooldown=30, clock=clock)
+
+    with caplog.at_level(logging.INFO, logger="cartola_analytics.circuit_breaker"):
+        with pytest.raises(CircuitOpenError) as excinfo:
+            breaker.record_failure("https://a.example/x")
+        assert excinfo.value.host == "a.example"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request("https://a.example/y")
+        breaker.before_request("https://b.example/x")
+
+        clock.now = 30
+        breaker.before_request("https://a.example/x")
+        breaker.record_success("https://a.example/x")
+
+    events = [getattr(record, "event", None) for record in caplog.records]
+    assert events == ["circuit_open", "circuit_half_open", "circuit_closed"]
+    assert breaker.state("https://a.example/") == CLOSED
+
+
+def test_breaker_disabled_with_zero_threshold():
+    breaker = CircuitBreaker(threshold=0, cooldown=30)
+    for _ in range(10):
+        breaker.record_failure("https://a.example/x")
+    breaker.before_request("https://a.example/x")
+    assert breaker.circuit_for("https://a.example/x") is None
@@ -1,10 +1,11 @@
-from pathlib import Path
+﻿from pathlib import Path
 
 import httpx
 import pytest
 
 import cartola_analytics.cli as cli
-from cartola_analytics import CartolaSettings, Endpoint
+from cartola_analytics import CartolaSettings, CollectResult, Endpoint
+from cartola_analytics.pipelines.bronze import mark_bronze_stale
 
 
 @pytest.fixture(autouse=True)
@@ -81,16 +82,11 @@ def auto_transform_spy(monkeypatch):
 
         return _transform
 
-    monkeypatch.setattr(
-        cli,
-        "_AUTO_TRANSFORMERS",
-        {
-            "rodadas": make_transform("rodadas"),
-            "mercado_status": make_transform("mercado_status"),
-            "partidas": make_transform("partidas"),
-            "clubes": make_transform("clubes"),
-        },
-    )
+    transformers = {
+        name: make_transform(name)
+        for name in ("rodadas", "mercado_status", "partidas", "clubes")
+    }
+    monkeypatch.setattr(cli, "_auto_transformers", lambda: transformers)
     return calls
 
 
@@ -248,6 +244,22 @@ def test_cli_runs_transform_for_partidas(
     assert len(auto_transform_spy.get("partidas", [])) == 1
 
 
+def test_cli_auto_transforms_come_from_the_schema_yamls(monkeypatch):
+    monkeypatch.undo()  # drop the autouse spy
+    transformers = cli._auto_transformers()
+
+    # Every schema with raw_source.records runs after its endpoint is collected.
+    assert sorted(transformers) == [
+        "atletas_mercado",
+        "atletas_pontuados",
+        "clubes",
+        "mercado_status",
+        "partidas",
+        "pos_rodada_destaques",
+        "rodadas",
+    ]
+
+
 def test_cli_transform_failure_propagates(
     monkeypatch, fake_settings, capsys,
 ):
@@ -262,7 +274,7 @@ def test_cli_transform_failure_propagates(
     def boom(**_kwargs):
         raise ValueError("boom")
 
-    monkeypatch.setattr(cli, "_AUTO_TRANSFORMERS", {"rodadas": boom})
+    monkeypatch.setattr(cli, "_auto_transformers", lambda: {"rodadas": boom})
 
     exit_code = cli.main(["rodadas"])
     assert exit_code == 1
@@ -287,4 +299,215 @@ def test_cli_transform_uses_custom_output(
     exit_code = cli.main(["rodadas", "--output", str(out_dir)])
     assert exit_code == 0
     assert len(auto_transform_spy.get("rodadas", [])) == 1
-    assert auto_transform_spy["rodadas"][0]["raw_root"].resolve() == out_dir.resolve()
\ No newline at end of file
+    assert auto_transform_spy["rodadas"][0]["raw_root"].resolve() == out_dir.resolve()
+
+def test_cli_collect_concurrently(monkeypatch, fake_settings, fake_endpoints):
+    collected: list[tuple[str, int | None]] = []
+
+    class DummyAsyncClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *_args):
+            return None
+
+    async def fake_collect_async(endpoint, **kwargs):
+        rodada = kwargs.get("rodada")
+        if rodada == 2:
+            raise ValueError("payload invalido")
+        collected.append((endpoint.name, rodada))
+        return fake_settings.raw_dir / endpoint.name / "payload.json"
+
+    monkeypatch.setattr(cli, "AsyncCartolaClient", DummyAsyncClient)
+    async def fake_discover(*_args):
+        return [1, 2, 3]
+
+    monkeypatch.setattr(cli, "collect_endpoint_payload_async", fake_collect_async)
+    monkeypatch.setattr(cli, "_discover_all_rounds_async", fake_discover)
+
+    exit_code = cli.main(["--all", "--concurrency", "3"])
+
+    assert exit_code == 1
+    assert sorted(collected, key=lambda item: (item[0], item[1] or 0)) == [
+        ("clubes", None),
+        ("mercado_status", None),
+        ("partidas", None),
+        ("partidas_por_rodada", 1),
+        ("partidas_por_rodada", 3),
+        ("rodadas", None),
+    ]
+
+
+def test_cli_rejects_invalid_concurrency(fake_settings, fake_endpoints):
+    with pytest.raises(SystemExit):
+        cli.main(["clubes", "--concurrency", "0"])
+
+
+def test_cli_collect_with_thread_executor(monkeypatch, fake_settings, fake_endpoints):
+    received: dict[str, object] = {}
+
+    def fake_collect_many(jobs, **kwargs):
+        received["jobs"] = [(endpoint.name, rodada) for endpoint, rodada in jobs]
+        received["max_workers"] = kwargs["max_workers"]
+        request = httpx.Request("GET", "https://example.com/partidas/2")
+        response = httpx.Response(404, request=request)
+        error = httpx.HTTPStatusError("404", request=request, response=response)
+        return [
+            CollectResult(
+                endpoint=endpoint,
+                rodada=rodada,
+                path=None if rodada == 2 else fake_settings.raw_dir / "x.json",
+                error=error if rodada == 2 else None,
+            )
+            for endpoint, rodada in jobs
+        ]
+
+    monkeypatch.setattr(cli, "collect_endpoint_payloads", fake_collect_many)
+    monkeypatch.setattr(cli, "_discover_all_rounds", lambda *_args: [1, 2])
+
+    exit_code = cli.main(["--all", "--concurrency", "4", "--executor", "threads"])
+
+    assert exit_code == 1
+    assert received["max_workers"] == 4
+    assert received["jobs"] == [
+        ("clubes", None),
+        ("mercado_status", None),
+        ("partidas", None),
+        ("rodadas", None),
+        ("partidas_por_rodada", 1),
+        ("partidas_por_rodada", 2),
+    ]
+
+
+@pytest.mark.parametrize("backend", ["files", "sqlite"])
+def test_cli_cache_subcommands(
+    tmp_path, monkeypatch, capsys, fake_endpoints, backend
+):
+    from cartola_analytics.cache import CacheEntry, open_cache_store
+
+    settings = CartolaSettings(cache_dir=tmp_path / "cache", cache_backend=backend)
+    monkeypatch.setattr(cli, "load_settings", lambda: settings)
+    store = open_cache_store(backend, settings.cache_dir)
+    for key, endpoint, ttl in (
+        ("a", "clubes", 60.0),
+        ("b", "partidas", 60.0),
+        ("c", "partidas", -1.0),
+    ):
+        store.put(
+            key,
+            CacheEntry(
+                url=key, endpoint=endpoint, body=b"{}", stored_at=1e9, ttl=ttl
+            ),
+        )
+    store.record_counters({"hits": 3, "misses": 1})
+    store.close()
+
+    assert cli.main(["cache", "stats"]) == 0
+    output = capsys.readouterr().out
+    assert "entradas: 3" in output
+    assert "hit ratio: 75.0%" in output
+    assert "entrada mais antiga: 2001-09-09T01:46:40Z" in output
+
+    with pytest.raises(SystemExit):
+        cli.main(["cache", "clear", "--endpoint", "desconhecido"])
+    capsys.readouterr()
+    assert cli.main(["cache", "clear", "--endpoint", "clubes"]) == 0
+    assert capsys.readouterr().out.strip() == "1 entradas removidas"
+
+    # Every remaining entry expired long ago.
+    assert cli.main(["cache", "prune"]) == 0
+    assert capsys.readouterr().out.strip() == "2 entradas removidas"
+
+
+def test_cli_raw_reindex(tmp_path, monkeypatch, capsys, fake_settings):
+    round_dir = fake_settings.raw_dir / "partidas" / "rodada=001"
+    round_dir.mkdir(parents=True)
+    round_dir.joinpath("20250101T000000Z.json").write_text("{}")
+    fake_settings.raw_dir.joinpath("clubes").mkdir()
+    fake_settings.raw_dir.joinpath("clubes", "20250101T000000Z.json").write_text("{}")
+
+    assert cli.main(["raw", "reindex"]) == 0
+    assert capsys.readouterr().out.startswith("2 arquivos indexados")
+    assert cli.main(["raw", "reindex", "--endpoint", "clubes"]) == 0
+    assert capsys.readouterr().out.startswith("1 arquivos indexados")
+    assert cli.main(["raw", "reindex", "--output", str(tmp_path / "nada")]) == 1
+
+
+def test_cli_transforms_read_bronze_when_enabled(
+    monkeypatch, tmp_path, auto_transform_spy,
+):
+    settings = CartolaSettings(
+        cache_dir=tmp_path / "cache",
+        raw_dir=tmp_path / "data" / "raw",
+        bronze=True,
+        bronze_dir=tmp_path / "bronze",
+    )
+    monkeypatch.setattr(cli, "load_settings", lambda: settings)
+    endpoints = [Endpoint(name="clubes", url="https://example.com/clubes")]
+    monkeypatch.setattr(cli, "list_endpoints", lambda: endpoints)
+    monkeypatch.setattr(
+        cli,
+        "collect_endpoint_payload",
+        lambda endpoint, **kwargs: settings.raw_dir / "clubes" / "payload.json",
+    )
+
+    assert cli.main(["clubes"]) == 0
+    (call,) = auto_transform_spy["clubes"]
+    assert call["source"] == "bronze"
+    assert call["bronze_root"] == tmp_path / "bronze"
+
+    # After a failed bronze write the transform reads the raw payloads.
+    mark_bronze_stale(tmp_path / "bronze", "clubes")
+    assert cli.main(["clubes"]) == 0
+    assert "source" not in auto_transform_spy["clubes"][1]
+
+
+def test_cli_transform_options_reach_transforms(
+    monkeypatch, fake_settings, auto_transform_spy,
+):
+    endpoints = [Endpoint(name="clubes", url="https://example.com/clubes")]
+    monkeypatch.setattr(cli, "list_endpoints", lambda: endpoints)
+    monkeypatch.setattr(
+        cli,
+        "collect_endpoint_payload",
+        lambda endpoint, **kwargs: fake_settings.raw_dir / "clubes" / "payload.json",
+    )
+
+    argv = ["clubes", "--incremental", "--include-archived", "--transform-workers", "4"]
+    assert cli.main(argv) == 0
+    assert cli.main(["clubes"]) == 0
+    calls = auto_transform_spy["clubes"]
+    assert [
+        (call["incremental"], call["include_archived"], call["workers"])
+        for call in calls
+    ] == [(True, True, 4), (False, False, 1)]
+
+
+def test_cli_raw_bronze(tmp_path, capsys, fake_settings):
+    raw_dir = fake_settings.raw_dir / "clubes"
+    raw_dir.mkdir(parents=True)
+    raw_dir.joinpath("20250101T000000Z.json").write_text('{"1": {"nome": "A"}}')
+    bronze_dir = tmp_path / "bronze"
+
+    assert cli.main(["raw", "bronze", "--bronze-dir", str(bronze_dir)]) == 0
+    assert capsys.readouterr().out.startswith("1 snapshots convertidos")
+    assert len(list((bronze_dir / "clubes").rglob("*.parquet"))) == 1
+    assert cli.main(["raw", "bronze", "--endpoint", "videos"]) == 1
+
+
+def test_cli_raw_archive(tmp_path, capsys, fake_settings):
+    endpoint_dir = fake_settings.raw_dir / "videos"
+    endpoint_dir.mkdir(parents=True)
+    endpoint_dir.joinpath("20200101T000000Z.json").write_text("{}")
+
+    assert cli.main(["raw", "archive", "--endpoint", "videos"]) == 1
+    assert "sem regra de retencao" in capsys.readouterr().err
+    assert (
+        cli.main(["raw", "archive", "--endpoint", "videos", "--older-than", "30"])
+        == 0
+    )
+    assert capsys.readouterr().out.strip() == "videos: 1 snapshots arquivados"
+    assert (endpoint_dir / "archive" / "2020-01.zip").exists()
@@ -3,6 +3,7 @@ from pathlib import Path
 
 import pandas as pd
 
+from cartola_analytics import compression
 from cartola_analytics.pipelines import transform_clubes
 from cartola_analytics.schema import load_schema
 
@@ -92,4 +93,23 @@ def test_transform_clubes(tmp_path: Path) -> None:
     }
     assert processed_df.loc[processed_df["clube_id"] == 2, "apelido"].iloc[0] == "ABC"
     assert processed_df.loc[processed_df["clube_id"] == 3, "escudo_30x30"].iloc[0].endswith("def30.png")
-    assert processed_df["timestamp_coleta"].dt.tz is not None
\ No newline at end of file
+    assert processed_df["timestamp_coleta"].dt.tz is not None
+
+def test_transform_clubes_reads_compressed_payloads(tmp_path: Path) -> None:
+    _write_schema_copy(tmp_path)
+    raw_dir = tmp_path / "data" / "raw" / "clubes"
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    payload = {"1": {"nome": "OUT", "escudos": {}}}
+    _write_raw_payload(tmp_path, "20250925T020000Z.json", payload)
+    raw_dir.joinpath("20250925T030000Z.json.gz").write_bytes(
+        compression.compress(
+            json.dumps(payload | {"2": {"nome": "ABC"}}).encode(), "gzip"
+        )
+    )
+
+    result = transform_clubes(base_dir=tmp_path)
+
+    stage_df = pd.read_parquet(result["stage_path"])
+    assert result["rows_stage"] == 3
+    assert sorted(stage_df["timestamp_coleta"].dt.hour.unique()) == [2, 3]
+    assert result["rows_processed"] == 2
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from cartola_analytics import codec
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    previous = codec.backend_name()
+    yield
+    codec.use_backend(previous)
+
+
+@pytest.mark.parametrize("backend", codec.available_backends())
+def test_codec_round_trip(backend):
+    codec.use_backend(backend)
+    payload = {"nome": "São Paulo", "ids": [1, 2], "preco": 10.5, "ativo": None}
+
+    encoded = codec.dumps(payload)
+
+    assert isinstance(encoded, bytes)
+    assert "São".encode() in encoded
+    assert codec.loads(encoded) == payload
+    assert codec.loads(encoded.decode("utf-8")) == payload
+    assert codec.loads(memoryview(encoded)) == payload
+
+
+@pytest.mark.parametrize("backend", codec.available_backends())
+def test_codec_indent_matches_stdlib(backend):
+    codec.use_backend(backend)
+    payload = {"items": [1, {"a": "b"}]}
+
+    assert codec.dumps(payload, indent=True).decode("utf-8") == json.dumps(
+        payload, indent=2
+    )
+
+
+@pytest.mark.parametrize("backend", codec.available_backends())
+def test_codec_invalid_json_raises_value_error(backend):
+    codec.use_backend(backend)
+
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b"{broken")
+    with pytest.raises(ValueError):
+        codec.loads(b"\xff\xfe")
+
+
+def test_codec_read_json(tmp_path):
+    path = tmp_path / "payload.json"
+    path.write_bytes('{"clube": "Grêmio"}'.encode())
+
+    assert codec.read_json(path) == {"clube": "Grêmio"}
+
+
+def test_use_backend_rejects_unknown_name():
+    with pytest.raises(ValueError):
+        codec.use_backend("simdjson")
+
+    assert codec.use_backend("json") == "json"
+    assert codec.backend_name() == "json"
+    assert codec.use_backend("auto") in codec.available_backends()
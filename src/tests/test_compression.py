@@ -0,0 +1,63 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from cartola_analytics import codec, compression
+
+PAYLOAD = b'{"atletas":[{"atleta_id":1,"apelido":"Jo\xc3\xa3o"}]}' * 50
+
+
+@pytest.mark.parametrize("algorithm", ["none", "gzip", "zlib"])
+def test_compress_roundtrip(algorithm):
+    data = compression.compress(PAYLOAD, algorithm, level=9)
+
+    assert compression.decompress(data, algorithm) == PAYLOAD
+    if algorithm != "none":
+        assert len(data) < len(PAYLOAD)
+
+
+def test_gzip_output_is_deterministic():
+    first = compression.compress(PAYLOAD, "gzip")
+    second = compression.compress(PAYLOAD, "gzip")
+
+    assert first == second
+    assert gzip.decompress(first) == PAYLOAD
+
+
+def test_zstd_roundtrip():
+    pytest.importorskip("zstandard")
+    data = compression.compress(PAYLOAD, "zstd")
+
+    assert compression.decompress(data, "zstd") == PAYLOAD
+
+
+def test_zstd_missing_falls_back_to_gzip(monkeypatch):
+    monkeypatch.setattr(compression, "_zstandard", lambda: None)
+
+    assert compression.resolve("zstd") == "gzip"
+    assert compression.resolve("none") == "none"
+    with pytest.raises(ValueError, match="zstandard"):
+        compression.compress(PAYLOAD, "zstd")
+
+
+def test_decompress_rejects_damaged_payload():
+    with pytest.raises(ValueError):
+        compression.decompress(b"not gzip", "gzip")
+    with pytest.raises(ValueError):
+        compression.compress(PAYLOAD, "brotli")
+
+
+def test_read_json_detects_suffix(tmp_path: Path):
+    plain = tmp_path / "20250101T000000Z.json"
+    packed = tmp_path / "20250101T010000Z.json.gz"
+    plain.write_bytes(b'{"rodada": 1}')
+    packed.write_bytes(compression.compress(b'{"rodada": 2}', "gzip"))
+    tmp_path.joinpath("notes.txt").write_text("ignore")
+
+    assert compression.payload_files(tmp_path) == [plain, packed]
+    assert [compression.payload_stem(path) for path in (plain, packed)] == [
+        "20250101T000000Z",
+        "20250101T010000Z",
+    ]
+    assert codec.read_json(packed) == {"rodada": 2}
@@ -1,3 +1,7 @@
+from pathlib import Path
+
+import pytest
+
 from cartola_analytics import config
 
 
@@ -6,12 +10,43 @@ def test_load_settings_defaults(monkeypatch):
         "CARTOLA_TIMEOUT",
         "CARTOLA_MAX_RETRIES",
         "CARTOLA_BACKOFF_FACTOR",
+        "CARTOLA_BACKOFF_MAX",
+        "CARTOLA_RATE_LIMIT",
+        "CARTOLA_RATE_LIMIT_BURST",
+        "CARTOLA_RATE_LIMIT_HOSTS",
+        "CARTOLA_HTTP2",
+        "CARTOLA_MAX_CONNECTIONS",
+        "CARTOLA_MAX_KEEPALIVE_CONNECTIONS",
+        "CARTOLA_KEEPALIVE_EXPIRY",
+        "CARTOLA_CIRCUIT_THRESHOLD",
+        "CARTOLA_CIRCUIT_COOLDOWN",
+        "CARTOLA_CIRCUIT_SERVE_STALE",
         "CARTOLA_CACHE_TTL",
         "CARTOLA_CACHE_DIR",
+        "CARTOLA_CACHE_BACKEND",
+        "CARTOLA_CACHE_MAX_BYTES",
+        "CARTOLA_CACHE_MAX_ENTRIES",
+        "CARTOLA_MEMORY_CACHE_BYTES",
+        "CARTOLA_MEMORY_CACHE_POLICY",
+        "CARTOLA_CACHE_COMPRESSION",
+        "CARTOLA_COMPRESSION_LEVEL",
         "CARTOLA_USER_AGENT",
         "CARTOLA_ACCEPT",
         "CARTOLA_LOG_LEVEL",
         "CARTOLA_RAW_DIR",
+        "CARTOLA_RAW_FORMAT",
+        "CARTOLA_RAW_VALIDATE",
+        "CARTOLA_RAW_COMPRESSION",
+        "CARTOLA_RAW_DEDUP",
+        "CARTOLA_RAW_INDEX",
+        "CARTOLA_RAW_LAYOUT",
+        "CARTOLA_RAW_SEGMENT_MAX_BYTES",
+        "CARTOLA_RAW_SEGMENT_MAX_AGE",
+        "CARTOLA_RAW_DELTA",
+        "CARTOLA_RAW_DELTA_KEYFRAME_INTERVAL",
+        "CARTOLA_BRONZE",
+        "CARTOLA_BRONZE_DIR",
+        "CARTOLA_JSON_BACKEND",
         "CARTOLA_LOG_FILE",
     ]
     for key in keys:
@@ -22,6 +57,39 @@ def test_load_settings_defaults(monkeypatch):
     assert settings.timeout == config.DEFAULT_TIMEOUT
     assert settings.max_retries == config.DEFAULT_MAX_RETRIES
     assert settings.backoff_factor == config.DEFAULT_BACKOFF_FACTOR
+    assert settings.backoff_max == config.DEFAULT_BACKOFF_MAX
+    assert settings.rate_limit == config.DEFAULT_RATE_LIMIT
+    assert settings.rate_limit_burst == config.DEFAULT_RATE_LIMIT_BURST
+    assert settings.rate_limit_hosts == {}
+    assert settings.http2 == config.DEFAULT_HTTP2
+    assert settings.max_connections == config.DEFAULT_MAX_CONNECTIONS
+    assert settings.max_keepalive_connections == (
+        config.DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+    )
+    assert settings.keepalive_expiry == config.DEFAULT_KEEPALIVE_EXPIRY
+    assert settings.circuit_threshold == config.DEFAULT_CIRCUIT_THRESHOLD
+    assert settings.circuit_cooldown == config.DEFAULT_CIRCUIT_COOLDOWN
+    assert settings.circuit_serve_stale is True
+    assert settings.cache_backend == "files"
+    assert settings.cache_max_bytes == config.DEFAULT_CACHE_MAX_BYTES
+    assert settings.cache_max_entries == 0
+    assert settings.memory_cache_bytes == 0
+    assert settings.memory_cache_policy == "copy"
+    assert settings.cache_compression == "none"
+    assert settings.compression_level == 0
+    assert settings.raw_format == "pretty"
+    assert settings.raw_validate is True
+    assert settings.raw_compression == "none"
+    assert settings.raw_dedup is False
+    assert settings.raw_index is False
+    assert settings.raw_layout == "files"
+    assert settings.raw_segment_max_bytes == config.DEFAULT_RAW_SEGMENT_MAX_BYTES
+    assert settings.raw_segment_max_age == config.DEFAULT_RAW_SEGMENT_MAX_AGE
+    assert settings.raw_delta is False
+    assert settings.raw_delta_keyframe_interval == 96
+    assert settings.bronze is False
+    assert settings.bronze_dir == config.DEFAULT_BRONZE_DIR
+    assert settings.json_backend == "auto"
     assert settings.cache_ttl == config.DEFAULT_CACHE_TTL
     assert settings.cache_dir == config.DEFAULT_CACHE_DIR
     assert settings.raw_dir == config.DEFAULT_RAW_DIR
@@ -66,3 +134,122 @@ def test_load_settings_allows_disabling_cache(monkeypatch):
 
     assert settings.cache_dir is None
     assert config.CartolaSettings().cache_dir == config.DEFAULT_CACHE_DIR
+
+
+def test_load_settings_rate_limit_hosts(monkeypatch):
+    monkeypatch.setenv("CARTOLA_RATE_LIMIT", "3")
+    monkeypatch.setenv("CARTOLA_RATE_LIMIT_BURST", "6")
+    monkeypatch.setenv(
+        "CARTOLA_RATE_LIMIT_HOSTS",
+        "api.cartola.globo.com=8:16, api.cartolafc.globo.com=1",
+    )
+
+    settings = config.load_settings()
+
+    assert settings.rate_limit == 3.0
+    assert settings.rate_limit_burst == 6
+    assert settings.rate_limit_hosts == {
+        "api.cartola.globo.com": (8.0, 16),
+        "api.cartolafc.globo.com": (1.0, config.DEFAULT_RATE_LIMIT_BURST),
+    }
+
+
+def test_load_settings_connection_pool(monkeypatch):
+    monkeypatch.setenv("CARTOLA_HTTP2", "true")
+    monkeypatch.setenv("CARTOLA_MAX_CONNECTIONS", "8")
+    monkeypatch.setenv("CARTOLA_MAX_KEEPALIVE_CONNECTIONS", "4")
+    monkeypatch.setenv("CARTOLA_KEEPALIVE_EXPIRY", "12.5")
+
+    settings = config.load_settings()
+
+    assert settings.http2 is True
+    assert settings.max_connections == 8
+    assert settings.max_keepalive_connections == 4
+    assert settings.keepalive_expiry == 12.5
+
+
+def test_load_settings_raw_format(monkeypatch):
+    monkeypatch.setenv("CARTOLA_RAW_FORMAT", "Bytes")
+    monkeypatch.setenv("CARTOLA_RAW_VALIDATE", "false")
+
+    settings = config.load_settings()
+
+    assert settings.raw_format == "bytes"
+    assert settings.raw_validate is False
+
+    monkeypatch.setenv("CARTOLA_JSON_BACKEND", "JSON")
+    assert config.load_settings().json_backend == "json"
+
+    monkeypatch.setenv("CARTOLA_RAW_FORMAT", "yaml")
+    with pytest.raises(ValueError):
+        config.load_settings()
+
+
+def test_load_settings_circuit_breaker(monkeypatch):
+    monkeypatch.setenv("CARTOLA_CIRCUIT_THRESHOLD", "3")
+    monkeypatch.setenv("CARTOLA_CIRCUIT_COOLDOWN", "12")
+    monkeypatch.setenv("CARTOLA_CIRCUIT_SERVE_STALE", "no")
+
+    settings = config.load_settings()
+
+    assert settings.circuit_threshold == 3
+    assert settings.circuit_cooldown == 12.0
+    assert settings.circuit_serve_stale is False
+
+
+def test_load_settings_cache_backend(monkeypatch):
+    monkeypatch.setenv("CARTOLA_CACHE_BACKEND", "sqlite")
+    monkeypatch.setenv("CARTOLA_CACHE_MAX_BYTES", "1048576")
+    monkeypatch.setenv("CARTOLA_CACHE_MAX_ENTRIES", "500")
+    settings = config.load_settings()
+    assert settings.cache_backend == "sqlite"
+    assert settings.cache_max_bytes == 1048576
+    assert settings.cache_max_entries == 500
+
+    monkeypatch.setenv("CARTOLA_CACHE_BACKEND", "redis")
+    with pytest.raises(ValueError):
+        config.load_settings()
+
+
+def test_load_settings_memory_cache(monkeypatch):
+    monkeypatch.setenv("CARTOLA_MEMORY_CACHE_BYTES", "4194304")
+    monkeypatch.setenv("CARTOLA_MEMORY_CACHE_POLICY", "shared")
+
+    settings = config.load_settings()
+
+    assert settings.memory_cache_bytes == 4194304
+    assert settings.memory_cache_policy == "shared"
+
+
+def test_load_settings_raw_storage(monkeypatch):
+    monkeypatch.setenv("CARTOLA_CACHE_COMPRESSION", "zstd")
+    monkeypatch.setenv("CARTOLA_RAW_COMPRESSION", "GZIP")
+    monkeypatch.setenv("CARTOLA_COMPRESSION_LEVEL", "9")
+    monkeypatch.setenv("CARTOLA_RAW_DEDUP", "true")
+    monkeypatch.setenv("CARTOLA_RAW_INDEX", "true")
+    monkeypatch.setenv("CARTOLA_RAW_LAYOUT", "segments")
+    monkeypatch.setenv("CARTOLA_RAW_SEGMENT_MAX_BYTES", "1048576")
+    monkeypatch.setenv("CARTOLA_RAW_SEGMENT_MAX_AGE", "3600")
+    monkeypatch.setenv("CARTOLA_RAW_DELTA", "1")
+    monkeypatch.setenv("CARTOLA_RAW_DELTA_KEYFRAME_INTERVAL", "12")
+    monkeypatch.setenv("CARTOLA_BRONZE", "true")
+    monkeypatch.setenv("CARTOLA_BRONZE_DIR", "/tmp/bronze")
+
+    settings = config.load_settings()
+
+    assert settings.cache_compression == "zstd"
+    assert settings.raw_compression == "gzip"
+    assert settings.compression_level == 9
+    assert settings.raw_dedup is True
+    assert settings.raw_index is True
+    assert settings.raw_layout == "segments"
+    assert settings.raw_segment_max_bytes == 1048576
+    assert settings.raw_segment_max_age == 3600.0
+    assert settings.raw_delta is True
+    assert settings.raw_delta_keyframe_interval == 12
+    assert settings.bronze is True
+    assert settings.bronze_dir == Path("/tmp/bronze")
+
+    monkeypatch.setenv("CARTOLA_RAW_COMPRESSION", "brotli")
+    with pytest.raises(ValueError):
+        config.load_settings()
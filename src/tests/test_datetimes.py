@@ -0,0 +1,69 @@
+from datetime import UTC, datetime
+
+import pandas as pd
+
+from cartola_analytics.pipelines.datetimes import coerce_datetime_column
+from cartola_analytics.pipelines.engine import schema_transform
+
+
+def _utc(*parts: int) -> pd.Timestamp:
+    return pd.Timestamp(datetime(*parts, tzinfo=UTC))
+
+
+def test_coerce_datetime_column_routes_each_value_type() -> None:
+    values = pd.Series(
+        [
+            "2025-04-01 16:00:00",
+            " 2025-04-01T16:00:00 ",
+            "2025-04-01T16:00:00Z",
+            "2025-04-01T10:00:00-03:00",  # generic parser fallback
+            "2025-04-01",
+            1758999600,
+            1758999600.5,
+            datetime(2025, 4, 1, 16),
+            "",
+            None,
+            "amanha",
+            {"timestamp": 1},
+        ],
+        dtype=object,
+    )
+
+    parsed = coerce_datetime_column(values)
+
+    assert str(parsed.dtype) == "datetime64[ns, UTC]"
+    assert parsed.iloc[:4].tolist() == [_utc(2025, 4, 1, 16)] * 3 + [
+        _utc(2025, 4, 1, 13)
+    ]
+    assert parsed.iloc[4] == _utc(2025, 4, 1)
+    assert parsed.iloc[5] == _utc(2025, 9, 27, 19)
+    assert parsed.iloc[6] == _utc(2025, 9, 27, 19) + pd.Timedelta(milliseconds=500)
+    assert parsed.iloc[7] == _utc(2025, 4, 1, 16)
+    assert parsed.iloc[8:].isna().all()
+    assert coerce_datetime_column(pd.Series([1758999600, None])).iloc[1] is pd.NaT
+
+
+def test_partidas_dates_fall_back_to_the_collection_time() -> None:
+    collected_at = datetime(2025, 4, 2, tzinfo=UTC)
+    base = {"clube_casa_id": 1, "clube_visitante_id": 2}
+    payload = {
+        "rodada": 1,
+        "partidas": [
+            base | {"partida_id": 1, "partida_data": "2025-04-01 16:00:00"},
+            base | {"partida_id": 2, "partida_data": "sem data", "timestamp": 0},
+            base | {"partida_id": 3},
+        ],
+    }
+
+    transform = schema_transform("partidas")
+    frame = transform.coerce_frame(
+        pd.DataFrame(transform.extract(payload, collected_at))
+    )
+
+    assert frame["partida_data"].tolist() == [
+        _utc(2025, 4, 1, 16),
+        _utc(2025, 4, 2),
+        _utc(2025, 4, 2),
+    ]
+    assert frame["timestamp_partida"].iloc[1] == _utc(1970, 1, 1)
+    assert frame["timestamp_partida"].iloc[[0, 2]].isna().all()
@@ -0,0 +1,221 @@
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from cartola_analytics.pipelines.engine import (
+    compile_schema,
+    run_transform,
+    schema_transformers,
+)
+from cartola_analytics.schema import FieldSpec, SchemaSpec, schema_dir
+
+COLLECTED_AT = datetime(2025, 4, 1, tzinfo=UTC)
+
+ESCALACOES_YAML = """
+name: escalacoes
+version: 1
+raw_source:
+  endpoint: escalacoes
+  records:
+    layout: mapping
+    path: [times, equipes]
+    key: int
+processed:
+  primary_key: [rodada, time_id]
+fields:
+  - name: rodada
+    type: int
+    required: true
+    source: $payload.rodada
+  - name: time_id
+    type: int
+    required: true
+    source: $key
+  - name: nome
+    type: string
+    required: true
+    source: [nome, info.nome]
+    fallback: time_id
+  - name: pontos
+    type: float
+  - name: fechado_em
+    type: timestamp
+    source: fechamento
+    fallback: timestamp_coleta
+  - name: timestamp_coleta
+    type: timestamp
+    required: true
+    source: $collected_at
+"""
+
+
+def _spec(*fields: FieldSpec, records: dict[str, object]) -> SchemaSpec:
+    return SchemaSpec(
+        name="exemplo",
+        version=1,
+        raw_source={"endpoint": "exemplo", "records": records},
+        stage={},
+        processed={},
+        fields=list(fields),
+        relationships=[],
+        metadata={},
+    )
+
+
+def test_compiled_schema_reads_each_layout() -> None:
+    listed = compile_schema(
+        _spec(
+            FieldSpec(name="id", type="int", required=True),
+            FieldSpec(name="nome", type="string", source=["apelido", "nome"]),
+            FieldSpec(name="label", type="string", source="info.label"),
+            FieldSpec(name="forma", type="string", coerce="sequence"),
+            records={
+                "layout": "list",
+                "path": ["itens", "data"],
+                "skip_without": ["id"],
+            },
+        )
+    )
+    items = [
+        {"id": "1", "apelido": "", "nome": " Um ", "info": {"label": "x"}},
+        {"id": 2, "forma": ["v", "", "e"]},
+        {"sem_id": 3},
+        "lixo",
+    ]
+
+    expected = [
+        {"id": 1, "nome": "Um", "label": "x", "forma": None},
+        {"id": 2, "nome": None, "label": None, "forma": "ve"},
+    ]
+    assert listed.extract({"data": items}, COLLECTED_AT) == expected
+    assert listed.extract(items, COLLECTED_AT) == expected
+    assert listed.extract({"outro": items}, COLLECTED_AT) == []
+
+    status = compile_schema(
+        _spec(
+            FieldSpec(name="temporada", type="int", required=True),
+            FieldSpec(
+                name="status",
+                type="string",
+                required=True,
+                labels={1: "ABERTO"},
+            ),
+            records={"layout": "object"},
+        )
+    )
+    assert status.extract({"temporada": 2025, "status": 1}, COLLECTED_AT) == [
+        {"temporada": 2025, "status": "ABERTO"}
+    ]
+    assert status.extract({"temporada": 2025, "status": 7}, COLLECTED_AT)[0] == {
+        "temporada": 2025,
+        "status": "7",
+    }
+    with pytest.raises(ValueError, match="Campo obrigatorio ausente: temporada"):
+        status.extract({"status": 1}, COLLECTED_AT)
+
+
+def test_compile_schema_rejects_invalid_declarations() -> None:
+    with pytest.raises(ValueError, match="Coercao desconhecida"):
+        compile_schema(
+            _spec(
+                FieldSpec(name="id", type="int", coerce="hex"),
+                records={"layout": "list"},
+            )
+        )
+    with pytest.raises(ValueError, match="campo anterior"):
+        compile_schema(
+            _spec(
+                FieldSpec(name="nome", type="string", fallback="id"),
+                FieldSpec(name="id", type="int"),
+                records={"layout": "list"},
+            )
+        )
+    with pytest.raises(ValueError, match="Layout"):
+        compile_schema(_spec(records={"layout": "tabela"}))
+
+
+def test_new_endpoint_needs_only_a_schema_yaml(tmp_path: Path) -> None:
+    schemas = tmp_path / "docs" / "schemas"
+    schemas.mkdir(parents=True)
+    schemas.joinpath("escalacoes.yaml").write_text(ESCALACOES_YAML, encoding="utf-8")
+    raw_dir = tmp_path / "data" / "raw" / "escalacoes"
+    raw_dir.mkdir(parents=True)
+    payloads = [
+        {"rodada": 1, "times": {"10": {"nome": "Alfa", "pontos": 50.5}, "x": {}}},
+        {
+            "rodada": 1,
+            "equipes": {
+                "10": {"nome": "Alfa", "pontos": 61, "fechamento": 1743508800},
+                "20": {"info": {"nome": "Beta"}},
+                "30": {},
+            },
+        },
+    ]
+    for hour, payload in enumerate(payloads):
+        raw_dir.joinpath(f"20250401T{hour:02d}0000Z.json").write_text(
+            json.dumps(payload), encoding="utf-8"
+        )
+
+    transformers = schema_transformers(base_dir=tmp_path)
+    assert list(transformers) == ["escalacoes"]
+    result = transformers["escalacoes"](base_dir=tmp_path)
+
+    assert result["rows_stage"] == 4
+    assert result["rows_processed"] == 3
+    processed = pd.read_parquet(result["processed_path"])
+    assert processed["nome"].tolist() == ["Alfa", "Beta", "30"]
+    assert processed["pontos"].tolist() == [61.0, pd.NA, pd.NA]
+    assert processed["fechado_em"].tolist() == [
+        pd.Timestamp("2025-04-01T12:00:00Z"),
+        pd.Timestamp("2025-04-01T01:00:00Z"),
+        pd.Timestamp("2025-04-01T01:00:00Z"),
+    ]
+
+    rerun = run_transform("escalacoes", base_dir=tmp_path, incremental=True)
+    assert rerun["rows_stage"] == 0
+    assert rerun["rows_processed"] == 3
+
+
+def test_pos_rodada_destaques_keeps_one_row_per_round(tmp_path: Path) -> None:
+    schemas = tmp_path / "docs" / "schemas"
+    schemas.mkdir(parents=True)
+    schemas.joinpath("pos_rodada_destaques.yaml").write_text(
+        schema_dir().joinpath("pos_rodada_destaques.yaml").read_text(encoding="utf-8"),
+        encoding="utf-8",
+    )
+    raw_dir = tmp_path / "data" / "raw" / "pos_rodada_destaques"
+    raw_dir.mkdir(parents=True)
+    rounds = [(7, 51.2, 110.4), (7, 51.2, 110.4), (9, 48.9, 111.0)]
+    for hour, (time_id, pontos, cartoletas) in enumerate(rounds):
+        payload = {
+            "mito": {"time_id": time_id, "nome": f"Time {time_id}"},
+            "media_pontos": pontos,
+            "media_cartoletas": cartoletas,
+        }
+        raw_dir.joinpath(f"20250401T{hour:02d}0000Z.json").write_text(
+            json.dumps(payload), encoding="utf-8"
+        )
+
+    result = run_transform("pos_rodada_destaques", base_dir=tmp_path)
+
+    assert result["rows_stage"] == 2
+    assert result["rows_processed"] == 2
+    processed = pd.read_parquet(result["processed_path"])
+    assert processed["timestamp_coleta"].dt.hour.tolist() == [0, 2]
+
+    # A later poll of an already merged round adds nothing.
+    payload = {
+        "mito": {"time_id": 9, "nome": "Time 9"},
+        "media_pontos": 48.9,
+        "media_cartoletas": 111.0,
+    }
+    raw_dir.joinpath("20250401T050000Z.json").write_text(
+        json.dumps(payload), encoding="utf-8"
+    )
+    result = run_transform("pos_rodada_destaques", base_dir=tmp_path, incremental=True)
+
+    assert result["rows_added"] == 0
+    assert result["rows_processed"] == 2
@@ -1,8 +1,18 @@
+import asyncio
+import json
+import time
+
 import httpx
 import pytest
 import respx
 
-from cartola_analytics import CartolaClient, CartolaSettings, Endpoint
+from cartola_analytics import (
+    AsyncCartolaClient,
+    CartolaClient,
+    CartolaSettings,
+    CircuitOpenError,
+    Endpoint,
+)
 
 
 @pytest.fixture(name="sample_endpoint")
@@ -116,3 +126,527 @@ def test_fetch_invalid_json(tmp_path, sample_endpoint):
     with CartolaClient(cache_dir=tmp_path, cache_ttl=0) as client:
         with pytest.raises(ValueError):
             client.fetch(sample_endpoint, use_cache=False)
+
+
+@respx.mock
+def test_async_fetch_success_and_cache(tmp_path, sample_endpoint):
+    route = respx.get(sample_endpoint.url).mock(
+        return_value=httpx.Response(200, json={"ok": True})
+    )
+
+    async def _run():
+        async with AsyncCartolaClient(cache_dir=tmp_path, cache_ttl=3600) as client:
+            first = await client.fetch(sample_endpoint)
+            second = await client.fetch(sample_endpoint)
+        return first, second
+
+    first, second = asyncio.run(_run())
+    assert first == second == {"ok": True}
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_async_fetch_retries_on_server_error(tmp_path, sample_endpoint):
+    respx.get(sample_endpoint.url).mock(
+        side_effect=[
+            httpx.Response(503),
+            httpx.Response(200, json={"ok": True}),
+        ]
+    )
+
+    async def _run():
+        async with AsyncCartolaClient(
+            cache_dir=tmp_path,
+            cache_ttl=0,
+            max_retries=2,
+            backoff_factor=0,
+        ) as client:
+            return await client.fetch(sample_endpoint, use_cache=False)
+
+    assert asyncio.run(_run()) == {"ok": True}
+
+
+@respx.mock
+def test_fetch_many_preserves_order_and_captures_errors(tmp_path):
+    round_endpoint = Endpoint(
+        name="partidas_por_rodada",
+        url="https://example.com/partidas/{rodada}",
+        requires_round=True,
+    )
+    for rodada in (1, 3):
+        respx.get(round_endpoint.resolve(rodada)).mock(
+            return_value=httpx.Response(200, json={"rodada": rodada})
+        )
+    respx.get(round_endpoint.resolve(2)).mock(return_value=httpx.Response(404))
+
+    seen: list[int] = []
+    with CartolaClient(cache_dir=tmp_path, cache_ttl=0, max_retries=0) as client:
+        results = client.fetch_many(
+            [(round_endpoint, rodada) for rodada in (1, 2, 3)],
+            max_workers=3,
+            use_cache=False,
+            on_result=lambda index, _result: seen.append(index),
+        )
+
+    assert [result.rodada for result in results] == [1, 2, 3]
+    assert results[0].payload == {"rodada": 1}
+    assert results[2].payload == {"rodada": 3}
+    assert not results[1].ok
+    assert isinstance(results[1].error, httpx.HTTPStatusError)
+    assert sorted(seen) == [0, 2]
+
+
+@respx.mock
+def test_fetch_revalidates_expired_entry_with_etag(tmp_path, sample_endpoint, caplog):
+    route = respx.get(sample_endpoint.url).mock(
+        side_effect=[
+            httpx.Response(
+                200,
+                json={"count": 1},
+                headers={
+                    "ETag": '"v1"',
+                    "Last-Modified": "Wed, 01 Oct 2025 00:00:00 GMT",
+                },
+            ),
+            httpx.Response(304),
+        ]
+    )
+    with CartolaClient(cache_dir=tmp_path, cache_ttl=60) as client:
+        first = client.fetch(sample_endpoint)
+        key = client._cache_key(sample_endpoint.url)
+        meta_path = tmp_path / f"{key}.meta.json"
+        meta = json.loads(meta_path.read_text())
+        meta["timestamp"] -= 3600
+        meta_path.write_text(json.dumps(meta))
+        body_mtime = (tmp_path / f"{key}.json").stat().st_mtime_ns
+
+        with caplog.at_level("INFO"):
+            second = client.fetch(sample_endpoint)
+
+        assert client.cache_stats == {
+            "hits": 0,
+            "stale": 0,
+            "revalidations": 1,
+            "misses": 1,
+        }
+
+    assert first == second == {"count": 1}
+    conditional = route.calls[1].request.headers
+    assert conditional["If-None-Match"] == '"v1"'
+    assert conditional["If-Modified-Since"] == "Wed, 01 Oct 2025 00:00:00 GMT"
+    refreshed = json.loads(meta_path.read_text())
+    assert refreshed["timestamp"] > meta["timestamp"]
+    assert (tmp_path / f"{key}.json").stat().st_mtime_ns == body_mtime
+    revalidated = [
+        record
+        for record in caplog.records
+        if getattr(record, "event", None) == "cache_revalidated"
+    ]
+    assert revalidated and revalidated[0].cache_revalidations == 1
+
+
+@respx.mock
+def test_fetch_replaces_expired_entry_on_200(tmp_path, sample_endpoint):
+    route = respx.get(sample_endpoint.url).mock(
+        side_effect=[
+            httpx.Response(200, json={"count": 1}, headers={"ETag": '"v1"'}),
+            httpx.Response(200, json={"count": 2}, headers={"ETag": '"v2"'}),
+            Exception("fresh entry should be served from cache"),
+        ]
+    )
+    with CartolaClient(cache_dir=tmp_path, cache_ttl=60) as client:
+        client.fetch(sample_endpoint)
+        key = client._cache_key(sample_endpoint.url)
+        meta_path = tmp_path / f"{key}.meta.json"
+        meta = json.loads(meta_path.read_text())
+        meta["timestamp"] -= 3600
+        meta_path.write_text(json.dumps(meta))
+
+        assert client.fetch(sample_endpoint) == {"count": 2}
+        assert client.fetch(sample_endpoint) == {"count": 2}
+        assert client.cache_stats == {
+            "hits": 1,
+            "stale": 0,
+            "revalidations": 0,
+            "misses": 2,
+        }
+
+    assert route.call_count == 2
+    assert json.loads(meta_path.read_text())["etag"] == '"v2"'
+
+
+def _age_cache_entry(cache_dir, client, url, seconds):
+    meta_path = cache_dir / f"{client._cache_key(url)}.meta.json"
+    meta = json.loads(meta_path.read_text())
+    meta["timestamp"] -= seconds
+    meta_path.write_text(json.dumps(meta))
+
+
+@respx.mock
+def test_fetch_serves_finished_round_from_cache_forever(tmp_path):
+    rodadas = Endpoint(name="rodadas", url="https://example.com/rodadas")
+    partidas = Endpoint(
+        name="partidas_por_rodada",
+        url="https://example.com/partidas/{rodada}",
+        requires_round=True,
+        immutable_when_finished=True,
+    )
+    respx.get(rodadas.url).mock(
+        return_value=httpx.Response(
+            200, json=[{"rodada_id": 1, "fim": "2020-01-01 00:00:00"}]
+        )
+    )
+    round_route = respx.get(partidas.resolve(1)).mock(
+        return_value=httpx.Response(200, json={"rodada": 1})
+    )
+    with CartolaClient(cache_dir=tmp_path, cache_ttl=60) as client:
+        client.fetch(partidas, rodada=1)
+        _age_cache_entry(tmp_path, client, partidas.resolve(1), 10**6)
+
+        client.fetch(rodadas, use_cache=False)
+        assert client.finished_rounds == {1}
+        assert client.fetch(partidas, rodada=1) == {"rodada": 1}
+
+    assert round_route.call_count == 1
+
+
+@respx.mock
+def test_fetch_serves_stale_while_revalidating(tmp_path):
+    endpoint = Endpoint(
+        name="clubes",
+        url="https://example.com/clubes",
+        cache_ttl=60,
+        stale_while_revalidate=3600,
+    )
+    respx.get(endpoint.url).mock(
+        side_effect=[
+            httpx.Response(200, json={"version": 1}),
+            httpx.Response(200, json={"version": 2}),
+        ]
+    )
+    with CartolaClient(cache_dir=tmp_path, cache_ttl=600) as client:
+        client.fetch(endpoint)
+        _age_cache_entry(tmp_path, client, endpoint.url, 120)
+
+        assert client.fetch(endpoint) == {"version": 1}
+        client._refresh_executor.shutdown(wait=True)
+        client._refresh_executor = None
+
+        assert client.fetch(endpoint) == {"version": 2}
+        assert client.cache_stats["stale"] == 1
+        assert client.cache_stats["hits"] == 1
+
+
+@respx.mock
+def test_collection_client_never_serves_stale_entries(tmp_path):
+    endpoint = Endpoint(
+        name="clubes",
+        url="https://example.com/clubes",
+        cache_ttl=60,
+        stale_while_revalidate=3600,
+    )
+    respx.get(endpoint.url).mock(
+        side_effect=[
+            httpx.Response(200, json={"version": 1}),
+            httpx.Response(200, json={"version": 2}),
+        ]
+    )
+    with CartolaClient(cache_dir=tmp_path, serve_stale=False) as client:
+        client.fetch(endpoint)
+        _age_cache_entry(tmp_path, client, endpoint.url, 120)
+
+        assert client.fetch(endpoint) == {"version": 2}
+        assert client.cache_stats["stale"] == 0
+        assert client._refresh_executor is None
+
+
+@respx.mock
+def test_background_refresh_keeps_the_round_cache_policy(tmp_path):
+    partidas = Endpoint(
+        name="partidas_por_rodada",
+        url="https://example.com/partidas/{rodada}",
+        requires_round=True,
+        immutable_when_finished=True,
+        cache_ttl=60,
+        stale_while_revalidate=3600,
+    )
+    url = partidas.resolve(1)
+    respx.get(url).mock(return_value=httpx.Response(200, json={"rodada": 1}))
+    with CartolaClient(cache_dir=tmp_path, cache_ttl=600) as client:
+        client.fetch(partidas, rodada=1)
+        key = client._cache_key(url)
+        entry = client._cache.get(key)
+        assert entry.ttl == 3660
+
+        client.register_finished_rounds([1])
+        client._refresh_entry(key, partidas, url, 1, entry)
+
+        assert client._cache.get(key).ttl is None
+
+
+def test_client_pool_settings_and_http2_fallback(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(
+        "cartola_analytics.http_client.importlib.util.find_spec", lambda _name: None
+    )
+    settings = CartolaSettings(
+        http2=True,
+        max_connections=4,
+        max_keepalive_connections=2,
+        keepalive_expiry=5.0,
+        log_level="DEBUG",
+    )
+    with caplog.at_level("WARNING"):
+        with CartolaClient(settings=settings, cache_dir=tmp_path) as client:
+            assert client.http2 is False
+            assert client.limits == httpx.Limits(
+                max_connections=4, max_keepalive_connections=2, keepalive_expiry=5.0
+            )
+    assert any(
+        getattr(record, "event", None) == "http2_unavailable"
+        for record in caplog.records
+    )
+
+
+@respx.mock
+def test_client_tracks_connections_opened_and_reused(tmp_path, sample_endpoint):
+    from cartola_analytics.http_client import _ConnectionTrace
+
+    respx.get(sample_endpoint.url).mock(
+        return_value=httpx.Response(200, json={"ok": True})
+    )
+    with CartolaClient(cache_dir=tmp_path, cache_ttl=0) as client:
+        opened = _ConnectionTrace()
+        opened.observe("connection.connect_tcp.complete", {})
+        client._record_connection(sample_endpoint.url, opened)
+        client.fetch(sample_endpoint, use_cache=False)
+
+        assert client.pool_stats == {
+            "example.com": {"requests": 2, "opened": 1, "reused": 1}
+        }
+
+
+@respx.mock
+def test_async_fetch_raw_serves_cached_bytes(tmp_path, sample_endpoint):
+    route = respx.get(sample_endpoint.url).mock(
+        return_value=httpx.Response(200, content=b'{"value":1}')
+    )
+
+    async def _run():
+        async with AsyncCartolaClient(cache_dir=tmp_path, cache_ttl=60) as client:
+            first = await client.fetch_raw(sample_endpoint)
+            second = await client.fetch_raw(sample_endpoint)
+            decoded = await client.fetch(sample_endpoint)
+            return first, second, decoded
+
+    first, second, decoded = asyncio.run(_run())
+
+    assert first == second == b'{"value":1}'
+    assert decoded == {"value": 1}
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_circuit_breaker_fails_fast_after_consecutive_failures(tmp_path):
+    first = Endpoint(name="a", url="https://example.com/a")
+    second = Endpoint(name="b", url="https://example.com/b")
+    route = respx.get(url__startswith="https://example.com/").mock(
+        return_value=httpx.Response(503)
+    )
+    settings = CartolaSettings(circuit_threshold=2, circuit_cooldown=60)
+    with CartolaClient(
+        settings=settings, cache_dir=tmp_path, max_retries=5, backoff_factor=0
+    ) as client:
+        with pytest.raises(CircuitOpenError):
+            client.fetch(first, use_cache=False)
+        with pytest.raises(CircuitOpenError):
+            client.fetch(second, use_cache=False)
+
+    # Retries stop as soon as the circuit opens; the second fetch never hits
+    # the network.
+    assert route.call_count == 2
+
+
+@respx.mock
+def test_cancelled_half_open_probe_releases_the_circuit(tmp_path, sample_endpoint):
+    started = asyncio.Event()
+
+    async def _hang(request):
+        started.set()
+        await asyncio.Event().wait()
+
+    route = respx.get(sample_endpoint.url).mock(side_effect=_hang)
+    settings = CartolaSettings(circuit_threshold=1, circuit_cooldown=0)
+
+    async def _run():
+        async with AsyncCartolaClient(
+            settings=settings, cache_dir=tmp_path, max_retries=0, backoff_factor=0
+        ) as client:
+            with pytest.raises(CircuitOpenError):
+                client.circuit_breaker.record_failure(sample_endpoint.url)
+            probe = asyncio.create_task(client.fetch(sample_endpoint, use_cache=False))
+            await started.wait()
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+
+            assert client.circuit_breaker.state(sample_endpoint.url) == "half_open"
+            route.mock(return_value=httpx.Response(200, json={"ok": True}))
+            data = await client.fetch(sample_endpoint, use_cache=False)
+            return data, client.circuit_breaker.state(sample_endpoint.url)
+
+    assert asyncio.run(_run()) == ({"ok": True}, "closed")
+
+
+@respx.mock
+def test_circuit_breaker_ignores_client_errors(tmp_path, sample_endpoint):
+    respx.get(sample_endpoint.url).mock(return_value=httpx.Response(404))
+    settings = CartolaSettings(circuit_threshold=1)
+    with CartolaClient(
+        settings=settings, cache_dir=tmp_path, max_retries=0, backoff_factor=0
+    ) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            client.fetch(sample_endpoint, use_cache=False)
+        assert client.circuit_breaker.state(sample_endpoint.url) == "closed"
+
+
+@respx.mock
+def test_circuit_open_serves_expired_cache_entry(tmp_path, sample_endpoint, caplog):
+    respx.get(sample_endpoint.url).mock(
+        side_effect=[
+            httpx.Response(200, json={"count": 1}),
+            httpx.Response(500),
+        ]
+    )
+    settings = CartolaSettings(circuit_threshold=1, circuit_cooldown=60)
+    with CartolaClient(
+        settings=settings,
+        cache_dir=tmp_path,
+        cache_ttl=60,
+        max_retries=3,
+        backoff_factor=0,
+    ) as client:
+        client.fetch(sample_endpoint)
+        _age_cache_entry(tmp_path, client, sample_endpoint.url, 3600)
+
+        with caplog.at_level("WARNING"):
+            assert client.fetch(sample_endpoint) == {"count": 1}
+            assert client.fetch(sample_endpoint) == {"count": 1}
+
+    events = [getattr(record, "event", None) for record in caplog.records]
+    assert events.count("circuit_stale_served") == 2
+    assert "circuit_open" in events
+
+    no_stale = CartolaSettings(circuit_threshold=1, circuit_serve_stale=False)
+    with CartolaClient(settings=no_stale, cache_dir=tmp_path, cache_ttl=60) as client:
+        with pytest.raises(CircuitOpenError):
+            client.circuit_breaker.record_failure(sample_endpoint.url)
+        with pytest.raises(CircuitOpenError):
+            client.fetch(sample_endpoint)
+
+
+@respx.mock
+def test_async_circuit_breaker_fails_fast(tmp_path, sample_endpoint):
+    route = respx.get(sample_endpoint.url).mock(
+        side_effect=httpx.ConnectError("down")
+    )
+    settings = CartolaSettings(circuit_threshold=2, circuit_cooldown=60)
+
+    async def _run():
+        async with AsyncCartolaClient(
+            settings=settings, cache_dir=tmp_path, max_retries=5, backoff_factor=0
+        ) as client:
+            for _ in range(3):
+                with pytest.raises(CircuitOpenError):
+                    await client.fetch(sample_endpoint, use_cache=False)
+
+    asyncio.run(_run())
+    assert route.call_count == 2
+
+
+@respx.mock
+def test_sqlite_cache_backend_serves_and_revalidates(tmp_path, sample_endpoint):
+    route = respx.get(sample_endpoint.url).mock(
+        side_effect=[
+            httpx.Response(200, json={"count": 1}, headers={"ETag": '"v1"'}),
+            httpx.Response(304),
+        ]
+    )
+    settings = CartolaSettings(cache_backend="sqlite", log_level="ERROR")
+    with CartolaClient(settings=settings, cache_dir=tmp_path, cache_ttl=60) as client:
+        assert client.fetch(sample_endpoint) == {"count": 1}
+        assert client.fetch(sample_endpoint) == {"count": 1}
+
+    # A second client (another process, in practice) reuses the same database.
+    with CartolaClient(settings=settings, cache_dir=tmp_path, cache_ttl=60) as client:
+        key = client._cache_key(sample_endpoint.url)
+        entry = client._cache.get(key)
+        client._cache.touch(key, entry, entry.stored_at - 3600)
+
+        assert client.fetch(sample_endpoint) == {"count": 1}
+        assert client.cache_stats["revalidations"] == 1
+
+    assert route.call_count == 2
+    assert route.calls[1].request.headers["If-None-Match"] == '"v1"'
+
+
+@respx.mock
+def test_client_close_persists_counters_and_prunes(tmp_path, sample_endpoint):
+    respx.get(sample_endpoint.url).mock(
+        return_value=httpx.Response(200, json={"ok": True})
+    )
+    settings = CartolaSettings(cache_max_entries=1, log_level="ERROR")
+    with CartolaClient(settings=settings, cache_dir=tmp_path, cache_ttl=60) as client:
+        client.fetch(sample_endpoint)
+        client.fetch(sample_endpoint)
+        store = client._cache
+
+    stats = store.stats()
+    assert stats.entries == 1
+    assert stats.counters["hits"] == 1
+    assert stats.counters["misses"] == 1
+    assert stats.hit_ratio == 0.5
+
+
+@respx.mock
+@pytest.mark.parametrize("policy", ["copy", "shared"])
+def test_memory_tier_serves_hits_without_disk(tmp_path, sample_endpoint, policy):
+    route = respx.get(sample_endpoint.url).mock(
+        return_value=httpx.Response(200, json={"clubes": [1, 2]})
+    )
+    settings = CartolaSettings(
+        memory_cache_bytes=1024, memory_cache_policy=policy, log_level="ERROR"
+    )
+    with CartolaClient(settings=settings, cache_dir=tmp_path, cache_ttl=60) as client:
+        first = client.fetch(sample_endpoint)
+        for path in tmp_path.glob("*.json"):
+            path.unlink()  # hits must not touch the disk tier
+        second = client.fetch(sample_endpoint)
+        third = client.fetch(sample_endpoint)
+        raw = client.fetch_raw(sample_endpoint)
+
+    assert second == third == {"clubes": [1, 2]}
+    assert (first is second) is (policy == "shared")
+    assert (second is third) is (policy == "shared")
+    assert raw == b'{"clubes":[1,2]}'
+    assert route.call_count == 1
+    assert client.cache_stats["hits"] == 3
+
+
+@respx.mock
+def test_memory_tier_follows_disk_entry_ttl(tmp_path, sample_endpoint, monkeypatch):
+    route = respx.get(sample_endpoint.url).mock(
+        side_effect=[
+            httpx.Response(200, json={"count": 1}),
+            httpx.Response(200, json={"count": 2}),
+        ]
+    )
+    settings = CartolaSettings(memory_cache_bytes=1024, log_level="ERROR")
+    with CartolaClient(settings=settings, cache_dir=tmp_path, cache_ttl=60) as client:
+        assert client.fetch(sample_endpoint) == {"count": 1}
+        assert client.fetch(sample_endpoint) == {"count": 1}
+
+        later = time.time() + 120
+        monkeypatch.setattr("cartola_analytics.cache.time.time", lambda: later)
+        assert client.fetch(sample_endpoint) == {"count": 2}
+
+    assert route.call_count == 2
@@ -0,0 +1,128 @@
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pandas as pd
+
+from cartola_analytics.pipelines import transform_partidas
+from cartola_analytics.pipelines.incremental import (
+    load_state,
+    merge_keyed,
+    state_path,
+)
+
+
+def _write_schema_copy(base_dir: Path) -> None:
+    schema_root = Path(__file__).resolve().parents[2] / "docs" / "schemas"
+    target = base_dir / "docs" / "schemas"
+    target.mkdir(parents=True, exist_ok=True)
+    target.joinpath("partidas.yaml").write_text(
+        schema_root.joinpath("partidas.yaml").read_text(encoding="utf-8"),
+        encoding="utf-8",
+    )
+
+
+def _write_partidas(
+    base_dir: Path, name: str, rodada: int, scores: dict[int, int]
+) -> None:
+    round_dir = base_dir / "data" / "raw" / "partidas" / f"rodada={rodada:03d}"
+    round_dir.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "rodada": rodada,
+        "partidas": [
+            {
+                "partida_id": partida_id,
+                "partida_data": "2025-10-01 19:00:00",
+                "clube_casa_id": 10,
+                "clube_visitante_id": 20,
+                "placar_oficial_mandante": score,
+                "valida": True,
+            }
+            for partida_id, score in scores.items()
+        ],
+    }
+    round_dir.joinpath(name).write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_incremental_transform_parses_only_new_snapshots(tmp_path: Path) -> None:
+    _write_schema_copy(tmp_path)
+    _write_partidas(tmp_path, "20251001T000000Z.json", 26, {1: 0, 2: 0})
+    _write_partidas(tmp_path, "20251002T000000Z.json", 26, {1: 1, 2: 0})
+
+    first = transform_partidas(base_dir=tmp_path, incremental=True)
+    assert first["rows_stage"] == 4
+    assert (first["rows_added"], first["rows_replaced"]) == (2, 0)
+    assert state_path(first["processed_path"]).exists()
+
+    _write_partidas(tmp_path, "20251008T000000Z.json", 27, {1: 2, 3: 1})
+    second = transform_partidas(base_dir=tmp_path, incremental=True)
+
+    assert second["rows_stage"] == 2
+    assert pd.read_parquet(second["stage_path"])["rodada"].tolist() == [27, 27]
+    assert (second["rows_added"], second["rows_replaced"]) == (1, 1)
+    incremental = pd.read_parquet(second["processed_path"])
+    assert incremental["placar_oficial_mandante"].tolist() == [2, 0, 1]
+    state = load_state(second["processed_path"], source="raw", schema_version=1)
+    assert state is not None
+    assert state.high_water_mark == datetime(2025, 10, 8, tzinfo=UTC)
+    assert state.consumed == {"27@2025-10-08T00:00:00+00:00"}
+
+    unchanged = transform_partidas(base_dir=tmp_path, incremental=True)
+    assert unchanged["stage_path"] is None
+    assert (unchanged["rows_stage"], unchanged["rows_added"]) == (0, 0)
+    assert unchanged["rows_processed"] == 3
+
+    full = transform_partidas(base_dir=tmp_path)
+    assert full["rows_stage"] == 6
+    pd.testing.assert_frame_equal(pd.read_parquet(full["processed_path"]), incremental)
+
+
+def test_incremental_transform_skips_snapshots_below_the_mark(
+    tmp_path: Path,
+) -> None:
+    _write_schema_copy(tmp_path)
+    _write_partidas(tmp_path, "20251005T000000Z.json", 26, {1: 3})
+    transform_partidas(base_dir=tmp_path, incremental=True)
+
+    # A backfilled snapshot collected before the mark is left to full runs.
+    _write_partidas(tmp_path, "20251001T000000Z.json", 26, {1: 0, 2: 0})
+    result = transform_partidas(base_dir=tmp_path, incremental=True)
+
+    assert result["stage_path"] is None
+    assert result["rows_processed"] == 1
+
+    # ... where it still does not overwrite the newer row.
+    result = transform_partidas(base_dir=tmp_path)
+
+    processed = pd.read_parquet(result["processed_path"])
+    assert processed["placar_oficial_mandante"].tolist() == [3, 0]
+
+
+def test_incremental_state_requires_the_same_source(tmp_path: Path) -> None:
+    _write_schema_copy(tmp_path)
+    _write_partidas(tmp_path, "20251001T000000Z.json", 26, {1: 0})
+    result = transform_partidas(base_dir=tmp_path)
+    processed_path = result["processed_path"]
+
+    state = load_state(processed_path, source="raw", schema_version=1)
+    assert state is not None
+    assert state.consumed == {"26@2025-10-01T00:00:00+00:00"}
+    assert load_state(processed_path, source="bronze", schema_version=1) is None
+    assert load_state(processed_path, source="raw", schema_version=2) is None
+    processed_path.unlink()
+    assert load_state(processed_path, source="raw", schema_version=1) is None
+
+
+def test_merge_keyed_supports_composite_keys() -> None:
+    moment = pd.Timestamp("2025-10-01", tz="UTC")
+    existing = pd.DataFrame(
+        {"a": [1, 1], "b": [1, 2], "v": [1, 1], "timestamp_coleta": [moment] * 2}
+    )
+    new = pd.DataFrame(
+        {"a": [1, 2], "b": [2, 1], "v": [2, 2], "timestamp_coleta": [moment] * 2}
+    )
+
+    merged, added, replaced = merge_keyed(existing, new, ["a", "b"])
+
+    assert merged[["a", "b", "v"]].values.tolist() == [[1, 1, 1], [1, 2, 2], [2, 1, 2]]
+    assert (added, replaced) == (1, 1)
@@ -1,9 +1,11 @@
 import json
+from datetime import UTC, datetime
 from pathlib import Path
 
 import pandas as pd
 
-from cartola_analytics.pipelines import transform_mercado_status
+from cartola_analytics import codec
+from cartola_analytics.pipelines import raw_store, transform_mercado_status
 from cartola_analytics.schema import load_schema
 
 
@@ -89,4 +91,36 @@ def test_transform_mercado_status_custom_raw_root(tmp_path: Path) -> None:
     result = transform_mercado_status(base_dir=tmp_path, schema=schema, raw_root=raw_root)
 
     processed_df = pd.read_parquet(result["processed_path"])
-    assert processed_df.loc[0, "status_mercado"] == "ABERTO"
\ No newline at end of file
+    assert processed_df.loc[0, "status_mercado"] == "ABERTO"
+
+def test_transform_mercado_status_reads_deduplicated_snapshots(tmp_path: Path) -> None:
+    _write_schema_copy(tmp_path)
+    raw_dir = tmp_path / "data" / "raw" / "mercado_status"
+    payload = {
+        "temporada": 2025,
+        "rodada_atual": 25,
+        "rodada_final": 38,
+        "status_mercado": 1,
+        "mercado_pos_rodada": False,
+        "bola_rolando": False,
+        "fechamento": {"timestamp": 1758999540},
+    }
+    for hour, status in [(2, 1), (3, 1), (4, 2)]:
+        document = codec.dumps(payload | {"status_mercado": status})
+        path, digest, _ = raw_store.store_object(raw_dir, document)
+        raw_store.append_manifest(
+            raw_dir,
+            raw_store.ManifestEntry(
+                collected_at=datetime(2025, 9, 25, hour, tzinfo=UTC),
+                rodada=None,
+                content_hash=digest,
+                path=path,
+                size=len(document),
+            ),
+        )
+
+    result = transform_mercado_status(base_dir=tmp_path)
+
+    stage_df = pd.read_parquet(result["stage_path"])
+    assert list(stage_df["timestamp_coleta"].dt.hour) == [2, 3, 4]
+    assert list(stage_df["status_mercado"]) == ["ABERTO", "ABERTO", "FECHADO"]
@@ -110,4 +110,24 @@ def test_transform_partidas(tmp_path: Path) -> None:
     assert stage_df["partida_data"].dt.tz is not None
     assert processed_df.loc[processed_df["partida_id"] == 222, "placar_oficial_mandante"].iloc[0] == 1
     assert processed_df.loc[processed_df["partida_id"] == 111, "placar_oficial_mandante"].iloc[0] == 2
-    assert processed_df.loc[processed_df["partida_id"] == 111, "aproveitamento_mandante"].iloc[0] == "ve"
\ No newline at end of file
+    assert processed_df.loc[processed_df["partida_id"] == 111, "aproveitamento_mandante"].iloc[0] == "ve"
+
+def test_transform_partidas_reads_round_directories(tmp_path: Path) -> None:
+    _write_schema_copy(tmp_path)
+    match = {
+        "partida_id": 333,
+        "partida_data": "2025-10-01 19:00:00",
+        "clube_casa_id": 10,
+        "clube_visitante_id": 20,
+        "valida": True,
+    }
+    for rodada in (26, 27):
+        round_dir = tmp_path / "data" / "raw" / "partidas" / f"rodada={rodada:03d}"
+        round_dir.mkdir(parents=True)
+        payload = {"rodada": rodada, "partidas": [match | {"partida_id": rodada}]}
+        round_dir.joinpath("20251001T000000Z.json").write_text(json.dumps(payload))
+
+    result = transform_partidas(base_dir=tmp_path)
+
+    processed_df = pd.read_parquet(result["processed_path"])
+    assert sorted(processed_df["rodada"]) == [26, 27]
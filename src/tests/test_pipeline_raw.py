@@ -1,4 +1,8 @@
+import asyncio
+import gzip
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 
 import httpx
@@ -6,11 +10,14 @@ import pytest
 import respx
 
 from cartola_analytics import (
+    AsyncCartolaClient,
     CartolaClient,
     CartolaSettings,
     Endpoint,
     build_output_path,
     collect_endpoint_payload,
+    collect_endpoint_payload_async,
+    collect_endpoint_payloads,
 )
 
 
@@ -28,6 +35,14 @@ def test_build_output_path_handles_rodada(tmp_path, sample_endpoint):
     assert path.suffix == ".json"
 
 
+def test_build_output_path_adds_compression_suffix(tmp_path, sample_endpoint):
+    timestamp = datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC)
+    path = build_output_path(
+        tmp_path, sample_endpoint, rodada=None, timestamp=timestamp, compression="zstd"
+    )
+    assert path.name == "20250102T030405Z.json.zst"
+
+
 @respx.mock
 def test_collect_endpoint_payload_writes_file(tmp_path, sample_endpoint):
     respx.get(sample_endpoint.url).mock(
@@ -78,3 +93,350 @@ def test_collect_endpoint_payload_uses_settings_when_client_missing(
 
     timestamp_str = output_path.stem
     datetime.strptime(timestamp_str, "%Y%m%dT%H%M%SZ")
+
+
+@respx.mock
+def test_collect_endpoint_payload_async_writes_file(tmp_path, sample_endpoint):
+    respx.get(sample_endpoint.url).mock(
+        return_value=httpx.Response(200, json={"items": [1]})
+    )
+    settings = CartolaSettings(
+        cache_dir=tmp_path / "cache",
+        raw_dir=tmp_path / "raw",
+        log_level="ERROR",
+    )
+
+    async def _run():
+        async with AsyncCartolaClient(settings=settings, cache_ttl=0) as client:
+            return await collect_endpoint_payload_async(
+                sample_endpoint,
+                client=client,
+                settings=settings,
+                timestamp=datetime(2025, 1, 1, tzinfo=UTC),
+            )
+
+    output_path = asyncio.run(_run())
+
+    assert output_path == settings.raw_dir / "clubes" / "20250101T000000Z.json"
+    assert json.loads(output_path.read_text()) == {"items": [1]}
+
+
+@respx.mock
+def test_collect_endpoint_payloads_persists_each_item(tmp_path):
+    round_endpoint = Endpoint(
+        name="partidas_por_rodada",
+        url="https://example.com/partidas/{rodada}",
+        requires_round=True,
+    )
+    respx.get(round_endpoint.resolve(1)).mock(
+        return_value=httpx.Response(200, json={"rodada": 1})
+    )
+    respx.get(round_endpoint.resolve(2)).mock(return_value=httpx.Response(404))
+    settings = CartolaSettings(
+        cache_dir=tmp_path / "cache",
+        raw_dir=tmp_path / "raw",
+        log_level="ERROR",
+    )
+    with CartolaClient(settings=settings, cache_ttl=0, max_retries=0) as client:
+        results = collect_endpoint_payloads(
+            [(round_endpoint, 1), (round_endpoint, 2)],
+            client=client,
+            settings=settings,
+            timestamp=datetime(2025, 1, 1, tzinfo=UTC),
+            max_workers=2,
+        )
+
+    assert results[0].ok
+    assert results[0].path == (
+        settings.raw_dir
+        / "partidas_por_rodada"
+        / "rodada=001"
+        / "20250101T000000Z.json"
+    )
+    assert json.loads(results[0].path.read_text()) == {"rodada": 1}
+    assert results[1].path is None
+    assert isinstance(results[1].error, httpx.HTTPStatusError)
+
+
+@respx.mock
+def test_collect_endpoint_payload_writes_response_bytes_verbatim(
+    tmp_path, sample_endpoint
+):
+    body = '{"nome":"Fla","escudo":"São"}'.encode()
+    respx.get(sample_endpoint.url).mock(return_value=httpx.Response(200, content=body))
+    settings = CartolaSettings(
+        cache_dir=tmp_path / "cache", raw_format="bytes", log_level="ERROR"
+    )
+
+    with CartolaClient(settings=settings, cache_ttl=60) as client:
+        output_path = collect_endpoint_payload(
+            sample_endpoint,
+            client=client,
+            settings=settings,
+            base_dir=tmp_path / "raw",
+            use_cache=True,
+        )
+        cached = client._cache.get(client._cache_key(sample_endpoint.url))
+
+    assert output_path.read_bytes() == body
+    assert cached is not None and cached.body == body
+
+
+@respx.mock
+def test_collect_endpoint_payload_pretty_format(tmp_path, sample_endpoint):
+    respx.get(sample_endpoint.url).mock(
+        return_value=httpx.Response(200, content=b'{"items":[1]}')
+    )
+    settings = CartolaSettings(raw_format="pretty", log_level="ERROR")
+
+    with CartolaClient(settings=settings, cache_dir=tmp_path, cache_ttl=0) as client:
+        output_path = collect_endpoint_payload(
+            sample_endpoint, client=client, settings=settings, base_dir=tmp_path
+        )
+
+    assert output_path.read_text(encoding="utf-8") == json.dumps(
+        {"items": [1]}, indent=2
+    )
+
+
+@respx.mock
+def test_collect_endpoint_payload_raw_validation(tmp_path, sample_endpoint):
+    respx.get(sample_endpoint.url).mock(
+        return_value=httpx.Response(200, content=b"{broken")
+    )
+    settings = CartolaSettings(raw_format="bytes", log_level="ERROR")
+    with CartolaClient(settings=settings, cache_dir=tmp_path, cache_ttl=0) as client:
+        with pytest.raises(ValueError):
+            collect_endpoint_payload(
+                sample_endpoint, client=client, settings=settings, base_dir=tmp_path
+            )
+
+    unchecked = CartolaSettings(
+        raw_format="bytes", raw_validate=False, log_level="ERROR"
+    )
+    with CartolaClient(settings=unchecked, cache_dir=tmp_path, cache_ttl=0) as client:
+        output_path = collect_endpoint_payload(
+            sample_endpoint, client=client, settings=unchecked, base_dir=tmp_path
+        )
+    assert output_path.read_bytes() == b"{broken"
+
+
+@respx.mock
+def test_collect_endpoint_payloads_compresses_raw_files(tmp_path, sample_endpoint):
+    body = b'{"atletas":[' + b'{"atleta_id":1},' * 200 + b"{}]}"
+    respx.get(sample_endpoint.url).mock(return_value=httpx.Response(200, content=body))
+    settings = CartolaSettings(
+        raw_format="bytes",
+        raw_compression="gzip",
+        compression_level=9,
+        log_level="ERROR",
+    )
+
+    with CartolaClient(settings=settings, cache_dir=None, cache_ttl=0) as client:
+        results = collect_endpoint_payloads(
+            [(sample_endpoint, None)],
+            client=client,
+            settings=settings,
+            base_dir=tmp_path,
+            timestamp=datetime(2025, 1, 1, tzinfo=UTC),
+        )
+
+    path = results[0].path
+    assert path == tmp_path / "clubes" / "20250101T000000Z.json.gz"
+    assert len(path.read_bytes()) < len(body) / 10
+    assert gzip.decompress(path.read_bytes()) == body
+
+
+@respx.mock
+def test_collect_endpoint_payload_deduplicates_identical_snapshots(
+    tmp_path, sample_endpoint
+):
+    respx.get(sample_endpoint.url).mock(
+        side_effect=[
+            httpx.Response(200, content=b'{"status_mercado":1}'),
+            httpx.Response(200, content=b'{"status_mercado":1}'),
+            httpx.Response(200, content=b'{"status_mercado":2}'),
+        ]
+    )
+    settings = CartolaSettings(raw_dedup=True, log_level="ERROR")
+
+    paths = []
+    with CartolaClient(settings=settings, cache_dir=None, cache_ttl=0) as client:
+        for hour in range(3):
+            paths.append(
+                collect_endpoint_payload(
+                    sample_endpoint,
+                    client=client,
+                    settings=settings,
+                    base_dir=tmp_path,
+                    timestamp=datetime(2025, 1, 1, hour, tzinfo=UTC),
+                )
+            )
+
+    endpoint_dir = tmp_path / "clubes"
+    assert paths[0] == paths[1] != paths[2]
+    assert paths[0].parent.parent == endpoint_dir / "objects"
+    assert len(list((endpoint_dir / "objects").rglob("*.json"))) == 2
+    assert list(endpoint_dir.glob("*.json")) == []
+
+    manifest = [
+        json.loads(line)
+        for line in (endpoint_dir / "manifest.jsonl").read_text().splitlines()
+    ]
+    assert [item["collected_at"] for item in manifest] == [
+        "20250101T000000Z",
+        "20250101T010000Z",
+        "20250101T020000Z",
+    ]
+    assert manifest[0]["hash"] == manifest[1]["hash"] != manifest[2]["hash"]
+    assert manifest[0]["path"] == paths[0].relative_to(endpoint_dir).as_posix()
+
+
+@respx.mock
+def test_collectors_append_to_the_raw_index(tmp_path, sample_endpoint):
+    from cartola_analytics.pipelines.raw_index import RawIndex
+
+    legacy = tmp_path / "clubes" / "20241231T000000Z.json"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_bytes(b'{"old":true}')
+    respx.get(sample_endpoint.url).mock(
+        return_value=httpx.Response(200, content=b'{"new":true}')
+    )
+    settings = CartolaSettings(
+        raw_format="bytes", raw_index=True, log_level="ERROR"
+    )
+
+    with CartolaClient(settings=settings, cache_dir=None, cache_ttl=0) as client:
+        path = collect_endpoint_payload(
+            sample_endpoint,
+            client=client,
+            settings=settings,
+            base_dir=tmp_path,
+            timestamp=datetime(2025, 1, 1, tzinfo=UTC),
+        )
+
+    with RawIndex(tmp_path) as index:
+        records = index.query("clubes")
+    # Files collected before the index existed are picked up on first use.
+    assert [record.path for record in records] == [legacy, path]
+    assert records[1].size == len(b'{"new":true}')
+    assert records[1].content_hash is not None
+
+
+@respx.mock
+def test_collectors_can_skip_the_raw_index(tmp_path, sample_endpoint):
+    respx.get(sample_endpoint.url).mock(return_value=httpx.Response(200, json={}))
+    settings = CartolaSettings(raw_index=False, log_level="ERROR")
+
+    with CartolaClient(settings=settings, cache_dir=None, cache_ttl=0) as client:
+        collect_endpoint_payload(
+            sample_endpoint, client=client, settings=settings, base_dir=tmp_path
+        )
+
+    assert not (tmp_path / "raw_index.sqlite3").exists()
+
+
+@respx.mock
+def test_collectors_share_the_run_writer(tmp_path, sample_endpoint, monkeypatch):
+    from cartola_analytics.pipelines import raw
+    from cartola_analytics.pipelines.raw_index import RawIndex
+
+    opened = []
+
+    class CountingIndex(RawIndex):
+        def __init__(self, *args, **kwargs):
+            opened.append(args[0])
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(raw, "RawIndex", CountingIndex)
+    respx.get(sample_endpoint.url).mock(
+        return_value=httpx.Response(200, content=b'{"new":true}')
+    )
+    settings = CartolaSettings(raw_index=True, log_level="ERROR")
+
+    with (
+        CartolaClient(settings=settings, cache_dir=None, cache_ttl=0) as client,
+        raw.RawWriter(tmp_path, settings) as writer,
+    ):
+        for hour in range(3):
+            collect_endpoint_payload(
+                sample_endpoint,
+                client=client,
+                settings=settings,
+                base_dir=tmp_path,
+                timestamp=datetime(2025, 1, 1, hour, tzinfo=UTC),
+                writer=writer,
+            )
+
+    assert opened == [tmp_path]
+    with RawIndex(tmp_path) as index:
+        assert len(index.query("clubes")) == 3
+
+
+def test_concurrent_writers_index_the_history_once(tmp_path, monkeypatch):
+    from cartola_analytics.pipelines import raw
+
+    legacy = tmp_path / "clubes" / "20241231T000000Z.json"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_bytes(b'{"old":true}')
+    rebuilds = []
+    rebuild_index = raw.rebuild_index
+
+    def _slow_rebuild(raw_base, endpoints=None):
+        rebuilds.append(raw_base)
+        time.sleep(0.05)
+        return rebuild_index(raw_base, endpoints)
+
+    monkeypatch.setattr(raw, "rebuild_index", _slow_rebuild)
+    settings = CartolaSettings(raw_index=True, log_level="ERROR")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        writers = list(pool.map(lambda _: raw.RawWriter(tmp_path, settings), range(4)))
+    for writer in writers:
+        writer.close()
+
+    assert rebuilds == [tmp_path]
+
+
+@respx.mock
+def test_collectors_append_to_a_segment_file(tmp_path, sample_endpoint):
+    from cartola_analytics.pipelines.raw_index import RawIndex
+    from cartola_analytics.pipelines.raw_store import load_raw_snapshots
+
+    respx.get(sample_endpoint.url).mock(
+        side_effect=[
+            httpx.Response(200, content=b'{"status_mercado":1}'),
+            httpx.Response(200, content=b'{"status_mercado":2}'),
+        ]
+    )
+    settings = CartolaSettings(
+        raw_layout="segments",
+        raw_compression="gzip",
+        raw_index=True,
+        log_level="ERROR",
+    )
+
+    with CartolaClient(settings=settings, cache_dir=None, cache_ttl=0) as client:
+        paths = [
+            collect_endpoint_payload(
+                sample_endpoint,
+                client=client,
+                settings=settings,
+                base_dir=tmp_path,
+                timestamp=datetime(2025, 1, 1, hour, tzinfo=UTC),
+            )
+            for hour in range(2)
+        ]
+
+    assert paths[0] == paths[1]
+    assert paths[0].parent == tmp_path / "clubes" / "segments"
+    assert list((tmp_path / "clubes").glob("*.json*")) == []
+    with RawIndex(tmp_path) as index:
+        records = index.query("clubes")
+    assert [record.byte_offset for record in records][0] == 0
+    assert records[1].byte_offset > 0
+    snapshots = load_raw_snapshots(tmp_path, "clubes")
+    assert [snapshot.payload for snapshot in snapshots] == [
+        {"status_mercado": 1},
+        {"status_mercado": 2},
+    ]
@@ -0,0 +1,92 @@
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import httpx
+import respx
+
+from cartola_analytics import CartolaClient, Endpoint, RateLimiter, TokenBucket
+from cartola_analytics.rate_limit import decorrelated_jitter, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_spaces_requests():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+
+    clock.now = 10.0
+    assert bucket.reserve() == 0.0
+
+
+def test_token_bucket_pause_delays_callers():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10.0, burst=5, clock=clock)
+    bucket.pause(3.0)
+    assert bucket.reserve() == 3.0
+
+
+def test_rate_limiter_keeps_one_bucket_per_host():
+    limiter = RateLimiter(
+        0,
+        1,
+        host_limits={"api.cartola.globo.com": (1.0, 1)},
+        clock=FakeClock(),
+    )
+    assert limiter.bucket_for("https://api.cartolafc.globo.com/esquemas") is None
+    bucket = limiter.bucket_for("https://api.cartola.globo.com/clubes")
+    assert bucket is limiter.bucket_for("https://api.cartola.globo.com/rodadas")
+    assert limiter.reserve("https://api.cartola.globo.com/clubes") == 0.0
+    assert limiter.reserve("https://api.cartola.globo.com/clubes") == 1.0
+
+
+def test_parse_retry_after_variants():
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("invalid") is None
+    future = datetime.now(tz=UTC) + timedelta(seconds=30)
+    parsed = parse_retry_after(format_datetime(future, usegmt=True))
+    assert parsed is not None and 25 <= parsed <= 30
+
+
+def test_decorrelated_jitter_bounds():
+    assert decorrelated_jitter(0, 10, 30) == 0.0
+    assert decorrelated_jitter(1, 0, 30, rng=lambda low, high: high) == 1.0
+    assert decorrelated_jitter(1, 4, 30, rng=lambda low, high: high) == 12.0
+    assert decorrelated_jitter(1, 40, 30, rng=lambda low, high: high) == 30.0
+
+
+@respx.mock
+def test_client_honours_retry_after(tmp_path, monkeypatch):
+    endpoint = Endpoint(name="sample", url="https://example.com/sample")
+    respx.get(endpoint.url).mock(
+        side_effect=[
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, json={"ok": True}),
+        ]
+    )
+    sleeps: list[float] = []
+    monkeypatch.setattr(
+        "cartola_analytics.http_client.time.sleep", lambda value: sleeps.append(value)
+    )
+    limiter = RateLimiter(0, 1)
+    with CartolaClient(
+        cache_dir=tmp_path,
+        cache_ttl=0,
+        max_retries=1,
+        backoff_factor=0,
+        rate_limiter=limiter,
+    ) as client:
+        assert client.fetch(endpoint, use_cache=False) == {"ok": True}
+
+    assert sleeps == [2.0]
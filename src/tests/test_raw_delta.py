@@ -0,0 +1,114 @@
+import json
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import httpx
+import respx
+
+from cartola_analytics import CartolaClient, CartolaSettings, Endpoint
+from cartola_analytics.pipelines import collect_endpoint_payload
+from cartola_analytics.pipelines.raw_delta import DELTA_STORE_NAME, DeltaSnapshotStore
+from cartola_analytics.pipelines.raw_index import RawIndex
+from cartola_analytics.pipelines.raw_store import load_raw_snapshots
+
+START = datetime(2025, 5, 1, tzinfo=UTC)
+
+
+def _polls(count: int) -> list[dict[str, object]]:
+    """One price change per poll; athlete 1 leaves at poll 5 (shifting indexes)."""
+    atletas = [
+        {"atleta_id": atleta_id, "preco_num": 5.0, "status_id": 7, "scout": {"G": 0}}
+        for atleta_id in range(1, 51)
+    ]
+    polls = []
+    for poll in range(count):
+        atletas = [dict(item) for item in atletas]
+        atletas[poll % 50]["preco_num"] = 5.0 + poll
+        if poll == 5:
+            atletas = atletas[1:]
+        status = {"7": "Provavel"} if poll < 7 else {"7": "Provavel", "2": "Duvida"}
+        polls.append({"atletas": atletas, "status": status, "rodada_atual": 3})
+    return polls
+
+
+def _store(tmp_path: Path, polls: list[dict[str, object]]) -> DeltaSnapshotStore:
+    store = DeltaSnapshotStore(
+        tmp_path / "atletas_mercado",
+        list_key="atletas",
+        id_key="atleta_id",
+        keyframe_interval=4,
+    )
+    for minute, poll in enumerate(polls):
+        store.append(poll, collected_at=START + timedelta(minutes=minute), rodada=3)
+    return store
+
+
+def test_delta_store_reconstructs_every_snapshot(tmp_path: Path) -> None:
+    polls = _polls(10)
+    with _store(tmp_path, polls) as store:
+        snapshots = store.snapshots()
+        assert [poll.is_keyframe for poll in snapshots] == [
+            True, False, False, False, True, False, False, False, True, False,
+        ]  # fmt: skip
+        assert snapshots[5].removed == 1
+        # Sequential, backwards and random access all rebuild the same documents.
+        for seq in [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 3, 9, 1]:
+            assert store.snapshot(seq) == polls[seq - 1]
+        assert store.snapshot_at(START + timedelta(minutes=6, seconds=30)) == polls[6]
+        assert store.snapshot_at(START - timedelta(minutes=1)) is None
+        assert store.latest() == polls[-1]
+
+        full_size = sum(len(json.dumps(poll)) for poll in polls)
+        assert sum(poll.size for poll in snapshots) < full_size / 2
+
+
+def test_delta_store_answers_changes_since(tmp_path: Path) -> None:
+    with _store(tmp_path, _polls(10)) as store:
+        changes = store.changes_since(START + timedelta(minutes=4, seconds=30))
+
+    assert [(change.seq, change.item_id) for change in changes] == [
+        (6, "1"),
+        (6, "6"),
+        (7, "8"),
+        (8, "9"),
+        (9, "10"),
+        (10, "11"),
+    ]
+    assert changes[0].item is None
+    assert changes[1].item is not None and changes[1].item["preco_num"] == 10.0
+
+
+@respx.mock
+def test_collectors_store_atletas_mercado_as_deltas(tmp_path: Path) -> None:
+    endpoint = Endpoint(name="atletas_mercado", url="https://example.com/atletas")
+    polls = _polls(3)
+    respx.get(endpoint.url).mock(
+        side_effect=[httpx.Response(200, json=poll) for poll in polls]
+        + [httpx.Response(200, json={"mensagem": "manutencao"})]
+    )
+    settings = CartolaSettings(raw_delta=True, raw_index=True, log_level="ERROR")
+
+    with CartolaClient(settings=settings, cache_dir=None, cache_ttl=0) as client:
+        paths = [
+            collect_endpoint_payload(
+                endpoint,
+                client=client,
+                settings=settings,
+                base_dir=tmp_path,
+                timestamp=START + timedelta(minutes=minute),
+            )
+            for minute in range(4)
+        ]
+
+    endpoint_dir = tmp_path / "atletas_mercado"
+    assert paths[:3] == [endpoint_dir / DELTA_STORE_NAME] * 3
+    # A payload without the athlete list is kept as a regular file.
+    assert paths[3].suffix == ".json"
+    with RawIndex(tmp_path) as index:
+        members = [record.member for record in index.query("atletas_mercado")]
+    assert members == ["1", "2", "3", None]
+    snapshots = load_raw_snapshots(tmp_path, "atletas_mercado")
+    assert [snapshot.payload for snapshot in snapshots] == [
+        *polls,
+        {"mensagem": "manutencao"},
+    ]
@@ -0,0 +1,49 @@
+from datetime import UTC, datetime
+from pathlib import Path
+
+from cartola_analytics.pipelines.raw_index import INDEX_NAME, RawIndex, RawRecord
+
+
+def _record(tmp_path: Path, hour: int, rodada: int | None = None) -> RawRecord:
+    return RawRecord(
+        endpoint="partidas",
+        rodada=rodada,
+        collected_at=datetime(2025, 5, 1, hour, tzinfo=UTC),
+        path=tmp_path / "partidas" / f"rodada={rodada:03d}" / f"{hour:02d}.json",
+        size=10 * hour,
+        content_hash=f"h{hour}",
+    )
+
+
+def test_raw_index_queries_by_round_and_time_window(tmp_path: Path) -> None:
+    with RawIndex(tmp_path) as index:
+        index.record_many(
+            [_record(tmp_path, 3, 2), _record(tmp_path, 1, 1), _record(tmp_path, 2, 1)]
+        )
+        index.record(_record(tmp_path, 2, 1))  # re-recording is idempotent
+
+        assert [r.collected_at.hour for r in index.query("partidas")] == [1, 2, 3]
+        assert [r.collected_at.hour for r in index.query("partidas", rodada=1)] == [
+            1,
+            2,
+        ]
+        window = index.query(
+            "partidas",
+            since=datetime(2025, 5, 1, 2, tzinfo=UTC),
+            until=datetime(2025, 5, 1, 3, tzinfo=UTC),
+        )
+        assert window == [_record(tmp_path, 2, 1)]
+        assert index.query("clubes") == []
+        assert index.endpoints() == {"partidas": 3}
+
+
+def test_raw_index_stores_paths_relative_to_root(tmp_path: Path) -> None:
+    with RawIndex(tmp_path / "raw") as index:
+        index.record(_record(tmp_path / "raw", 1, 1))
+
+    moved = tmp_path / "moved"
+    (tmp_path / "raw").rename(moved)
+    assert (moved / INDEX_NAME).exists()
+    with RawIndex(moved) as index:
+        (record,) = index.query("partidas")
+    assert record.path == moved / "partidas" / "rodada=001" / "01.json"
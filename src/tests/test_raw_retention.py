@@ -0,0 +1,177 @@
+import gzip
+import json
+import zipfile
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from cartola_analytics.pipelines import transform_partidas
+from cartola_analytics.pipelines.raw_archive import INDEX_MEMBER
+from cartola_analytics.pipelines.raw_index import RawIndex
+from cartola_analytics.pipelines.raw_retention import (
+    RetentionPolicy,
+    archive_raw,
+    retention_policies,
+)
+from cartola_analytics.pipelines.raw_store import load_raw_snapshots, rebuild_index
+from cartola_analytics.schema import schema_dir
+
+NOW = datetime(2025, 6, 1, tzinfo=UTC)
+
+
+def _write(path: Path, payload: object) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(payload).encode()
+    if path.name.endswith(".gz"):
+        data = gzip.compress(data)
+    path.write_bytes(data)
+
+
+def test_retention_policies_come_from_the_schema_yaml(tmp_path: Path) -> None:
+    policies = retention_policies()
+    assert policies["partidas"] == RetentionPolicy(hot_days=30, finished_rounds=True)
+    assert policies["mercado_status"].hot_days == 7
+
+    schemas = tmp_path / "docs" / "schemas"
+    schemas.mkdir(parents=True)
+    schemas.joinpath("x.yaml").write_text(
+        "name: x\nversion: 1\nraw_source:\n  endpoint: videos\n"
+        "  retention:\n    hot_days: muitos\n"
+    )
+    with pytest.raises(ValueError, match="retencao"):
+        retention_policies(base_dir=tmp_path)
+
+
+def test_archive_moves_old_snapshots_out_of_the_hot_tier(tmp_path: Path) -> None:
+    endpoint_dir = tmp_path / "clubes"
+    _write(endpoint_dir / "20250401T000000Z.json", {"v": 1})
+    _write(endpoint_dir / "20250415T000000Z.json.gz", {"v": 2})
+    _write(endpoint_dir / "20250530T000000Z.json", {"v": 3})
+    rebuild_index(tmp_path)
+
+    counts = archive_raw(
+        tmp_path, {"clubes": RetentionPolicy(hot_days=30)}, now=NOW
+    )
+
+    assert counts == {"clubes": 2}
+    assert [path.name for path in endpoint_dir.glob("*.json*")] == [
+        "20250530T000000Z.json"
+    ]
+    archive = endpoint_dir / "archive" / "2025-04.zip"
+    with zipfile.ZipFile(archive) as handle:
+        assert sorted(handle.namelist()) == [
+            "20250401T000000Z.json",
+            "20250415T000000Z.json.gz",
+            INDEX_MEMBER,
+        ]
+    hot = load_raw_snapshots(tmp_path, "clubes")
+    assert [snapshot.payload for snapshot in hot] == [{"v": 3}]
+    everything = load_raw_snapshots(tmp_path, "clubes", tier=None)
+    assert [snapshot.payload for snapshot in everything] == [
+        {"v": 1},
+        {"v": 2},
+        {"v": 3},
+    ]
+    with RawIndex(tmp_path) as index:
+        tiers = [record.tier for record in index.query("clubes", tier=None)]
+    assert tiers == ["archive", "archive", "hot"]
+
+    # Rebuilding the index reads the archive index instead of the members.
+    rebuild_index(tmp_path)
+    with RawIndex(tmp_path) as index:
+        assert len(index.query("clubes", tier="archive")) == 2
+    assert archive_raw(
+        tmp_path, {"clubes": RetentionPolicy(hot_days=30)}, now=NOW
+    ) == {"clubes": 0}
+
+
+def test_archive_rolls_finished_rounds_into_per_round_archives(
+    tmp_path: Path,
+) -> None:
+    _write(
+        tmp_path / "rodadas" / "20250530T000000Z.json",
+        [
+            {"rodada_id": 1, "fim": "2025-05-10 00:00:00"},
+            {"rodada_id": 2, "fim": "2025-06-10 00:00:00"},
+        ],
+    )
+    endpoint_dir = tmp_path / "partidas_por_rodada"
+    _write(endpoint_dir / "rodada=001" / "20250505T000000Z.json", {"r": 1})
+    _write(endpoint_dir / "rodada=001" / "20250509T000000Z.json", {"r": 1})
+    _write(endpoint_dir / "rodada=002" / "20250530T000000Z.json", {"r": 2})
+
+    counts = archive_raw(
+        tmp_path,
+        {"partidas_por_rodada": RetentionPolicy(finished_rounds=True)},
+        now=NOW,
+    )
+
+    assert counts == {"partidas_por_rodada": 2}
+    assert not (endpoint_dir / "rodada=001").exists()
+    assert (endpoint_dir / "rodada=002").is_dir()
+    assert [path.name for path in (endpoint_dir / "archive").iterdir()] == [
+        "rodada=001.zip"
+    ]
+    archived = load_raw_snapshots(
+        tmp_path, "partidas_por_rodada", rodada=1, tier="archive"
+    )
+    assert [snapshot.rodada for snapshot in archived] == [1, 1]
+
+
+def test_archive_requires_a_policy_for_each_endpoint(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="videos"):
+        archive_raw(tmp_path, {}, endpoints=["videos"], now=NOW)
+
+
+def test_transforms_keep_rows_of_archived_snapshots(tmp_path: Path) -> None:
+    schemas = tmp_path / "docs" / "schemas"
+    schemas.mkdir(parents=True)
+    schemas.joinpath("partidas.yaml").write_text(
+        schema_dir().joinpath("partidas.yaml").read_text(encoding="utf-8"),
+        encoding="utf-8",
+    )
+    raw_base = tmp_path / "data" / "raw"
+
+    def _write_round(rodada: int, day: str) -> None:
+        partidas = [
+            {
+                "partida_id": rodada * 10 + match,
+                "clube_casa_id": 1,
+                "clube_visitante_id": 2,
+            }
+            for match in range(3)
+        ]
+        _write(
+            raw_base / "partidas" / f"{day}T000000Z.json",
+            {"rodada": rodada, "partidas": partidas},
+        )
+
+    for rodada, day in ((1, "20250401"), (2, "20250520")):
+        _write_round(rodada, day)
+    rebuild_index(raw_base)
+
+    before = transform_partidas(base_dir=tmp_path)
+    assert archive_raw(
+        raw_base, {"partidas": RetentionPolicy(hot_days=30)}, now=NOW
+    ) == {"partidas": 1}
+    after = transform_partidas(base_dir=tmp_path)
+
+    # A full run is a rebuild: archived snapshots are read again.
+    assert before["rows_processed"] == after["rows_processed"] == 6
+    assert after["rows_stage"] == 6
+    processed = pd.read_parquet(after["processed_path"])
+    assert processed["rodada"].tolist() == [1, 1, 1, 2, 2, 2]
+
+    # Incremental runs read the hot tier and merge, keeping archived rows.
+    _write_round(3, "20250527")
+    rebuild_index(raw_base)
+    incremental = transform_partidas(base_dir=tmp_path, incremental=True)
+    assert incremental["rows_stage"] == 3
+    assert incremental["rows_processed"] == 9
+
+    # Without a processed dataset to merge into, the archive is read again.
+    incremental["processed_path"].unlink()
+    rebuilt = transform_partidas(base_dir=tmp_path, incremental=True)
+    assert rebuilt["rows_processed"] == 9
@@ -0,0 +1,105 @@
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from cartola_analytics.pipelines.raw_segments import (
+    SegmentCorruptedError,
+    SegmentWriter,
+    iter_segment,
+    read_record,
+    segment_paths,
+)
+from cartola_analytics.pipelines.raw_store import load_raw_snapshots, scan_raw_records
+
+
+def _at(hour: int) -> datetime:
+    return datetime(2025, 5, 1, hour, tzinfo=UTC)
+
+
+def test_segment_roundtrip_and_random_access(tmp_path: Path) -> None:
+    writer = SegmentWriter(tmp_path / "partidas", compression_name="gzip")
+    written = [
+        writer.append(f'{{"n":{hour}}}'.encode(), collected_at=_at(hour), rodada=3)
+        for hour in range(3)
+    ]
+
+    (segment,) = segment_paths(tmp_path / "partidas")
+    assert {path for path, _ in written} == {segment}
+    records = list(iter_segment(segment))
+    assert [record.offset for record in records] == [r.offset for _, r in written]
+    assert [record.document() for record in records] == [
+        b'{"n":0}',
+        b'{"n":1}',
+        b'{"n":2}',
+    ]
+    assert records[1].collected_at == _at(1)
+    assert records[1].rodada == 3
+    assert records[1].compression == "gzip"
+
+    with segment.open("rb") as handle:
+        assert read_record(handle, written[2][1].offset).document() == b'{"n":2}'
+        with pytest.raises(SegmentCorruptedError):
+            read_record(handle, written[2][1].offset + 1)
+
+
+def test_segment_writer_rotates_by_size_and_age(tmp_path: Path) -> None:
+    by_size = SegmentWriter(tmp_path / "a", max_bytes=1, max_age=0)
+    for hour in range(3):
+        by_size.append(b"{}", collected_at=_at(hour), rodada=None)
+    assert [path.name[:6] for path in segment_paths(tmp_path / "a")] == [
+        "000001",
+        "000002",
+        "000003",
+    ]
+
+    by_age = SegmentWriter(tmp_path / "b", max_bytes=0, max_age=2 * 3600)
+    for hour in range(5):
+        by_age.append(b"{}", collected_at=_at(hour), rodada=None)
+    segments = segment_paths(tmp_path / "b")
+    assert [len(list(iter_segment(path))) for path in segments] == [2, 2, 1]
+
+
+def test_iter_segment_stops_at_a_truncated_tail(tmp_path: Path) -> None:
+    writer = SegmentWriter(tmp_path / "clubes")
+    path, _ = writer.append(b'{"ok":1}', collected_at=_at(1), rodada=None)
+    writer.append(b'{"ok":2}', collected_at=_at(2), rodada=None)
+    path.write_bytes(path.read_bytes()[:-3])
+
+    assert [record.document() for record in iter_segment(path)] == [b'{"ok":1}']
+
+
+def test_segment_writer_rolls_over_a_torn_tail(tmp_path: Path) -> None:
+    first = SegmentWriter(tmp_path / "clubes")
+    path, _ = first.append(b'{"ok":1}', collected_at=_at(1), rodada=None)
+    first.append(b'{"ok":2}', collected_at=_at(2), rodada=None)
+    path.write_bytes(path.read_bytes()[:-3])
+
+    # A new writer (the next run) must not append behind the torn record.
+    resumed = SegmentWriter(tmp_path / "clubes")
+    new_path, _ = resumed.append(b'{"ok":3}', collected_at=_at(3), rodada=None)
+    resumed.append(b'{"ok":4}', collected_at=_at(4), rodada=None)
+
+    assert new_path != path
+    assert segment_paths(tmp_path / "clubes") == [path, new_path]
+    documents = [
+        record.document()
+        for segment in segment_paths(tmp_path / "clubes")
+        for record in iter_segment(segment)
+    ]
+    assert documents == [b'{"ok":1}', b'{"ok":3}', b'{"ok":4}']
+
+
+def test_raw_store_streams_segments_without_an_index(tmp_path: Path) -> None:
+    writer = SegmentWriter(tmp_path / "clubes", max_bytes=1)
+    for hour, body in enumerate([b'{"v":1}', b'{"v":1}', b'{"v":2}']):
+        writer.append(body, collected_at=_at(hour), rodada=hour)
+
+    records = scan_raw_records(tmp_path, "clubes")
+    assert len({record.path for record in records}) == 3
+    assert [record.byte_offset for record in records] == [0, 0, 0]
+
+    snapshots = load_raw_snapshots(tmp_path, "clubes", rodada=2)
+    assert [snapshot.payload for snapshot in snapshots] == [{"v": 2}]
+    first, second, _ = load_raw_snapshots(tmp_path, "clubes")
+    assert first.payload is second.payload
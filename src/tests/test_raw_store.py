@@ -0,0 +1,104 @@
+from datetime import UTC, datetime
+from pathlib import Path
+
+from cartola_analytics import codec
+from cartola_analytics.pipelines import raw_store
+from cartola_analytics.pipelines.raw_index import RawIndex
+
+
+def _collect(endpoint_dir: Path, hour: int, document: bytes, **kwargs) -> Path:
+    path, digest, _ = raw_store.store_object(endpoint_dir, document, **kwargs)
+    raw_store.append_manifest(
+        endpoint_dir,
+        raw_store.ManifestEntry(
+            collected_at=datetime(2025, 1, 1, hour, tzinfo=UTC),
+            rodada=None,
+            content_hash=digest,
+            path=path,
+            size=path.stat().st_size,
+        ),
+    )
+    return path
+
+
+def test_store_object_writes_each_document_once(tmp_path: Path) -> None:
+    first, digest, created = raw_store.store_object(tmp_path, b'{"a":1}')
+    again, same_digest, created_again = raw_store.store_object(
+        tmp_path, b'{"a":1}', compression_name="gzip"
+    )
+
+    assert created and not created_again
+    assert again == first
+    assert same_digest == digest == raw_store.content_hash(b'{"a":1}')
+    assert first == tmp_path / "objects" / digest[:2] / f"{digest}.json"
+
+
+def test_load_raw_snapshots_decodes_unique_payloads_once(
+    tmp_path: Path, monkeypatch
+) -> None:
+    tmp_path.joinpath("20250101T000000Z.json").write_bytes(b'{"status":1}')
+    _collect(tmp_path, 1, b'{"status":1}')
+    _collect(tmp_path, 2, b'{"status":1}', compression_name="gzip")
+    _collect(tmp_path, 3, b'{"status":2}', compression_name="gzip")
+
+    calls = []
+    original = codec.loads
+
+    def _counting_loads(data):
+        if b"status" in data:
+            calls.append(data)
+        return original(data)
+
+    monkeypatch.setattr(codec, "loads", _counting_loads)
+    snapshots = raw_store.load_raw_snapshots(tmp_path.parent, tmp_path.name)
+
+    assert [snapshot.collected_at.hour for snapshot in snapshots] == [0, 1, 2, 3]
+    assert [snapshot.payload for snapshot in snapshots] == [
+        {"status": 1},
+        {"status": 1},
+        {"status": 1},
+        {"status": 2},
+    ]
+    assert snapshots[0].payload is snapshots[2].payload
+    assert len(calls) == 2
+    assert len(list((tmp_path / "objects").rglob("*.json*"))) == 2
+
+
+def test_scan_covers_round_directories_and_skips_objects(tmp_path: Path) -> None:
+    endpoint_dir = tmp_path / "partidas"
+    round_dir = endpoint_dir / "rodada=007"
+    round_dir.mkdir(parents=True)
+    round_dir.joinpath("20250101T000000Z.json").write_bytes(b'{"rodada":7}')
+    endpoint_dir.joinpath("20250101T010000Z.json").write_bytes(b'{"rodada":8}')
+    _collect(endpoint_dir, 2, b'{"rodada":9}')
+
+    records = raw_store.scan_raw_records(tmp_path, "partidas")
+
+    assert [(r.collected_at.hour, r.rodada) for r in records] == [
+        (0, 7),
+        (1, None),
+        (2, None),
+    ]
+    assert records[2].content_hash == raw_store.content_hash(b'{"rodada":9}')
+
+
+def test_load_raw_snapshots_uses_the_index(tmp_path: Path) -> None:
+    endpoint_dir = tmp_path / "clubes"
+    endpoint_dir.mkdir()
+    endpoint_dir.joinpath("20250101T000000Z.json").write_bytes(b'{"v":1}')
+    endpoint_dir.joinpath("20250101T010000Z.json").write_bytes(b'{"v":2}')
+
+    assert raw_store.rebuild_index(tmp_path) == 2
+    # Files copied in after indexing stay invisible until the next reindex.
+    endpoint_dir.joinpath("20250101T020000Z.json").write_bytes(b'{"v":3}')
+    endpoint_dir.joinpath("20250101T000000Z.json").unlink()
+
+    snapshots = raw_store.load_raw_snapshots(tmp_path, "clubes")
+    assert [snapshot.payload for snapshot in snapshots] == [{"v": 2}]
+
+    raw_store.rebuild_index(tmp_path, ["clubes"])
+    since = datetime(2025, 1, 1, 2, tzinfo=UTC)
+    snapshots = raw_store.load_raw_snapshots(tmp_path, "clubes", since=since)
+    assert [snapshot.payload for snapshot in snapshots] == [{"v": 3}]
+    with RawIndex(tmp_path) as index:
+        assert index.endpoints() == {"clubes": 2}
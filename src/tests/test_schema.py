@@ -1,6 +1,9 @@
 ﻿from pathlib import Path
 
-from cartola_analytics.schema import FieldSpec, load_schema, schema_dir
+import pyarrow as pa
+import pytest
+
+from cartola_analytics.schema import FieldSpec, arrow_schema, load_schema, schema_dir
 
 
 def test_load_schema_returns_fields(tmp_path: Path) -> None:
@@ -34,3 +37,19 @@ def test_schema_dir_points_to_docs() -> None:
     schemas_path = schema_dir()
     assert schemas_path.name == "schemas"
     assert schemas_path.exists()
+
+
+def test_arrow_schema_follows_field_types() -> None:
+    schema = arrow_schema(load_schema("partidas"))
+
+    assert schema.field("partida_id").type == pa.int64()
+    assert not schema.field("partida_id").nullable
+    assert schema.field("clube_casa_posicao").nullable
+    assert schema.field("timestamp_coleta").type == pa.timestamp("ns", tz="UTC")
+    assert schema.field("local").type == pa.dictionary(pa.int32(), pa.string())
+    assert schema.field("transmissao_url").type == pa.string()
+    status = arrow_schema(load_schema("mercado_status")).field("status_mercado")
+    assert pa.types.is_dictionary(status.type)  # enum fields are repetitive
+
+    with pytest.raises(ValueError, match="desconhecido"):
+        FieldSpec(name="x", type="decimal").arrow_type()
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+import respx
+
+from cartola_analytics import AsyncCartolaClient, CartolaClient, Endpoint
+from cartola_analytics.singleflight import AsyncSingleFlight, SingleFlight
+
+
+@pytest.fixture(name="sample_endpoint")
+def fixture_sample_endpoint() -> Endpoint:
+    return Endpoint(name="rodadas", url="https://example.com/rodadas")
+
+
+def test_single_flight_shares_result_between_threads():
+    flight = SingleFlight()
+    calls: list[int] = []
+    release = threading.Event()
+
+    def slow() -> int:
+        calls.append(1)
+        release.wait(timeout=2)
+        return 42
+
+    results: list[tuple[int, bool]] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(results) == [(42, False), (42, True), (42, True)]
+
+
+def test_async_single_flight_propagates_errors():
+    flight = AsyncSingleFlight()
+
+    async def boom() -> None:
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def _run():
+        return await asyncio.gather(
+            flight.do("k", boom), flight.do("k", boom), return_exceptions=True
+        )
+
+    results = asyncio.run(_run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_async_single_flight_follower_survives_cancelled_leader():
+    flight = AsyncSingleFlight()
+    calls: list[int] = []
+
+    async def slow() -> int:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def _run():
+        leader = asyncio.create_task(flight.do("k", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("k", slow))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(_run()) == (42, False)
+    assert len(calls) == 2
+
+
+@respx.mock
+def test_fetch_coalesces_concurrent_threads(tmp_path, sample_endpoint):
+    def slow_response(_request):
+        time.sleep(0.1)
+        return httpx.Response(200, json=[{"rodada_id": 1}])
+
+    route = respx.get(sample_endpoint.url).mock(side_effect=slow_response)
+    with CartolaClient(cache_dir=tmp_path, cache_ttl=0) as client:
+        results = client.fetch_many(
+            [(sample_endpoint, None)] * 4, max_workers=4, use_cache=False
+        )
+
+    assert route.call_count == 1
+    assert all(result.payload == [{"rodada_id": 1}] for result in results)
+
+
+@respx.mock
+def test_async_fetch_coalesces_concurrent_tasks(tmp_path, sample_endpoint):
+    route = respx.get(sample_endpoint.url).mock(
+        return_value=httpx.Response(200, json=[{"rodada_id": 1}])
+    )
+
+    async def _run():
+        async with AsyncCartolaClient(cache_dir=tmp_path, cache_ttl=0) as client:
+            return await asyncio.gather(
+                *(client.fetch(sample_endpoint, use_cache=False) for _ in range(5))
+            )
+
+    results = asyncio.run(_run())
+    assert route.call_count == 1
+    assert results == [[{"rodada_id": 1}]] * 5
+
+
+@respx.mock
+def test_share_responses_reuses_decoded_payload(tmp_path, sample_endpoint):
+    route = respx.get(sample_endpoint.url).mock(
+        return_value=httpx.Response(200, json=[{"rodada_id": 1}])
+    )
+    with CartolaClient(
+        cache_dir=tmp_path, cache_ttl=0, share_responses=True
+    ) as client:
+        first = client.fetch(sample_endpoint, use_cache=True)
+        second = client.fetch(sample_endpoint, use_cache=False)
+
+    assert first is second
+    assert route.call_count == 1
+
+    with CartolaClient(cache_dir=tmp_path, cache_ttl=0) as client:
+        client.fetch(sample_endpoint, use_cache=False)
+        client.fetch(sample_endpoint, use_cache=False)
+    assert route.call_count == 3
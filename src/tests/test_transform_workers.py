@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from cartola_analytics.pipelines import (
+    transform_clubes,
+    transform_mercado_status,
+    transform_partidas,
+    transform_rodadas,
+)
+
+TRANSFORMS = {
+    "clubes": transform_clubes,
+    "mercado_status": transform_mercado_status,
+    "partidas": transform_partidas,
+    "rodadas": transform_rodadas,
+}
+
+
+def _payload(name: str, poll: int) -> Any:
+    if name == "clubes":
+        return {str(clube): {"nome": f"Clube {clube}.{poll}"} for clube in range(1, 6)}
+    if name == "mercado_status":
+        return {
+            "temporada": 2024 + poll % 2,
+            "rodada_atual": poll,
+            "rodada_final": 38,
+            "status_mercado": 1,
+        }
+    if name == "partidas":
+        return {
+            "rodada": poll % 4 + 1,
+            "partidas": [
+                {
+                    "partida_id": poll % 4 * 10 + match,
+                    "clube_casa_id": match,
+                    "clube_visitante_id": match + 1,
+                    "partida_data": "2025-04-01 16:00:00",
+                    "placar_oficial_mandante": poll if poll % 3 else None,
+                }
+                for match in range(5)
+            ],
+        }
+    return [
+        {"rodada_id": rodada, "nome_rodada": f"Rodada {rodada}", "inicio": "2025-04-01"}
+        for rodada in range(1, poll % 5 + 2)
+    ]
+
+
+def _write_project(base_dir: Path, name: str) -> None:
+    schema_root = Path(__file__).resolve().parents[2] / "docs" / "schemas"
+    target = base_dir / "docs" / "schemas"
+    target.mkdir(parents=True, exist_ok=True)
+    target.joinpath(f"{name}.yaml").write_text(
+        schema_root.joinpath(f"{name}.yaml").read_text(encoding="utf-8"),
+        encoding="utf-8",
+    )
+    raw_dir = base_dir / "data" / "raw" / name
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    for poll in range(24):
+        raw_dir.joinpath(f"20250401T{poll:02d}0000Z.json").write_text(
+            json.dumps(_payload(name, poll)), encoding="utf-8"
+        )
+
+
+@pytest.mark.parametrize("name", sorted(TRANSFORMS))
+def test_parallel_transform_output_is_byte_identical(
+    tmp_path: Path, name: str
+) -> None:
+    transform = TRANSFORMS[name]
+    _write_project(tmp_path / "serial", name)
+    _write_project(tmp_path / "parallel", name)
+
+    serial = transform(base_dir=tmp_path / "serial")
+    parallel = transform(base_dir=tmp_path / "parallel", workers=3)
+
+    assert parallel["rows_stage"] == serial["rows_stage"]
+    for key in ("stage_path", "processed_path"):
+        assert parallel[key].read_bytes() == serial[key].read_bytes()
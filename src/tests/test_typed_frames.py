@@ -0,0 +1,94 @@
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from cartola_analytics.pipelines.typed_frames import (
+    records_frame,
+    to_table,
+    write_parquet,
+)
+from cartola_analytics.schema import FieldSpec, SchemaSpec
+
+COLLECTED_AT = datetime(2025, 4, 1, tzinfo=UTC)
+
+SPEC = SchemaSpec(
+    name="exemplo",
+    version=1,
+    raw_source={},
+    stage={},
+    processed={},
+    fields=[
+        FieldSpec(name="id", type="int", required=True),
+        FieldSpec(name="posicao", type="int"),
+        FieldSpec(name="status", type="string", enum=["A", "B"]),
+        FieldSpec(name="nome", type="string"),
+        FieldSpec(name="valida", type="bool", required=True),
+        FieldSpec(name="data", type="timestamp"),
+        FieldSpec(name="timestamp_coleta", type="timestamp", required=True),
+    ],
+    relationships=[],
+    metadata={},
+)
+
+
+def _records() -> list[dict[str, object]]:
+    return [
+        {
+            "id": 1,
+            "posicao": None,
+            "status": "A",
+            "nome": "Um",
+            "valida": True,
+            "data": COLLECTED_AT,
+            "timestamp_coleta": COLLECTED_AT,
+        },
+        {
+            "id": 2,
+            "posicao": 3,
+            "status": "A",
+            "nome": None,
+            "valida": False,
+            "data": None,
+            "timestamp_coleta": COLLECTED_AT,
+        },
+    ]
+
+
+def test_records_frame_types_each_column_from_the_schema() -> None:
+    frame = records_frame(_records(), SPEC)
+
+    assert frame["posicao"].dtype == pd.Int64Dtype()
+    assert frame["posicao"].tolist() == [pd.NA, 3]
+    assert frame["status"].dtype == "category"
+    assert frame["nome"].tolist() == ["Um", None]
+    assert frame["valida"].dtype == bool
+    assert str(frame["data"].dtype) == "datetime64[ns, UTC]"
+
+    # Raw date values are left for the transform to parse.
+    raw_dates = records_frame([_records()[0] | {"data": "2025-04-01"}], SPEC)
+    assert raw_dates["data"].tolist() == ["2025-04-01"]
+    # Epoch seconds too, instead of being read as nanoseconds by Arrow.
+    epochs = records_frame([_records()[0], _records()[1] | {"data": 1758999600}], SPEC)
+    assert epochs["data"].tolist() == [COLLECTED_AT, 1758999600]
+
+
+def test_write_parquet_uses_the_exact_schema_types(tmp_path: Path) -> None:
+    path = tmp_path / "exemplo.parquet"
+    write_parquet(records_frame(_records(), SPEC), path, SPEC)
+
+    schema = pq.read_schema(path)
+    assert schema.field("posicao").type == pa.int64()
+    assert pa.types.is_dictionary(schema.field("status").type)
+    assert pd.read_parquet(path)["posicao"].dtype == pd.Int64Dtype()
+
+    # Frames typed by pandas inference are cast back to the schema.
+    inferred = pd.DataFrame(_records())
+    assert inferred["posicao"].dtype == float
+    assert to_table(inferred, SPEC).schema == schema.remove_metadata()
+
+    with pytest.raises(ValueError, match="extra"):
+        to_table(inferred.assign(extra=1), SPEC)